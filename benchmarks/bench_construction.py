@@ -0,0 +1,32 @@
+"""
+Construction micro benchmarks.
+
+Run from the repository root with ``python -m benchmarks.bench_construction``.
+Prints the time per construction in microseconds through the public constructor,
+and through the trusted ``_from_trusted`` path used internally.
+"""
+import timeit
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor
+
+CASES = {
+    "RGBColor": ("RGBColor(51, 102, 153)", "RGBColor._from_trusted(51, 102, 153)"),
+    "RGBFloatColor": ("RGBFloatColor(0.2, 0.4, 0.6)", "RGBFloatColor._from_trusted(0.2, 0.4, 0.6)"),
+    "HSVColor": ("HSVColor(0.6, 0.5, 0.5)", "HSVColor._from_trusted(0.6, 0.5, 0.5)"),
+    "HexColor": ("HexColor('336699')", "HexColor._from_trusted(0x336699)"),
+}
+NAMESPACE = {"RGBColor": RGBColor, "RGBFloatColor": RGBFloatColor, "HSVColor": HSVColor, "HexColor": HexColor}
+
+
+def measure(stmt, number):
+    return min(timeit.repeat(stmt, globals=NAMESPACE, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=200_000):
+    print(f"{'':<16}{'public':>10}{'trusted':>10}  (us)")
+    for name, (public, trusted) in CASES.items():
+        print(f"{name:<16}{measure(public, number):10.3f}{measure(trusted, number):10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Conversion micro benchmarks.
+
+Run from the repository root with ``python -m benchmarks.bench_conversion``. Prints the time per call
+in microseconds for the conversions that go through ``.rgb``.
+"""
+import logging
+import timeit
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor
+
+CASES = {
+    "RGBFloatColor == RGBColor": (
+        "a == b", {"a": RGBFloatColor(0.2, 0.4, 0.6), "b": RGBColor(51, 102, 153)}),
+    "RGBFloatColor.rgb": ("a.rgb", {"a": RGBFloatColor(0.2, 0.4, 0.6)}),
+    "RGBFloatColor.hex": ("a.hex", {"a": RGBFloatColor(0.2, 0.4, 0.6)}),
+    "HSVColor.hex": ("a.hex", {"a": HSVColor(0.6, 0.5, 0.5)}),
+    "HexColor.hsv": ("a.hsv", {"a": HexColor("336699")}),
+    "HexColor == RGBColor": ("a == b", {"a": HexColor("336699"), "b": RGBColor(51, 102, 153)}),
+}
+
+
+def main(number=100_000):
+    # Rounding warnings would otherwise dominate the measurement
+    logging.disable(logging.WARNING)
+    for name, (stmt, namespace) in CASES.items():
+        best = min(timeit.repeat(stmt, globals=namespace, number=number, repeat=5))
+        print(f"{name:<28} {best / number * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+CSS parsing throughput.
+
+Run from the repository root with ``python -m benchmarks.bench_css``. Parses a
+synthetic stylesheet dump of one color per line, once with mostly repeated
+colors like a real stylesheet and once with every color distinct, and prints
+the colors per second of :func:`colors.css.parse_many`.
+"""
+import random
+import time
+
+from colors import css
+
+
+def lines(count, distinct, seed=0):
+    rand = random.Random(seed)
+    formats = (
+        lambda r, g, b: "#%02x%02x%02x" % (r, g, b),
+        lambda r, g, b: "#%x%x%x" % (r >> 4, g >> 4, b >> 4),
+        lambda r, g, b: f"rgb({r}, {g}, {b})",
+        lambda r, g, b: f"rgba({r}, {g}, {b}, 0.5)",
+        lambda r, g, b: f"hsl({r}, {g * 100 // 255}%, {b * 100 // 255}%)",
+        lambda r, g, b: rand.choice(NAMES),
+    )
+    tokens = [rand.choice(formats)(*(rand.randrange(256) for _ in range(3))) for _ in range(distinct)]
+    return [rand.choice(tokens) for _ in range(count)]
+
+
+NAMES = sorted(css._NAMED)
+
+
+def measure(data):
+    css._parse.cache_clear()
+    start = time.perf_counter()
+    for _ in css.parse_many(data):
+        pass
+    return len(data) / (time.perf_counter() - start)
+
+
+def main(count=1_000_000):
+    for label, distinct in (("repeated", 2_000), ("distinct", count)):
+        print(f"{label:<10}{measure(lines(count, distinct)) / 1e6:8.2f} M colors/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Memory and construction throughput of the color value types.
+
+Run from the repository root with ``python -m benchmarks.bench_memory [count]``.
+Prints the bytes per instance and the construction rate for ``count`` colors
+(10 million by default).
+"""
+import sys
+import time
+import tracemalloc
+
+import colors
+
+TYPES = [
+    ("RGBColor", lambda i: (i & 0xff, (i >> 8) & 0xff, (i >> 16) & 0xff)),
+    ("RGBFloatColor", lambda i: ((i & 0xff) / 255, ((i >> 8) & 0xff) / 255, ((i >> 16) & 0xff) / 255)),
+    ("HSVColor", lambda i: ((i & 0xff) / 256, ((i >> 8) & 0xff) / 255, ((i >> 16) & 0xff) / 255)),
+    ("HexColor", lambda i: ("%06x" % (i & 0xffffff),)),
+]
+
+
+def measure(cls, args):
+    start = time.perf_counter()
+    instances = [cls(*a) for a in args]
+    elapsed = time.perf_counter() - start
+    del instances
+
+    tracemalloc.start()
+    instances = [cls(*a) for a in args]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size, elapsed
+
+
+def main(count=10_000_000):
+    for name, make_args in TYPES:
+        args = [make_args(i) for i in range(count)]
+        for cls_name in (name, "Frozen" + name):
+            cls = getattr(colors, cls_name, None)
+            if cls is None:
+                continue
+            size, elapsed = measure(cls, args)
+            print(f"{cls_name:<22} {size / count:7.1f} B/instance {count / elapsed / 1e6:6.2f} M/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Batch conversions and blends over worker processes.
+
+Run from the repository root with ``python -m benchmarks.bench_parallel [count]``.
+Converts ``count`` colors (10 million by default) from rgb to lab and blends
+two layers of that size, with 1, 2, 4, ... workers up to the core count, and
+prints the time and the ratio to a single worker. No scaling figures are
+recorded here: the only machine it has run on so far has a single core, where
+it prints just the single worker times.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from colors.array import ColorArray
+from colors.blend import blend
+from colors import parallel
+
+
+def best_of(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count):
+    rng = np.random.default_rng(0)
+    base = ColorArray.from_buffer(rng.integers(0, 256, (count, 3)).astype(np.float64), "rgb")
+    top = ColorArray.from_buffer(rng.integers(0, 256, (count, 3)).astype(np.float64), "rgb")
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+
+    cases = [
+        ("rgb -> lab", lambda w: base.to("lab", workers=w)),
+        ("blend overlay", lambda w: blend("overlay", base, top, workers=w)),
+    ]
+    print(f"{count:,} colors, {cores} cores")
+    for name, func in cases:
+        single = None
+        for w in workers:
+            func(w)  # start the pool
+            elapsed = best_of(lambda: func(w))
+            single = single or elapsed
+            print(f"{name:<16}{w:>3} workers {elapsed:8.3f} s  {single / elapsed:5.2f}x")
+    parallel.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
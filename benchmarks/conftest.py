@@ -0,0 +1,130 @@
+"""
+Regression tracking for the pytest-benchmark suite.
+
+``python -m pytest benchmarks`` times every case with pytest-benchmark and
+measures the peak memory allocated by one call with :mod:`tracemalloc`.
+``--save-baseline=FILE`` writes both metrics of every case as JSON, and
+``--baseline=FILE`` fails each case whose ops/sec dropped by more than
+``--time-threshold`` (15% by default), or whose peak allocation grew by more
+than ``--memory-threshold`` (10% by default), against that file. Ops/sec is
+taken from the fastest round, which is the least disturbed by the rest of the
+machine. A case that looks slower is timed again up to ``--time-retries``
+times (3 by default) and only fails when the best of all attempts is still
+too slow, so a single disturbed run does not fail it. Timings only compare
+meaningfully on the same machine. On shared or virtual machines a whole run
+can be a third slower than another, e.g. on a slower core; raise the time
+threshold there, e.g. ``--time-threshold=0.5``.
+"""
+import gc
+import json
+import os
+import timeit
+import tracemalloc
+from functools import partial
+
+import pytest
+
+#: Peak allocations may grow by this many bytes on top of the threshold, small
+#: cases otherwise fail on the noise of the interpreter's free lists.
+ALLOC_SLACK = 1024
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("colors baselines")
+    group.addoption("--baseline", metavar="FILE", help="Fail cases that regressed against this JSON baseline.")
+    group.addoption("--save-baseline", metavar="FILE", help="Write the metrics of every case to this JSON file.")
+    group.addoption("--time-threshold", metavar="FRACTION", type=float, default=0.15,
+                    help="Allowed drop of ops/sec, 0.15 for 15%% (default). Raise it on noisy machines.")
+    group.addoption("--time-retries", metavar="N", type=int, default=3,
+                    help="Times a case that looks slower is timed again before it fails, 3 by default.")
+    group.addoption("--memory-threshold", metavar="FRACTION", type=float, default=0.1,
+                    help="Allowed growth of the peak allocation, 0.1 for 10%% (default).")
+
+
+def _peak_allocation(func, args, repeat: int = 3) -> int:
+    """Bytes allocated at the peak of one call, over what was allocated before it.
+
+    The smallest of ``repeat`` calls, as a call may also pay for a collection
+    or for growing a cache shared with the rest of the process.
+    """
+    peaks = []
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peaks.append(peak - before)
+    return min(peaks)
+
+
+def _best_ops(func, args) -> float:
+    """ Ops/sec of the fastest of five rounds of at least 0.2 seconds each, timed with :mod:`timeit`. """
+    timer = timeit.Timer(partial(func, *args))
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(5, number))
+
+
+def pytest_configure(config):
+    path = config.getoption("--baseline", None)
+    if path is not None and not os.path.exists(path):
+        raise pytest.UsageError(f"No baseline at {path}, save one first with --save-baseline={path}")
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    path = request.config.getoption("--baseline")
+    if path is None:
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def measure(request, benchmark, baseline):
+    """Benchmark ``func(*args)``, record its metrics and compare them with the baseline.
+
+    Returns the result of the call, so cases can check what they measured.
+    """
+    time_threshold = request.config.getoption("--time-threshold")
+    memory_threshold = request.config.getoption("--memory-threshold")
+    retries = request.config.getoption("--time-retries")
+
+    def run(func, *args):
+        result = benchmark(func, *args)
+        if benchmark.disabled:
+            return result
+        # Ops/sec of the fastest round, the median and mean swing with the load of the machine
+        metrics = {"ops": 1 / benchmark.stats.stats.min, "peak_bytes": _peak_allocation(func, args)}
+        _results[request.node.nodeid] = metrics
+        old = (baseline or {}).get(request.node.nodeid)
+        if old is not None:
+            failures = []
+            for _ in range(retries):
+                if metrics["ops"] >= old["ops"] * (1 - time_threshold):
+                    break
+                metrics["ops"] = max(metrics["ops"], _best_ops(func, args))
+            if metrics["ops"] < old["ops"] * (1 - time_threshold):
+                failures.append(f"ops/sec {old['ops']:.0f} -> {metrics['ops']:.0f} (over {time_threshold:.0%})")
+            if metrics["peak_bytes"] > old["peak_bytes"] * (1 + memory_threshold) + ALLOC_SLACK:
+                failures.append(f"peak allocation {old['peak_bytes']} -> {metrics['peak_bytes']} bytes "
+                                f"(over {memory_threshold:.0%})")
+            if failures:
+                pytest.fail("Regressed: " + ", ".join(failures))
+        benchmark.extra_info.update(metrics)
+        return result
+    return run
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption("--save-baseline", None)
+    if path is None or not _results:
+        return
+    with open(path, "w") as f:
+        json.dump(dict(sorted(_results.items())), f, indent=2)
+        f.write("\n")
@@ -0,0 +1,119 @@
+"""
+pytest-benchmark cases for every constructor, conversion and blend path.
+
+Run from the repository root with ``python -m pytest benchmarks``, see
+``benchmarks/conftest.py`` for saving and checking baselines. Scalar cases
+time one call, batch cases a whole :class:`~colors.array.ColorArray` of each
+size in :data:`SIZES`.
+"""
+import importlib
+import sys
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import colors
+from colors import base
+from colors.array import ColorArray
+from colors.blend import BLEND_MODES, blend
+
+#: Colors per batch of the batch cases.
+SIZES = (100, 10_000)
+
+CONSTRUCTORS = {
+    "RGBColor": (colors.RGBColor, (51, 102, 153)),
+    "RGBFloatColor": (colors.RGBFloatColor, (0.2, 0.4, 0.6)),
+    "HSVColor": (colors.HSVColor, (0.6, 0.5, 0.6)),
+    "HexColor": (colors.HexColor, ("336699",)),
+    "LinearRGBColor": (colors.LinearRGBColor, (0.03, 0.13, 0.32)),
+    "XYZColor": (colors.XYZColor, (0.12, 0.13, 0.32)),
+    "LabColor": (colors.LabColor, (42.0, -1.0, -32.0)),
+    "OKLabColor": (colors.OKLabColor, (0.5, -0.02, -0.09)),
+    "RGBAColor": (colors.RGBAColor, (51, 102, 153, 0.5)),
+    "HSVAColor": (colors.HSVAColor, (0.6, 0.5, 0.6, 0.5)),
+    "FrozenRGBColor": (colors.FrozenRGBColor, (51, 102, 153)),
+    "FrozenHexColor": (colors.FrozenHexColor, ("336699",)),
+}
+
+# The color space of each of the conversion properties.
+COLORS = {
+    "rgb": colors.RGBColor(51, 102, 153),
+    "float": colors.RGBFloatColor(0.2, 0.4, 0.6),
+    "hsv": colors.HSVColor(0.6, 0.5, 0.6),
+    "hex": colors.HexColor("336699"),
+}
+PAIRS = [(src, dst) for src in COLORS for dst in COLORS if src != dst]
+PALETTES = ("colors.primary", "colors.rainbow", "colors.w3c")
+
+
+def _batch(size, space="rgb"):
+    # Channels stay away from 0 and 255 so divide, dodge and burn are defined everywhere
+    colors_ = [(1 + i * 7 % 254, 1 + i * 13 % 254, 1 + i * 29 % 254) for i in range(size)]
+    return ColorArray(colors_, "rgb").to(space)
+
+
+@pytest.mark.parametrize("name", CONSTRUCTORS)
+def test_constructor(measure, name):
+    cls, args = CONSTRUCTORS[name]
+    measure(cls, *args)
+
+
+@pytest.mark.parametrize("src, dst", PAIRS)
+def test_conversion(measure, src, dst):
+    color = COLORS[src]
+    result = measure(getattr, color, dst)
+    assert result._space == dst
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("src, dst", PAIRS)
+def test_batch_conversion(measure, src, dst, size):
+    batch = _batch(size, src)
+    assert len(measure(batch.to, dst)) == size
+
+
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+def test_blend_method(measure, mode):
+    measure(getattr(COLORS["rgb"], mode), colors.RGBColor(200, 150, 100))
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+def test_batch_blend(measure, mode, size):
+    assert len(measure(blend, mode, _batch(size), colors.RGBColor(200, 150, 100))) == size
+
+
+@pytest.mark.parametrize("other", ["rgb", "hex", "float"])
+def test_eq(measure, other):
+    assert measure(COLORS["rgb"].__eq__, COLORS[other])
+
+
+def _import(name):
+    # Forget the module and the attribute on the package so it is imported again
+    sys.modules.pop(name, None)
+    colors.__dict__.pop(name.rpartition(".")[2], None)
+    return importlib.import_module(name)
+
+
+@pytest.mark.parametrize("name", PALETTES)
+def test_palette_import(measure, name):
+    measure(_import, name)
+
+
+def test_palette_constant(measure):
+    from colors import w3c
+    assert measure(getattr, w3c, "teal") == colors.RGBColor(0, 128, 128)
+
+
+@pytest.mark.parametrize("mode", base.ColorWheel.MODES)
+def test_color_wheel(measure, mode):
+    wheel = base.ColorWheel(seed=0, mode=mode)
+    measure(next, wheel)
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("mode", base.ColorWheel.MODES)
+def test_color_wheel_take(measure, mode, size):
+    wheel = base.ColorWheel(seed=0, mode=mode)
+    assert len(measure(wheel.take, size)) == size
@@ -10,5 +10,33 @@ from .base import (
     RGBColor,
     RGBFloatColor,
     HexColor,
-    ColorWheel
+    LinearRGBColor,
+    XYZColor,
+    LabColor,
+    OKLabColor,
+    RGBAColor,
+    HSVAColor,
+    ColorWheel,
+    FrozenHSVColor,
+    FrozenRGBColor,
+    FrozenRGBFloatColor,
+    FrozenHexColor,
+    FrozenLinearRGBColor,
+    FrozenXYZColor,
+    FrozenLabColor,
+    FrozenOKLabColor,
 )
+
+
+def __getattr__(name: str):
+    # ColorArray imports NumPy, which takes far longer than the rest of the
+    # package, so it is only imported once it is used.
+    if name == "ColorArray":
+        from .array import ColorArray
+        globals()["ColorArray"] = ColorArray
+        return ColorArray
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | {"ColorArray"})
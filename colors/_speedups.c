@@ -0,0 +1,764 @@
+/*
+ * colors._speedups
+ * ================
+ * Compiled versions of the conversion edges of colors.base and of the blend
+ * mode formulas, for single colors and for flat buffers of doubles.
+ *
+ * Every function does the same floating point operations in the same order
+ * as the pure-Python code, so both give identical values. Build with
+ * -ffp-contract=off, a fused multiply-add would round differently.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <math.h>
+#include <string.h>
+
+/* Kernels convert one triple. They return 0, 1 when channels were clamped
+ * (only float_to_hsv does) or -1 with an exception set. */
+typedef int (*kernel_t)(const double *in, double *out);
+
+static double SRGB_TO_LINEAR[256];
+static double LAB_DELTA, LAB_DELTA_2, LAB_DELTA_3;
+static PyObject *logger = NULL;
+
+static const double LINEAR_TO_XYZ[3][3] = {
+    {0.4124564, 0.3575761, 0.1804375},
+    {0.2126729, 0.7151522, 0.0721750},
+    {0.0193339, 0.1191920, 0.9503041},
+};
+static const double XYZ_TO_LINEAR[3][3] = {
+    {3.2404542, -1.5371385, -0.4985314},
+    {-0.9692660, 1.8760108, 0.0415560},
+    {0.0556434, -0.2040259, 1.0572252},
+};
+static const double D65[3] = {0.95047, 1.0, 1.08883};
+static const double LINEAR_TO_LMS[3][3] = {
+    {0.4122214708, 0.5363325363, 0.0514459929},
+    {0.2119034982, 0.6806995451, 0.1073969566},
+    {0.0883024619, 0.2817188376, 0.6299787005},
+};
+static const double LMS_TO_OKLAB[3][3] = {
+    {0.2104542553, 0.7936177850, -0.0040720468},
+    {1.9779984951, -2.4285922050, 0.4505937099},
+    {0.0259040371, 0.7827717662, -0.8086757660},
+};
+static const double OKLAB_TO_LMS[3][3] = {
+    {1.0, 0.3963377774, 0.2158037573},
+    {1.0, -0.1055613458, -0.0638541728},
+    {1.0, -0.0894841775, -1.2914855480},
+};
+static const double LMS_TO_LINEAR[3][3] = {
+    {4.0767416621, -3.3077115913, 0.2309699292},
+    {-1.2684380046, 2.6097574011, -0.3413193965},
+    {-0.0041960863, -0.7034186147, 1.7076147010},
+};
+
+
+/* Python semantics of the float operations used by colors.base. */
+
+static int
+py_pow(double x, double y, double *result)
+{
+    *result = pow(x, y);
+    if (isinf(*result) && isfinite(x) && isfinite(y)) {
+        PyErr_SetString(PyExc_OverflowError, "(34, 'Numerical result out of range')");
+        return -1;
+    }
+    return 0;
+}
+
+/* x % y for floats, with the sign of y. */
+static double
+py_mod(double x, double y)
+{
+    double mod = fmod(x, y);
+    if (mod) {
+        if ((y < 0) != (mod < 0))
+            mod += y;
+    }
+    else {
+        mod = copysign(0.0, y);
+    }
+    return mod;
+}
+
+/* int(x), as a double holding the truncated value. */
+static int
+py_trunc(double x, double *result)
+{
+    if (isnan(x)) {
+        PyErr_SetString(PyExc_ValueError, "cannot convert float NaN to integer");
+        return -1;
+    }
+    if (isinf(x)) {
+        PyErr_SetString(PyExc_OverflowError, "cannot convert float infinity to integer");
+        return -1;
+    }
+    *result = trunc(x);
+    return 0;
+}
+
+static int
+zero_division(void)
+{
+    PyErr_SetString(PyExc_ZeroDivisionError, "float division by zero");
+    return -1;
+}
+
+/* min(1.0, max(0.0, c)) */
+static double
+clamp(double c)
+{
+    c = c > 0.0 ? c : 0.0;
+    return c < 1.0 ? c : 1.0;
+}
+
+static void
+matmul(const double m[3][3], const double *in, double *out)
+{
+    double x = in[0], y = in[1], z = in[2];
+    for (int i = 0; i < 3; i++)
+        out[i] = m[i][0] * x + m[i][1] * y + m[i][2] * z;
+}
+
+static int
+srgb_to_linear(double c, double *out)
+{
+    if (c <= 0.04045) {
+        *out = c / 12.92;
+        return 0;
+    }
+    return py_pow((c + 0.055) / 1.055, 2.4, out);
+}
+
+static int
+linear_to_srgb(double c, double *out)
+{
+    if (c <= 0.0031308) {
+        *out = c * 12.92;
+        return 0;
+    }
+    if (py_pow(c, 1 / 2.4, out) < 0)
+        return -1;
+    *out = 1.055 * *out - 0.055;
+    return 0;
+}
+
+
+/* Conversion edges. */
+
+static int
+rgb_to_float(const double *in, double *out)
+{
+    for (int i = 0; i < 3; i++)
+        out[i] = in[i] / 255;
+    return 0;
+}
+
+static int
+float_to_rgb(const double *in, double *out)
+{
+    for (int i = 0; i < 3; i++)
+        out[i] = nearbyint(clamp(in[i]) * 255);
+    return 0;
+}
+
+static int
+float_to_hsv(const double *in, double *out)
+{
+    double r = in[0], g = in[1], b = in[2], h, s, v;
+    /* colorsys.rgb_to_hsv */
+    double maxc = fmax(fmax(r, g), b), minc = fmin(fmin(r, g), b);
+    double rangec = maxc - minc;
+    v = maxc;
+    if (minc == maxc) {
+        h = 0.0;
+        s = 0.0;
+    }
+    else {
+        if (maxc == 0.0)
+            return zero_division();
+        s = rangec / maxc;
+        double rc = (maxc - r) / rangec, gc = (maxc - g) / rangec, bc = (maxc - b) / rangec;
+        if (r == maxc)
+            h = bc - gc;
+        else if (g == maxc)
+            h = 2.0 + rc - bc;
+        else
+            h = 4.0 + gc - rc;
+        h = py_mod(h / 6.0, 1.0);
+    }
+    out[0] = clamp(h);
+    out[1] = clamp(s);
+    out[2] = clamp(v);
+    int clamped = out[0] != h || out[1] != s || out[2] != v;
+    /* Hue can safely circle around 1 */
+    if (out[0] >= 1)
+        out[0] -= trunc(out[0]);
+    return clamped;
+}
+
+static int
+hsv_to_float(const double *in, double *out)
+{
+    double h = in[0], s = in[1], v = in[2], i;
+    /* colorsys.hsv_to_rgb */
+    if (s == 0.0) {
+        out[0] = out[1] = out[2] = v;
+        return 0;
+    }
+    if (py_trunc(h * 6.0, &i) < 0)
+        return -1;
+    double f = (h * 6.0) - i;
+    double p = v * (1.0 - s), q = v * (1.0 - s * f), t = v * (1.0 - s * (1.0 - f));
+    i = fmod(i, 6.0);
+    if (i < 0)
+        i += 6.0;
+    switch ((int)i) {
+    case 0: out[0] = v; out[1] = t; out[2] = p; break;
+    case 1: out[0] = q; out[1] = v; out[2] = p; break;
+    case 2: out[0] = p; out[1] = v; out[2] = t; break;
+    case 3: out[0] = p; out[1] = q; out[2] = v; break;
+    case 4: out[0] = t; out[1] = p; out[2] = v; break;
+    default: out[0] = v; out[1] = p; out[2] = q; break;
+    }
+    return 0;
+}
+
+static int
+hsv_to_rgb(const double *in, double *out)
+{
+    if (hsv_to_float(in, out) < 0)
+        return -1;
+    for (int i = 0; i < 3; i++)
+        out[i] = nearbyint(out[i] * 255);
+    return 0;
+}
+
+static int
+rgb_to_linear(const double *in, double *out)
+{
+    for (int i = 0; i < 3; i++) {
+        double c = in[i];
+        if (c != floor(c)) {
+            PyErr_SetString(PyExc_TypeError, "tuple indices must be integers or slices, not float");
+            return -1;
+        }
+        if (c < 0 && c >= -256)
+            c += 256;
+        if (!(c >= 0 && c < 256)) {
+            PyErr_SetString(PyExc_IndexError, "tuple index out of range");
+            return -1;
+        }
+        out[i] = SRGB_TO_LINEAR[(int)c];
+    }
+    return 0;
+}
+
+static int
+float_to_linear(const double *in, double *out)
+{
+    for (int i = 0; i < 3; i++) {
+        if (srgb_to_linear(in[i], &out[i]) < 0)
+            return -1;
+    }
+    return 0;
+}
+
+static int
+linear_to_float(const double *in, double *out)
+{
+    for (int i = 0; i < 3; i++) {
+        if (linear_to_srgb(in[i], &out[i]) < 0)
+            return -1;
+    }
+    return 0;
+}
+
+static int
+linear_to_xyz(const double *in, double *out)
+{
+    matmul(LINEAR_TO_XYZ, in, out);
+    return 0;
+}
+
+static int
+xyz_to_linear(const double *in, double *out)
+{
+    matmul(XYZ_TO_LINEAR, in, out);
+    return 0;
+}
+
+static int
+lab_f(double t, double *out)
+{
+    if (t > LAB_DELTA_3)
+        return py_pow(t, 1.0 / 3, out);
+    *out = t / (3 * LAB_DELTA_2) + 4.0 / 29;
+    return 0;
+}
+
+static int
+lab_f_inverse(double t, double *out)
+{
+    if (t > LAB_DELTA)
+        return py_pow(t, 3.0, out);
+    *out = 3 * LAB_DELTA_2 * (t - 4.0 / 29);
+    return 0;
+}
+
+static int
+xyz_to_lab(const double *in, double *out)
+{
+    double fx, fy, fz;
+    if (lab_f(in[0] / D65[0], &fx) < 0 || lab_f(in[1] / D65[1], &fy) < 0 || lab_f(in[2] / D65[2], &fz) < 0)
+        return -1;
+    out[0] = 116 * fy - 16;
+    out[1] = 500 * (fx - fy);
+    out[2] = 200 * (fy - fz);
+    return 0;
+}
+
+static int
+lab_to_xyz(const double *in, double *out)
+{
+    double fy = (in[0] + 16) / 116;
+    double fx = fy + in[1] / 500;
+    double fz = fy - in[2] / 200;
+    for (int i = 0; i < 3; i++) {
+        if (lab_f_inverse(i == 0 ? fx : i == 1 ? fy : fz, &out[i]) < 0)
+            return -1;
+        out[i] = D65[i] * out[i];
+    }
+    return 0;
+}
+
+static int
+linear_to_oklab(const double *in, double *out)
+{
+    double lms[3];
+    matmul(LINEAR_TO_LMS, in, lms);
+    for (int i = 0; i < 3; i++) {
+        double c = lms[i];
+        if (py_pow(fabs(c), 1.0 / 3, &lms[i]) < 0)
+            return -1;
+        lms[i] = copysign(lms[i], c);
+    }
+    matmul(LMS_TO_OKLAB, lms, out);
+    return 0;
+}
+
+static int
+oklab_to_linear(const double *in, double *out)
+{
+    double lms[3];
+    matmul(OKLAB_TO_LMS, in, lms);
+    for (int i = 0; i < 3; i++) {
+        if (py_pow(lms[i], 3.0, &lms[i]) < 0)
+            return -1;
+    }
+    matmul(LMS_TO_LINEAR, lms, out);
+    return 0;
+}
+
+
+typedef struct {
+    const char *name;
+    kernel_t kernel;
+    /* rgb channels are ints, batches truncate them like int() */
+    int integral_in, integral_out;
+} edge_t;
+
+static const edge_t EDGES[] = {
+    {"rgb_to_float", rgb_to_float, 1, 0},
+    {"float_to_rgb", float_to_rgb, 0, 1},
+    {"float_to_hsv", float_to_hsv, 0, 0},
+    {"hsv_to_float", hsv_to_float, 0, 0},
+    {"hsv_to_rgb", hsv_to_rgb, 0, 1},
+    {"rgb_to_linear", rgb_to_linear, 1, 0},
+    {"float_to_linear", float_to_linear, 0, 0},
+    {"linear_to_float", linear_to_float, 0, 0},
+    {"linear_to_xyz", linear_to_xyz, 0, 0},
+    {"xyz_to_linear", xyz_to_linear, 0, 0},
+    {"xyz_to_lab", xyz_to_lab, 0, 0},
+    {"lab_to_xyz", lab_to_xyz, 0, 0},
+    {"linear_to_oklab", linear_to_oklab, 0, 0},
+    {"oklab_to_linear", oklab_to_linear, 0, 0},
+    {NULL, NULL, 0, 0},
+};
+
+static const edge_t *
+find_edge(PyObject *name)
+{
+    const char *s = PyUnicode_AsUTF8(name);
+    if (s == NULL)
+        return NULL;
+    for (const edge_t *edge = EDGES; edge->name != NULL; edge++) {
+        if (strcmp(edge->name, s) == 0)
+            return edge;
+    }
+    PyErr_Format(PyExc_ValueError, "Unknown conversion %R", name);
+    return NULL;
+}
+
+static int
+log_clamping(void)
+{
+    if (logger == NULL) {
+        PyObject *logging = PyImport_ImportModule("logging");
+        if (logging == NULL)
+            return -1;
+        logger = PyObject_CallMethod(logging, "getLogger", "s", "colors.py");
+        Py_DECREF(logging);
+        if (logger == NULL)
+            return -1;
+    }
+    PyObject *result = PyObject_CallMethod(logger, "info", "s", "Color value not in 0-1 range, clamping will occur.");
+    Py_XDECREF(result);
+    return result == NULL ? -1 : 0;
+}
+
+/* The three channels of a color, unpacked like ``r, g, b = color``. */
+static PyObject *
+unpack(PyObject *color, double *channels)
+{
+    PyObject *seq = PySequence_Fast(color, "cannot unpack non-iterable object");
+    if (seq == NULL)
+        return NULL;
+    Py_ssize_t size = PySequence_Fast_GET_SIZE(seq);
+    if (size != 3) {
+        if (size < 3)
+            PyErr_Format(PyExc_ValueError, "not enough values to unpack (expected 3, got %zd)", size);
+        else
+            PyErr_SetString(PyExc_ValueError, "too many values to unpack (expected 3)");
+        Py_DECREF(seq);
+        return NULL;
+    }
+    for (int i = 0; i < 3; i++) {
+        channels[i] = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(seq, i));
+        if (channels[i] == -1.0 && PyErr_Occurred()) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+    }
+    return seq;
+}
+
+static PyObject *
+pack(const double *channels, int integral)
+{
+    PyObject *values[3];
+    for (int i = 0; i < 3; i++) {
+        values[i] = integral ? PyLong_FromDouble(channels[i]) : PyFloat_FromDouble(channels[i]);
+        if (values[i] == NULL) {
+            while (i--)
+                Py_DECREF(values[i]);
+            return NULL;
+        }
+    }
+    PyObject *result = PyTuple_Pack(3, values[0], values[1], values[2]);
+    for (int i = 0; i < 3; i++)
+        Py_DECREF(values[i]);
+    return result;
+}
+
+static PyObject *
+convert(const edge_t *edge, PyObject *color)
+{
+    double in[3], out[3];
+    PyObject *seq = unpack(color, in);
+    if (seq == NULL)
+        return NULL;
+    if (edge->kernel == hsv_to_float && in[1] == 0.0) {
+        /* colorsys returns the value itself for grays */
+        PyObject *v = PySequence_Fast_GET_ITEM(seq, 2);
+        PyObject *result = PyTuple_Pack(3, v, v, v);
+        Py_DECREF(seq);
+        return result;
+    }
+    Py_DECREF(seq);
+    int status = edge->kernel(in, out);
+    if (status < 0 || (status > 0 && log_clamping() < 0))
+        return NULL;
+    return pack(out, edge->integral_out);
+}
+
+#define EDGE_FUNCTION(index, name) \
+    static PyObject * \
+    py_##name(PyObject *module, PyObject *color) \
+    { \
+        return convert(&EDGES[index], color); \
+    }
+
+EDGE_FUNCTION(0, rgb_to_float)
+EDGE_FUNCTION(1, float_to_rgb)
+EDGE_FUNCTION(2, float_to_hsv)
+EDGE_FUNCTION(3, hsv_to_float)
+EDGE_FUNCTION(4, hsv_to_rgb)
+EDGE_FUNCTION(5, rgb_to_linear)
+EDGE_FUNCTION(6, float_to_linear)
+EDGE_FUNCTION(7, linear_to_float)
+EDGE_FUNCTION(8, linear_to_xyz)
+EDGE_FUNCTION(9, xyz_to_linear)
+EDGE_FUNCTION(10, xyz_to_lab)
+EDGE_FUNCTION(11, lab_to_xyz)
+EDGE_FUNCTION(12, linear_to_oklab)
+EDGE_FUNCTION(13, oklab_to_linear)
+
+
+/* Flat buffers of doubles, any C contiguous buffer with the "d" format. */
+static int
+get_doubles(PyObject *obj, Py_buffer *view, int writable, const char *name)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT | (writable ? PyBUF_WRITABLE : 0)) < 0)
+        return -1;
+    if (view->itemsize != 8 || view->format == NULL || strcmp(view->format, "d") != 0) {
+        PyErr_Format(PyExc_TypeError, "%s must be a buffer of doubles", name);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+py_convert_many(PyObject *module, PyObject *args)
+{
+    PyObject *name, *src_obj, *out_obj;
+    Py_buffer src, out;
+    if (!PyArg_ParseTuple(args, "UOO:convert_many", &name, &src_obj, &out_obj))
+        return NULL;
+    const edge_t *edge = find_edge(name);
+    if (edge == NULL || get_doubles(src_obj, &src, 0, "src") < 0)
+        return NULL;
+    if (get_doubles(out_obj, &out, 1, "out") < 0) {
+        PyBuffer_Release(&src);
+        return NULL;
+    }
+    Py_ssize_t size = src.len / 8;
+    PyObject *result = NULL;
+    if (size % 3) {
+        PyErr_SetString(PyExc_ValueError, "src must hold a whole number of colors");
+        goto done;
+    }
+    if (out.len != src.len) {
+        PyErr_SetString(PyExc_ValueError, "out must have the same length as src");
+        goto done;
+    }
+    const double *in = src.buf;
+    double *dst = out.buf;
+    for (Py_ssize_t i = 0; i < size; i += 3) {
+        double channels[3] = {in[i], in[i + 1], in[i + 2]};
+        if (edge->integral_in) {
+            for (int c = 0; c < 3; c++) {
+                if (py_trunc(channels[c], &channels[c]) < 0)
+                    goto done;
+            }
+        }
+        int status = edge->kernel(channels, dst + i);
+        if (status < 0 || (status > 0 && log_clamping() < 0))
+            goto done;
+    }
+    Py_INCREF(Py_None);
+    result = Py_None;
+done:
+    PyBuffer_Release(&src);
+    PyBuffer_Release(&out);
+    return result;
+}
+
+
+/* Blend modes, one channel at a time, written like the Python formulas. */
+
+enum {
+    MULTIPLY, ADD, DIVIDE, SUBTRACT, SCREEN, DIFFERENCE, OVERLAY,
+    COLOR_DODGE, LINEAR_DODGE, COLOR_BURN, LINEAR_BURN,
+};
+
+static const char *MODES[] = {
+    "multiply", "add", "divide", "subtract", "screen", "difference", "overlay",
+    "color_dodge", "linear_dodge", "color_burn", "linear_burn", NULL,
+};
+
+static int
+find_mode(PyObject *name)
+{
+    const char *s = PyUnicode_AsUTF8(name);
+    if (s == NULL)
+        return -1;
+    for (int i = 0; MODES[i] != NULL; i++) {
+        if (strcmp(MODES[i], s) == 0)
+            return i;
+    }
+    PyErr_Format(PyExc_ValueError, "Unknown blend mode %R", name);
+    return -1;
+}
+
+/* min(1, x) */
+static double
+at_most_1(double x)
+{
+    return x < 1 ? x : 1;
+}
+
+/* max(0, x) */
+static double
+at_least_0(double x)
+{
+    return x > 0 ? x : 0;
+}
+
+static int
+blend_channel(int mode, double a, double b, double *out)
+{
+    switch (mode) {
+    case MULTIPLY:
+        *out = at_most_1(a * b);
+        break;
+    case ADD:
+    case LINEAR_DODGE:
+        *out = at_most_1(a + b);
+        break;
+    case DIVIDE:
+        if (b == 0 || a / b == 0)
+            return zero_division();
+        *out = at_least_0(at_most_1(1 / (a / b)));
+        break;
+    case SUBTRACT:
+        *out = at_least_0(b - a);
+        break;
+    case SCREEN:
+        *out = 1 - (((1 - a) * (1 - b)) / 1.0);
+        break;
+    case DIFFERENCE:
+        *out = fabs(a - b);
+        break;
+    case OVERLAY:
+        *out = (double)(b > 0.5) * (1 - (1 - 2 * (b - 0.5)) * (1 - a)) + (double)(b <= 0.5) * ((2 * b) * a);
+        break;
+    case COLOR_DODGE:
+        if (1 - a == 0)
+            return zero_division();
+        *out = at_least_0(at_most_1(b / (1 - a)));
+        break;
+    case COLOR_BURN:
+        if (a == 0)
+            return zero_division();
+        *out = at_least_0(at_most_1(1 - (1 - b) / a));
+        break;
+    case LINEAR_BURN:
+        *out = at_least_0(at_most_1(a + b - 1));
+        break;
+    }
+    return 0;
+}
+
+static PyObject *
+py_blend(PyObject *module, PyObject *args)
+{
+    PyObject *name, *a_obj, *b_obj, *seq;
+    double a[3], b[3], out[3];
+    if (!PyArg_ParseTuple(args, "UOO:blend", &name, &a_obj, &b_obj))
+        return NULL;
+    int mode = find_mode(name);
+    if (mode < 0)
+        return NULL;
+    if ((seq = unpack(a_obj, a)) == NULL)
+        return NULL;
+    Py_DECREF(seq);
+    if ((seq = unpack(b_obj, b)) == NULL)
+        return NULL;
+    Py_DECREF(seq);
+    for (int i = 0; i < 3; i++) {
+        if (blend_channel(mode, a[i], b[i], &out[i]) < 0)
+            return NULL;
+    }
+    return pack(out, 0);
+}
+
+static PyObject *
+py_blend_many(PyObject *module, PyObject *args)
+{
+    PyObject *name, *a_obj, *b_obj, *out_obj;
+    Py_buffer a, b, out;
+    if (!PyArg_ParseTuple(args, "UOOO:blend_many", &name, &a_obj, &b_obj, &out_obj))
+        return NULL;
+    int mode = find_mode(name);
+    if (mode < 0 || get_doubles(a_obj, &a, 0, "a") < 0)
+        return NULL;
+    if (get_doubles(b_obj, &b, 0, "b") < 0) {
+        PyBuffer_Release(&a);
+        return NULL;
+    }
+    if (get_doubles(out_obj, &out, 1, "out") < 0) {
+        PyBuffer_Release(&a);
+        PyBuffer_Release(&b);
+        return NULL;
+    }
+    PyObject *result = NULL;
+    if (b.len != a.len || out.len != a.len) {
+        PyErr_SetString(PyExc_ValueError, "Blended buffers must have the same length");
+        goto done;
+    }
+    const double *x = a.buf, *y = b.buf;
+    double *dst = out.buf;
+    for (Py_ssize_t i = 0; i < a.len / 8; i++) {
+        if (blend_channel(mode, x[i], y[i], &dst[i]) < 0)
+            goto done;
+    }
+    Py_INCREF(Py_None);
+    result = Py_None;
+done:
+    PyBuffer_Release(&a);
+    PyBuffer_Release(&b);
+    PyBuffer_Release(&out);
+    return result;
+}
+
+
+#define EDGE_METHOD(name) \
+    {#name, (PyCFunction)py_##name, METH_O, "The " #name " conversion edge of colors.base."}
+
+static PyMethodDef methods[] = {
+    EDGE_METHOD(rgb_to_float),
+    EDGE_METHOD(float_to_rgb),
+    EDGE_METHOD(float_to_hsv),
+    EDGE_METHOD(hsv_to_float),
+    EDGE_METHOD(hsv_to_rgb),
+    EDGE_METHOD(rgb_to_linear),
+    EDGE_METHOD(float_to_linear),
+    EDGE_METHOD(linear_to_float),
+    EDGE_METHOD(linear_to_xyz),
+    EDGE_METHOD(xyz_to_linear),
+    EDGE_METHOD(xyz_to_lab),
+    EDGE_METHOD(lab_to_xyz),
+    EDGE_METHOD(linear_to_oklab),
+    EDGE_METHOD(oklab_to_linear),
+    {"convert_many", py_convert_many, METH_VARARGS,
+     "convert_many(edge, src, out)\n--\n\nApply a conversion edge to every color of a buffer of doubles, writing into out."},
+    {"blend", py_blend, METH_VARARGS,
+     "blend(mode, a, b)\n--\n\nThe float channels of blend mode ``mode`` applied to two colors."},
+    {"blend_many", py_blend_many, METH_VARARGS,
+     "blend_many(mode, a, b, out)\n--\n\nApply a blend mode to every channel of two buffers of doubles, writing into out."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT,
+    "colors._speedups",
+    "Compiled conversion edges and blend modes, giving the same values as the pure-Python code.",
+    -1,
+    methods,
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    for (int c = 0; c < 256; c++) {
+        if (srgb_to_linear(c / 255.0, &SRGB_TO_LINEAR[c]) < 0)
+            return NULL;
+    }
+    LAB_DELTA = 6.0 / 29;
+    LAB_DELTA_2 = pow(LAB_DELTA, 2.0);
+    LAB_DELTA_3 = pow(LAB_DELTA, 3.0);
+    return PyModule_Create(&module);
+}
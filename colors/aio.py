@@ -0,0 +1,238 @@
+"""
+colors.aio
+==========
+Asyncio counterparts of the batch APIs, for use inside an event loop.
+
+:func:`convert`, :func:`blend`, :func:`nearest_many` and :func:`quantize` do
+the same work as :meth:`ColorArray.to <colors.array.ColorArray.to>`,
+:func:`colors.blend.blend`, :meth:`Palette.nearest_many
+<colors.palette.Palette.nearest_many>` and :func:`colors.quantize.quantize`.
+Inputs smaller than :data:`ASYNC_THRESHOLD` colors are processed right away
+on the event loop, where handing them to a thread costs more than it saves.
+Larger ones are processed :data:`CHUNK_SIZE` colors at a time on a shared
+pool of :data:`MAX_WORKERS` threads, or on ``executor=`` when given. Every
+call has at most one chunk in flight, so the pool never queues more chunks
+than there are calls waiting on it, and a cancelled call stops after the
+chunk it is waiting for.
+
+:func:`iter_convert`, :func:`iter_blend` and :func:`iter_nearest_many` are
+async iterators yielding the results chunk by chunk, and only compute the next
+chunk once the previous one was consumed.
+"""
+from __future__ import annotations
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .array import ColorArray, SPACES, _is_numpy
+from .base import Color
+from .blend import BLEND_MODES, LAYOUTS, _blend_chunk
+from .quantize import CHUNK_SIZE as QUANTIZE_CHUNK_SIZE, _Quantizer, _check, _sampled
+
+__all__ = (
+    "ASYNC_THRESHOLD", "CHUNK_SIZE", "MAX_WORKERS", "get_executor", "shutdown",
+    "convert", "iter_convert", "blend", "iter_blend", "nearest_many", "iter_nearest_many", "quantize",
+)
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+    from .palette import Palette, PaletteEntry
+    from .quantize import Swatch
+
+#: Inputs with fewer colors than this are processed on the event loop.
+ASYNC_THRESHOLD = 1 << 14
+
+#: Default number of colors handed to a worker at a time.
+CHUNK_SIZE = 1 << 16
+
+#: Threads of the shared pool.
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """ The shared thread pool, started on first use. """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="colors-aio")
+    return _executor
+
+
+def shutdown() -> None:
+    """ Shut down the shared thread pool. It is started again on demand. """
+    global _executor
+    if _executor is not None:
+        pool, _executor = _executor, None
+        pool.shutdown()
+
+
+def _resolve(size: Optional[int], executor: Optional[Executor]) -> Optional[Executor]:
+    """ The executor for ``size`` colors, None for unknown sizes, or None to stay on the event loop. """
+    if size is not None and size < ASYNC_THRESHOLD:
+        return None
+    return executor if executor is not None else get_executor()
+
+
+async def _call(executor: Optional[Executor], func: Callable, *args):
+    if executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+
+def _rows(colors: ColorArray, start: int, stop: int) -> ColorArray:
+    data = colors.data
+    return ColorArray.from_buffer(data[start:stop] if _is_numpy(data) else data[start * 3:stop * 3], colors.space)
+
+
+async def _map_chunks(func: Callable, inputs: Sequence[ColorArray], args: tuple, chunk_size: int,
+                      executor: Optional[Executor]) -> AsyncIterator[tuple]:
+    """ ``(start, stop, func(*chunks, *args))`` for consecutive row ranges of ``inputs``. """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    size = len(inputs[0])
+    executor = _resolve(size, executor)
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        yield start, stop, await _call(executor, func, *[_rows(colors, start, stop) for colors in inputs], *args)
+
+
+async def _gather(chunks: AsyncIterator[tuple], size: int, space: str) -> ColorArray:
+    out = ColorArray.empty(size, space)
+    numpy = _is_numpy(out.data)
+    async for start, stop, chunk in chunks:
+        if numpy:
+            out.data[start:stop] = chunk.data
+        else:
+            out.data[start * 3:stop * 3] = chunk.data
+    return out
+
+
+def _convert_chunk(colors: ColorArray, space: str) -> ColorArray:
+    return colors.to(space)
+
+
+def _check_space(space: str) -> None:
+    if space not in SPACES:
+        raise ValueError(f"Unknown color space {space!r}")
+
+
+async def convert(colors: ColorArray, space: str, *, chunk_size: int = CHUNK_SIZE,
+                  executor: Optional[Executor] = None) -> ColorArray:
+    """ :meth:`colors.to(space) <colors.array.ColorArray.to>` without blocking the event loop. """
+    _check_space(space)
+    if space == colors.space or _resolve(len(colors), executor) is None:
+        return colors.to(space)
+    chunks = _map_chunks(_convert_chunk, [colors], (space,), chunk_size, executor)
+    return await _gather(chunks, len(colors), space)
+
+
+async def iter_convert(colors: ColorArray, space: str, *, chunk_size: int = CHUNK_SIZE,
+                       executor: Optional[Executor] = None) -> AsyncIterator[ColorArray]:
+    """ The colors converted to ``space``, as one ColorArray per chunk of ``chunk_size`` colors. """
+    _check_space(space)
+    async for _, _, chunk in _map_chunks(_convert_chunk, [colors], (space,), chunk_size, executor):
+        yield chunk
+
+
+def _blend_inputs(mode: str, base: ColorArray, top: Union[ColorArray, Color]) -> tuple:
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}")
+    if isinstance(top, Color):
+        return [base], (top, mode)
+    if len(top) != len(base):
+        raise ValueError("Blended arrays must have the same length")
+    return [base, top], (mode,)
+
+
+async def blend(mode: str, base: ColorArray, top: Union[ColorArray, Color], *, chunk_size: int = CHUNK_SIZE,
+                executor: Optional[Executor] = None) -> ColorArray:
+    """ :func:`colors.blend.blend` without blocking the event loop. """
+    inputs, args = _blend_inputs(mode, base, top)
+    if _resolve(len(base), executor) is None:
+        return _blend_chunk(*inputs, *args)
+    return await _gather(_map_chunks(_blend_chunk, inputs, args, chunk_size, executor), len(base), base.space)
+
+
+async def iter_blend(mode: str, base: ColorArray, top: Union[ColorArray, Color], *, chunk_size: int = CHUNK_SIZE,
+                     executor: Optional[Executor] = None) -> AsyncIterator[ColorArray]:
+    """ The blended colors, as one ColorArray per chunk of ``chunk_size`` colors. """
+    inputs, args = _blend_inputs(mode, base, top)
+    async for _, _, chunk in _map_chunks(_blend_chunk, inputs, args, chunk_size, executor):
+        yield chunk
+
+
+def _nearest_chunk(colors: ColorArray, palette: Palette) -> List[PaletteEntry]:
+    return palette.nearest_many(colors)
+
+
+async def nearest_many(palette: Palette, colors: ColorArray, *, chunk_size: int = CHUNK_SIZE,
+                       executor: Optional[Executor] = None) -> List[PaletteEntry]:
+    """ :meth:`palette.nearest_many(colors) <colors.palette.Palette.nearest_many>` without blocking the event loop.
+
+    A process pool gets a copy of the palette with every chunk, so the lookups
+    it memoizes are not kept.
+    """
+    entries = []
+    async for chunk in iter_nearest_many(palette, colors, chunk_size=chunk_size, executor=executor):
+        entries.extend(chunk)
+    return entries
+
+
+async def iter_nearest_many(palette: Palette, colors: ColorArray, *, chunk_size: int = CHUNK_SIZE,
+                            executor: Optional[Executor] = None) -> AsyncIterator[List[PaletteEntry]]:
+    """ The nearest palette entries, as one list per chunk of ``chunk_size`` colors. """
+    async for _, _, chunk in _map_chunks(_nearest_chunk, [colors], (palette,), chunk_size, executor):
+        yield chunk
+
+
+def _pixel_count(pixels, layout: str) -> Optional[int]:
+    """ The number of pixels of a ColorArray or buffer, None for iterables of chunks. """
+    if isinstance(pixels, ColorArray):
+        return len(pixels)
+    try:
+        return memoryview(pixels).nbytes // LAYOUTS[layout]
+    except TypeError:
+        return None
+
+
+def _feed(quantizer: _Quantizer, chunks: Iterator[tuple]) -> bool:
+    """ Add the next sampled chunk to ``quantizer``, False once there are none left. """
+    for r, g, b in chunks:
+        quantizer.add(r, g, b)
+        return True
+    return False
+
+
+async def quantize(pixels: Union[ColorArray, Iterable, AsyncIterable], n: int = 8, method: str = "median_cut", *,
+                   layout: str = "rgb", subsample: int = 1, bits: int = 5, chunk_size: int = QUANTIZE_CHUNK_SIZE,
+                   batch_size: int = 1024, seed: Optional[int] = None, space: str = "rgb",
+                   executor: Optional[Executor] = None) -> List[Swatch]:
+    """:func:`colors.quantize.quantize` without blocking the event loop.
+
+    ``pixels`` may also be an async iterable of chunks, such as the body of a
+    request being uploaded, which is read one chunk at a time. The chunks are
+    added to a palette held by the calling process, so ``executor`` cannot be
+    a process pool.
+    """
+    _check(n, method, layout, subsample, bits, chunk_size, space)
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError("quantize needs an executor sharing memory with the event loop, such as a thread pool")
+    quantizer = _Quantizer(n, method, bits, batch_size, seed)
+    if hasattr(pixels, "__aiter__"):
+        async for chunk in pixels:
+            chunks = _sampled(chunk, layout, chunk_size, subsample)
+            pool = _resolve(_pixel_count(chunk, layout), executor)
+            while await _call(pool, _feed, quantizer, chunks):
+                pass
+        pool = _resolve(None, executor)
+    else:
+        chunks = _sampled(pixels, layout, chunk_size, subsample)
+        pool = _resolve(_pixel_count(pixels, layout), executor)
+        while await _call(pool, _feed, quantizer, chunks):
+            pass
+    return await _call(pool, quantizer.swatches, space)
@@ -0,0 +1,564 @@
+"""
+colors.array
+============
+Batches of colors stored in a single contiguous buffer.
+
+A :class:`ColorArray` holds N colors of one color space. The channels are kept
+in an ``(N, 3)`` float64 NumPy array when NumPy is installed, and in a flat
+``array('d')`` of length ``3 * N`` otherwise. Conversions between spaces run
+over the whole buffer at once, follow the same conversion graph as the scalar
+classes in :mod:`colors.base` and give the same values.
+"""
+from __future__ import annotations
+import mmap as mmap_
+import os
+import pickle
+import struct
+import sys
+from array import array
+from itertools import chain
+
+from . import base
+from .base import (
+    Color, HSVColor, RGBColor, RGBFloatColor, HexColor, LinearRGBColor, XYZColor, LabColor, OKLabColor,
+    _CONVERSIONS, _path, _parse_hex, _rgb_to_hex,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is missing
+    np = None
+
+__all__ = ("ColorArray", "DTYPES", "SPACES", "parse_hex_many", "format_hex_many")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Iterable, Iterator, Optional, Sequence, Union
+    Buffer = Union["np.ndarray", array]
+    PathLike = Union[str, os.PathLike]
+
+#: Color spaces a ColorArray can hold, mapped to their scalar class.
+SPACES = {
+    "rgb": RGBColor,
+    "float": RGBFloatColor,
+    "hsv": HSVColor,
+    "hex": HexColor,
+    "linear": LinearRGBColor,
+    "xyz": XYZColor,
+    "lab": LabColor,
+    "oklab": OKLabColor,
+}
+
+
+def _kernel_space(space: str) -> str:
+    return "rgb" if space == "hex" else space
+
+
+def _py_kernel(func, integral: bool = False):
+    """ Run a scalar conversion edge over a flat buffer, one triple at a time.
+
+    ``integral`` feeds the edge ints, as 8-bit rgb edges expect.
+    """
+    def kernel(src: array) -> array:
+        it = map(int, src) if integral else iter(src)
+        return array("d", chain.from_iterable(map(func, zip(it, it, it))))
+    return kernel
+
+
+# NumPy kernels, operating on (N, 3) float64 arrays. These have to give the
+# same values as the scalar edges in colors.base.
+
+def _np_rgb_float(src):
+    return src / 255
+
+
+def _np_float_rgb(src):
+    return np.rint(np.clip(src, 0.0, 1.0) * 255)
+
+
+def _np_float_hsv(src):
+    r, g, b = src[:, 0], src[:, 1], src[:, 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    rangec = maxc - minc
+    grey = minc == maxc
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = rangec / maxc
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.mod(h / 6.0, 1.0)
+    h[grey] = 0.0
+    s[grey] = 0.0
+    out = np.empty_like(src)
+    np.clip(h, 0.0, 1.0, out=out[:, 0])
+    np.clip(s, 0.0, 1.0, out=out[:, 1])
+    np.clip(maxc, 0.0, 1.0, out=out[:, 2])
+    hue = out[:, 0]
+    wrap = hue >= 1
+    hue[wrap] -= np.trunc(hue[wrap])
+    return out
+
+
+def _np_hsv_float(src):
+    h, s, v = src[:, 0], src[:, 1], src[:, 2]
+    h6 = h * 6.0
+    i = np.trunc(h6)
+    f = h6 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int64) % 6
+    out = np.empty_like(src)
+    out[:, 0] = np.choose(i, (v, q, p, p, t, v))
+    out[:, 1] = np.choose(i, (t, v, v, q, p, p))
+    out[:, 2] = np.choose(i, (p, p, t, v, v, q))
+    grey = s == 0.0
+    out[grey] = v[grey, None]
+    return out
+
+
+def _np_hsv_rgb(src):
+    return np.rint(_np_hsv_float(src) * 255)
+
+
+_NP_SRGB_TO_LINEAR = None if np is None else np.array(base._SRGB_TO_LINEAR, dtype=np.float64)
+
+
+def _np_rgb_linear(src):
+    # One table lookup per channel instead of a pow
+    return _NP_SRGB_TO_LINEAR[src.astype(np.intp)]
+
+
+def _check_rgb8(data: Buffer) -> None:
+    """ Reject channels outside the 256 entry table the rgb to linear edge looks them up in. """
+    if len(data) and (data.min() < 0 or data.max() > 255 if _is_numpy(data) else min(data) < 0 or max(data) > 255):
+        raise ValueError("Color values must be between 0 and 255")
+
+
+def _np_float_linear(src):
+    with np.errstate(invalid="ignore"):
+        return np.where(src <= 0.04045, src / 12.92, ((src + 0.055) / 1.055) ** 2.4)
+
+
+def _np_linear_float(src):
+    with np.errstate(invalid="ignore"):
+        return np.where(src <= 0.0031308, src * 12.92, 1.055 * src ** (1 / 2.4) - 0.055)
+
+
+def _np_matmul(matrix, src):
+    # Written out so every element is computed like base._matmul
+    x, y, z = src[:, 0], src[:, 1], src[:, 2]
+    out = np.empty_like(src)
+    for i, (m0, m1, m2) in enumerate(matrix):
+        out[:, i] = m0 * x + m1 * y + m2 * z
+    return out
+
+
+def _np_cbrt(c):
+    return np.copysign(np.abs(c) ** (1 / 3), c)
+
+
+def _np_lab_f(t):
+    delta = base._LAB_DELTA
+    return np.where(t > delta ** 3, t ** (1 / 3), t / (3 * delta ** 2) + 4 / 29)
+
+
+def _np_lab_f_inverse(t):
+    delta = base._LAB_DELTA
+    return np.where(t > delta, t ** 3, 3 * delta ** 2 * (t - 4 / 29))
+
+
+def _np_xyz_lab(src):
+    white = base._D65
+    with np.errstate(invalid="ignore"):
+        fx, fy, fz = (_np_lab_f(src[:, i] / white[i]) for i in range(3))
+    out = np.empty_like(src)
+    out[:, 0] = 116 * fy - 16
+    out[:, 1] = 500 * (fx - fy)
+    out[:, 2] = 200 * (fy - fz)
+    return out
+
+
+def _np_lab_xyz(src):
+    white = base._D65
+    fy = (src[:, 0] + 16) / 116
+    fx = fy + src[:, 1] / 500
+    fz = fy - src[:, 2] / 200
+    out = np.empty_like(src)
+    out[:, 0] = white[0] * _np_lab_f_inverse(fx)
+    out[:, 1] = white[1] * _np_lab_f_inverse(fy)
+    out[:, 2] = white[2] * _np_lab_f_inverse(fz)
+    return out
+
+
+def _np_linear_oklab(src):
+    return _np_matmul(base._LMS_TO_OKLAB, _np_cbrt(_np_matmul(base._LINEAR_TO_LMS, src)))
+
+
+def _np_oklab_linear(src):
+    return _np_matmul(base._LMS_TO_LINEAR, _np_matmul(base._OKLAB_TO_LMS, src) ** 3)
+
+
+_NP_KERNELS = {
+    ("rgb", "float"): _np_rgb_float,
+    ("float", "rgb"): _np_float_rgb,
+    ("float", "hsv"): _np_float_hsv,
+    ("hsv", "float"): _np_hsv_float,
+    ("hsv", "rgb"): _np_hsv_rgb,
+    ("rgb", "linear"): _np_rgb_linear,
+    ("float", "linear"): _np_float_linear,
+    ("linear", "float"): _np_linear_float,
+    ("linear", "xyz"): lambda src: _np_matmul(base._LINEAR_TO_XYZ, src),
+    ("xyz", "linear"): lambda src: _np_matmul(base._XYZ_TO_LINEAR, src),
+    ("xyz", "lab"): _np_xyz_lab,
+    ("lab", "xyz"): _np_lab_xyz,
+    ("linear", "oklab"): _np_linear_oklab,
+    ("oklab", "linear"): _np_oklab_linear,
+}
+
+
+def _is_numpy(data) -> bool:
+    return np is not None and isinstance(data, np.ndarray)
+
+
+def _convert(data: Buffer, src: str, dst: str) -> Buffer:
+    """ Convert a raw buffer between two spaces. Always returns a new buffer. """
+    src, dst = _kernel_space(src), _kernel_space(dst)
+    if src == dst:
+        return data.copy() if _is_numpy(data) else array("d", data)
+    for edge in _path(src, dst):
+        if edge == ("rgb", "linear"):
+            _check_rgb8(data)
+        if _is_numpy(data):
+            data = _NP_KERNELS[edge](data)
+        elif base._speedups is not None and hasattr(base._speedups, "%s_to_%s" % edge):
+            out = array("d", bytes(8 * len(data)))
+            base._speedups.convert_many("%s_to_%s" % edge, data, out)
+            data = out
+        else:
+            data = _py_kernel(_CONVERSIONS[edge], edge[0] == "rgb")(data)
+    return data
+
+
+def _empty(size: int) -> Buffer:
+    if np is not None:
+        return np.zeros((size, 3), dtype=np.float64)
+    return array("d", bytes(24 * size))
+
+
+# Binary files hold a header followed by the channels of every color as
+# little-endian float64 or uint8 values.
+_MAGIC = b"CLRA"
+_VERSION = 1
+# magic, version, dtype, color space, number of colors, padded to 32 bytes
+_HEADER = struct.Struct("<4sBBxx8sQ8x")
+#: Channel types of the binary format, with their size in bytes.
+DTYPES = {"float64": 8, "uint8": 1}
+_DTYPE_CODES = ("float64", "uint8")
+
+
+def _encode(data: Buffer, dtype: str):
+    """ The channels as a little-endian buffer of ``dtype``. """
+    if dtype == "float64":
+        if _is_numpy(data):
+            return np.ascontiguousarray(data, dtype="<f8").reshape(-1)
+        if sys.byteorder == "little":
+            return data
+        data = array("d", data)
+        data.byteswap()
+        return data
+    if _is_numpy(data):
+        if ((data < 0) | (data > 255) | (data != np.rint(data))).any():
+            raise ValueError("uint8 can only store integer channels from 0 to 255")
+        return data.astype(np.uint8).reshape(-1)
+    if any(c != int(c) for c in data):
+        raise ValueError("uint8 can only store integer channels from 0 to 255")
+    try:
+        return bytes(map(int, data))
+    except ValueError:
+        raise ValueError("uint8 can only store integer channels from 0 to 255") from None
+
+
+def _decode(buffer, dtype: str, count: int, offset: int = 0) -> Buffer:
+    """ Channels from a buffer written by :func:`_encode`, without copying when possible. """
+    if np is not None:
+        data = np.frombuffer(buffer, dtype="<f8" if dtype == "float64" else np.uint8, count=count * 3, offset=offset)
+        if data.dtype != np.float64:
+            data = data.astype(np.float64)
+        return data.reshape(-1, 3)
+    view = memoryview(buffer)[offset:offset + count * 3 * DTYPES[dtype]]
+    if dtype == "uint8":
+        return array("d", view)
+    data = array("d")
+    data.frombytes(view)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def _unpickle(buffer, space: str) -> ColorArray:
+    # Out of band buffers are wrapped as they are, in band ones were unpickled as a bytearray
+    view = memoryview(buffer).cast("B")
+    if np is not None:
+        return ColorArray.from_buffer(np.frombuffer(view, dtype=np.float64).reshape(-1, 3), space)
+    data = array("d")
+    data.frombytes(view)
+    return ColorArray.from_buffer(data, space)
+
+
+class ColorArray:
+    """ A batch of colors of a single color space in one contiguous buffer.
+
+    Accepts color objects, which are converted to ``space`` (inferred from the
+    first color when omitted), or plain 3-sequences, which are stored as given.
+    Indexing returns the matching scalar color class.
+    """
+    __slots__ = ("_data", "_space")
+
+    def __init__(self, colors: Iterable = (), space: Optional[str] = None):
+        colors = list(colors)
+        if space is None:
+            space = colors[0]._space if colors and isinstance(colors[0], Color) else "rgb"
+        if space not in SPACES:
+            raise ValueError(f"Unknown color space {space!r}")
+        kernel_space = _kernel_space(space)
+        channels = [c._channels(kernel_space) if isinstance(c, Color) else c for c in colors]
+        if np is not None:
+            try:
+                data = np.array(channels, dtype=np.float64)
+            except ValueError:
+                # Ragged input, report it like any other channel count mismatch
+                if all(len(c) == 3 for c in channels):
+                    raise
+                data = None
+            if not channels:
+                data = data.reshape(0, 3)
+            elif data is None or data.ndim != 2 or data.shape[1] != 3:
+                raise ValueError("Colors must have exactly 3 channels")
+        else:
+            if any(len(c) != 3 for c in channels):
+                raise ValueError("Colors must have exactly 3 channels")
+            data = array("d", chain.from_iterable(channels))
+        self._data = data
+        self._space = space
+
+    @classmethod
+    def from_buffer(cls, data: Buffer, space: str = "rgb") -> ColorArray:
+        """ Wrap an existing ``(N, 3)`` float64 ndarray or flat ``array('d')`` without copying. """
+        if space not in SPACES:
+            raise ValueError(f"Unknown color space {space!r}")
+        if _is_numpy(data):
+            if data.dtype != np.float64 or data.ndim != 2 or data.shape[1] != 3:
+                raise ValueError("Buffer must be a float64 array of shape (N, 3)")
+        elif not isinstance(data, array) or data.typecode != "d" or len(data) % 3:
+            raise ValueError("Buffer must be an array('d') with a length divisible by 3")
+        self = cls.__new__(cls)
+        self._data = data
+        self._space = space
+        return self
+
+    @classmethod
+    def empty(cls, size: int, space: str = "rgb") -> ColorArray:
+        """ A zero filled array of ``size`` colors. """
+        return cls.from_buffer(_empty(size), space)
+
+    @property
+    def space(self) -> str:
+        return self._space
+
+    @property
+    def data(self) -> Buffer:
+        """ The underlying buffer. """
+        return self._data
+
+    def to(self, space: str, out: Optional[ColorArray] = None, *,
+           executor: Optional[Executor] = None, workers: Optional[int] = None) -> ColorArray:
+        """ Convert every color to ``space``.
+
+        When ``out`` is given the result is written into its buffer, which must
+        hold the same number of colors. ``workers`` or ``executor`` split large
+        arrays across several processes, see :mod:`colors.parallel`.
+        """
+        if space not in SPACES:
+            raise ValueError(f"Unknown color space {space!r}")
+        if out is None and space == self._space:
+            return self
+        if out is not None and len(out) != len(self):
+            raise ValueError("Output array has a different length")
+        if executor is not None or workers is not None:
+            from . import parallel
+            executor = parallel._resolve(len(self), executor, workers)
+        if executor is not None:
+            return parallel.map_chunks(parallel._convert_chunk, [self], space, executor, (space,), out, workers)
+        data = _convert(self._data, self._space, space)
+        if out is None:
+            return ColorArray.from_buffer(data, space)
+        out._data[:] = data
+        out._space = space
+        return out
+
+    @property
+    def rgb(self) -> ColorArray:
+        return self.to("rgb")
+
+    @property
+    def float(self) -> ColorArray:
+        return self.to("float")
+
+    @property
+    def hsv(self) -> ColorArray:
+        return self.to("hsv")
+
+    @property
+    def hex(self) -> ColorArray:
+        return self.to("hex")
+
+    @property
+    def linear(self) -> ColorArray:
+        return self.to("linear")
+
+    @property
+    def xyz(self) -> ColorArray:
+        return self.to("xyz")
+
+    @property
+    def lab(self) -> ColorArray:
+        return self.to("lab")
+
+    @property
+    def oklab(self) -> ColorArray:
+        return self.to("oklab")
+
+    def tolist(self) -> list:
+        """ The channels as a list of tuples. """
+        if _is_numpy(self._data):
+            return [tuple(c) for c in self._data.tolist()]
+        it = iter(self._data)
+        return list(zip(it, it, it))
+
+    def _scalar(self, channels: Sequence[float]) -> Color:
+        if self._space == "hex":
+            return HexColor._from_channels(_rgb_to_hex([int(c) for c in channels]))
+        if self._space == "rgb":
+            return RGBColor(*[int(c) for c in channels])
+        return SPACES[self._space](*channels)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if _is_numpy(self._data):
+                return ColorArray.from_buffer(self._data[index], self._space)
+            start, stop, step = index.indices(len(self))
+            data = array("d", chain.from_iterable(
+                self._data[i * 3:i * 3 + 3] for i in range(start, stop, step)))
+            return ColorArray.from_buffer(data, self._space)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ColorArray index out of range")
+        if _is_numpy(self._data):
+            return self._scalar(self._data[index].tolist())
+        return self._scalar(self._data[index * 3:index * 3 + 3])
+
+    def __iter__(self) -> Iterator[Color]:
+        return map(self._scalar, self.tolist())
+
+    def __len__(self) -> int:
+        return len(self._data) if _is_numpy(self._data) else len(self._data) // 3
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} colors>, space={self._space!r})"
+
+    def __reduce_ex__(self, protocol: int):
+        if protocol < 5:
+            return ColorArray.from_buffer, (self._data, self._space)
+        # The channels are passed as a PickleBuffer, which a pickler with a
+        # buffer_callback hands over out of band instead of copying them.
+        data = np.ascontiguousarray(self._data).reshape(-1) if _is_numpy(self._data) else self._data
+        return _unpickle, (pickle.PickleBuffer(data), self._space)
+
+    def save(self, path: PathLike, dtype: str = "float64") -> None:
+        """Write the array to a binary file.
+
+        The file holds a small header with the color space, the channel type and
+        the number of colors, followed by the packed channels. ``dtype`` is
+        ``"float64"``, or ``"uint8"`` for 3 bytes per color in the ``"rgb"`` and
+        ``"hex"`` spaces.
+        """
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype {dtype!r}")
+        if dtype == "uint8" and self._space not in ("rgb", "hex"):
+            raise ValueError("uint8 can only store colors in the rgb or hex space")
+        data = _encode(self._data, dtype)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, _DTYPE_CODES.index(dtype), self._space.encode("ascii"), len(self)))
+            f.write(memoryview(data).cast("B"))
+
+    @classmethod
+    def load(cls, path: PathLike, mmap: bool = False) -> ColorArray:
+        """Read a file written by :meth:`save`.
+
+        With ``mmap`` the file is memory mapped instead of read. A float64 file
+        then becomes a read-only view of the mapping without any copy, so only
+        the pages that are used are read from disk. Views need NumPy, without
+        it and for uint8 files the channels are copied out of the mapping.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:4] != _MAGIC:
+                raise ValueError(f"Not a color array file: {os.fspath(path)!r}")
+            _, version, code, space, count = _HEADER.unpack(header)
+            if version != _VERSION:
+                raise ValueError(f"Unsupported color array file version {version}")
+            space = space.rstrip(b"\0").decode("ascii")
+            if space not in SPACES or code >= len(_DTYPE_CODES):
+                raise ValueError(f"Corrupt color array file: {os.fspath(path)!r}")
+            dtype = _DTYPE_CODES[code]
+            size = count * 3 * DTYPES[dtype]
+            if os.fstat(f.fileno()).st_size != _HEADER.size + size:
+                raise ValueError(f"Truncated color array file: {os.fspath(path)!r}")
+            if mmap:
+                buffer = mmap_.mmap(f.fileno(), 0, access=mmap_.ACCESS_READ)
+                offset = _HEADER.size
+            else:
+                buffer = bytearray(size)
+                f.readinto(buffer)
+                offset = 0
+        return cls.from_buffer(_decode(buffer, dtype, count, offset), space)
+
+
+def _packed(array_: ColorArray):
+    """ The colors of an array as packed 24-bit integers. """
+    rgb = array_.rgb.data
+    if _is_numpy(rgb):
+        rgb = rgb.astype(np.int64)
+        return (rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]).tolist()
+    it = map(int, rgb)
+    return [r << 16 | g << 8 | b for r, g, b in zip(it, it, it)]
+
+
+def parse_hex_many(hex_strings: Iterable[str]) -> ColorArray:
+    """Parse hex color strings into a ColorArray in the hex space.
+
+    Accepts ``#rgb``, ``#rgba``, ``#rrggbb`` and ``#rrggbbaa``, with or without
+    the ``#``. The alpha digits are validated but dropped.
+    """
+    packed = [_parse_hex(s) for s in hex_strings]
+    if np is not None:
+        values = np.array(packed, dtype=np.int64)
+        data = np.empty((len(packed), 3), dtype=np.float64)
+        data[:, 0] = values >> 16
+        data[:, 1] = values >> 8 & 0xff
+        data[:, 2] = values & 0xff
+    else:
+        data = array("d", chain.from_iterable((v >> 16, v >> 8 & 0xff, v & 0xff) for v in packed))
+    return ColorArray.from_buffer(data, "hex")
+
+
+def format_hex_many(colors: ColorArray, prefix: str = "") -> list:
+    """ Format every color of an array as a 6 digit hex string, e.g. ``prefix="#"`` for CSS. """
+    template = prefix.replace("%", "%%") + "%06x"
+    return [template % v for v in _packed(colors)]
@@ -6,104 +6,594 @@ and generate random colors within boundaries.
 """
 from __future__ import annotations
 import colorsys
+import copyreg
+import math
 import random as random_
 import logging
+import os
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
 from numbers import Integral
 
-__all__ = ("Color", "HSVColor", "RGBColor", "RGBFloatColor", "HexColor", "ColorWheel")
+__all__ = (
+    "Color", "HSVColor", "RGBColor", "RGBFloatColor", "HexColor", "ColorWheel",
+    "LinearRGBColor", "XYZColor", "LabColor", "OKLabColor", "RGBAColor", "HSVAColor",
+    "FrozenHSVColor", "FrozenRGBColor", "FrozenRGBFloatColor", "FrozenHexColor",
+    "FrozenLinearRGBColor", "FrozenXYZColor", "FrozenLabColor", "FrozenOKLabColor",
+)
 
 from typing import overload, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from typing import Self, Union, TypeVar
-    AnyColor = Union["RGBColor", "HSVColor", "RGBFloatColor", "HexColor"]
+    AnyColor = Union["RGBColor", "HSVColor", "RGBFloatColor", "HexColor",
+                     "LinearRGBColor", "XYZColor", "LabColor", "OKLabColor"]
     T = TypeVar("T")
 HEX_RANGE = frozenset("0123456789abcdef")
+# Translation table deleting every hex digit, a string is valid hex if nothing is left.
+_HEX_DIGITS = dict.fromkeys(map(ord, "0123456789abcdefABCDEF"))
 
 logger = logging.getLogger("colors.py")
 
+# Factory returning interned FrozenRGBColor objects, set by colors.intern.
+_intern_rgb = None
+
+# Whether the public constructors warn about the arguments they round, set by colors.validation.
+_strict = ContextVar("colors_strict", default=True)
+
+
+def _load_speedups():
+    """The compiled :mod:`colors._speedups` module, or None for the pure-Python code.
+
+    ``COLORS_BACKEND=python`` forces the pure-Python code, ``COLORS_BACKEND=c``
+    raises when the extension is missing instead of falling back.
+    """
+    backend = os.environ.get("COLORS_BACKEND", "auto").lower()
+    if backend not in ("auto", "c", "python"):
+        raise ValueError(f"COLORS_BACKEND must be 'auto', 'c' or 'python', not {backend!r}")
+    if backend == "python":
+        return None
+    try:
+        from . import _speedups
+    except ImportError:
+        if backend == "c":
+            raise
+        return None
+    return _speedups
+
+
+_speedups = _load_speedups()
+#: The implementation of the conversions and blend modes in use, ``"c"`` or ``"python"``.
+BACKEND = "python" if _speedups is None else "c"
+
+
+def _clamp(c: float) -> float:
+    return min(1.0, max(0.0, c))
+
+
+def _rgb_to_float(color) -> tuple:
+    r, g, b = color
+    return r / 255, g / 255, b / 255
+
+
+def _float_to_rgb(color) -> tuple:
+    r, g, b = color
+    return round(_clamp(r) * 255), round(_clamp(g) * 255), round(_clamp(b) * 255)
+
+
+def _float_to_hsv(color) -> tuple:
+    color = colorsys.rgb_to_hsv(*color)
+    h, s, v = clamped = tuple(map(_clamp, color))
+    if clamped != color:
+        logger.info("Color value not in 0-1 range, clamping will occur.")
+    # Hue can safely circle around 1
+    if h >= 1:
+        h -= int(h)
+    return h, s, v
+
+
+def _hsv_to_float(color) -> tuple:
+    return colorsys.hsv_to_rgb(*color)
+
+
+def _hsv_to_rgb(color) -> tuple:
+    r, g, b = colorsys.hsv_to_rgb(*color)
+    return round(r * 255), round(g * 255), round(b * 255)
+
+
+def _rgb_to_hex(color) -> int:
+    r, g, b = color
+    return r << 16 | g << 8 | b
+
+
+def _hex_to_rgb(value: int) -> tuple:
+    return value >> 16, value >> 8 & 0xff, value & 0xff
+
+
+def _hex_to_float(value: int) -> tuple:
+    return (value >> 16) / 255.0, (value >> 8 & 0xff) / 255.0, (value & 0xff) / 255.0
+
+
+def _parse_hex(hex_string: str) -> int:
+    """ Packed 24-bit value of a ``#rgb``, ``#rrggbb`` or ``#rrggbbaa`` string, the alpha is dropped.
+
+    The leading ``#`` is optional. ``#rgba`` is accepted as well.
+    """
+    if hex_string[:1] == "#":
+        hex_string = hex_string[1:]
+    if hex_string.translate(_HEX_DIGITS):
+        raise ValueError(f"Not a valid hex number: {hex_string!r}")
+    size = len(hex_string)
+    if size == 6:
+        return int(hex_string, 16)
+    if size == 8:
+        return int(hex_string[:6], 16)
+    if size == 3 or size == 4:
+        r, g, b = int(hex_string[0], 16), int(hex_string[1], 16), int(hex_string[2], 16)
+        return (r << 16 | g << 8 | b) * 0x11
+    raise ValueError(f"Hex color must be 3, 4, 6 or 8 digits: {hex_string!r}")
+
+
+# sRGB transfer functions, IEC 61966-2-1.
+
+def _srgb_to_linear(c: float) -> float:
+    if c <= 0.04045:
+        return c / 12.92
+    return ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(c: float) -> float:
+    if c <= 0.0031308:
+        return c * 12.92
+    return 1.055 * c ** (1 / 2.4) - 0.055
+
+
+# Linear value of every 8-bit channel value.
+_SRGB_TO_LINEAR = tuple(_srgb_to_linear(c / 255) for c in range(256))
+
+# Linear sRGB to CIE XYZ, D65 white point.
+_LINEAR_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+_XYZ_TO_LINEAR = (
+    (3.2404542, -1.5371385, -0.4985314),
+    (-0.9692660, 1.8760108, 0.0415560),
+    (0.0556434, -0.2040259, 1.0572252),
+)
+_D65 = (0.95047, 1.0, 1.08883)
+_LAB_DELTA = 6 / 29
+
+# OKLab, https://bottosson.github.io/posts/oklab/
+_LINEAR_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_OKLAB = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+_OKLAB_TO_LMS = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+_LMS_TO_LINEAR = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+
+
+def _matmul(matrix: tuple, color) -> tuple:
+    x, y, z = color
+    return tuple(m0 * x + m1 * y + m2 * z for m0, m1, m2 in matrix)
+
+
+def _cbrt(c: float) -> float:
+    return math.copysign(abs(c) ** (1 / 3), c)
+
+
+def _lab_f(t: float) -> float:
+    if t > _LAB_DELTA ** 3:
+        return t ** (1 / 3)
+    return t / (3 * _LAB_DELTA ** 2) + 4 / 29
+
+
+def _lab_f_inverse(t: float) -> float:
+    if t > _LAB_DELTA:
+        return t ** 3
+    return 3 * _LAB_DELTA ** 2 * (t - 4 / 29)
+
+
+def _rgb_to_linear(color) -> tuple:
+    r, g, b = color
+    return _SRGB_TO_LINEAR[r], _SRGB_TO_LINEAR[g], _SRGB_TO_LINEAR[b]
+
+
+def _float_to_linear(color) -> tuple:
+    r, g, b = color
+    return _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
+
+
+def _linear_to_float(color) -> tuple:
+    r, g, b = color
+    return _linear_to_srgb(r), _linear_to_srgb(g), _linear_to_srgb(b)
+
+
+def _linear_to_xyz(color) -> tuple:
+    return _matmul(_LINEAR_TO_XYZ, color)
+
+
+def _xyz_to_linear(color) -> tuple:
+    return _matmul(_XYZ_TO_LINEAR, color)
+
+
+def _xyz_to_lab(color) -> tuple:
+    x, y, z = color
+    fx, fy, fz = _lab_f(x / _D65[0]), _lab_f(y / _D65[1]), _lab_f(z / _D65[2])
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def _lab_to_xyz(color) -> tuple:
+    l, a, b = color
+    fy = (l + 16) / 116
+    fx = fy + a / 500
+    fz = fy - b / 200
+    return _D65[0] * _lab_f_inverse(fx), _D65[1] * _lab_f_inverse(fy), _D65[2] * _lab_f_inverse(fz)
+
+
+def _linear_to_oklab(color) -> tuple:
+    l, m, s = _matmul(_LINEAR_TO_LMS, color)
+    return _matmul(_LMS_TO_OKLAB, (_cbrt(l), _cbrt(m), _cbrt(s)))
+
+
+def _oklab_to_linear(color) -> tuple:
+    l, m, s = _matmul(_OKLAB_TO_LMS, color)
+    return _matmul(_LMS_TO_LINEAR, (l ** 3, m ** 3, s ** 3))
+
+
+# Color difference metrics, working on channels of the metric's color space.
+
+def _euclidean(c1, c2) -> float:
+    return math.sqrt((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2)
+
+
+def _delta_e2000(lab1, lab2) -> float:
+    """ CIEDE2000 color difference, following Sharma, Wu and Dalal (2005). """
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c_bar = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - math.sqrt(c_bar ** 7 / (c_bar ** 7 + 25 ** 7)))
+    a1, a2 = (1 + g) * a1, (1 + g) * a2
+    c1, c2 = math.hypot(a1, b1), math.hypot(a2, b2)
+    h1 = math.degrees(math.atan2(b1, a1)) % 360
+    h2 = math.degrees(math.atan2(b2, a2)) % 360
+
+    dh = h2 - h1
+    if c1 * c2 == 0:
+        dh = 0.0
+    elif dh > 180:
+        dh -= 360
+    elif dh < -180:
+        dh += 360
+    dl = l2 - l1
+    dc = c2 - c1
+    dh = 2 * math.sqrt(c1 * c2) * math.sin(math.radians(dh / 2))
+
+    l_bar = (l1 + l2) / 2
+    c_bar = (c1 + c2) / 2
+    h_bar = h1 + h2
+    if c1 * c2 != 0:
+        if abs(h1 - h2) > 180:
+            h_bar += 360 if h_bar < 360 else -360
+        h_bar /= 2
+
+    t = (1 - 0.17 * math.cos(math.radians(h_bar - 30)) + 0.24 * math.cos(math.radians(2 * h_bar))
+         + 0.32 * math.cos(math.radians(3 * h_bar + 6)) - 0.20 * math.cos(math.radians(4 * h_bar - 63)))
+    theta = 30 * math.exp(-((h_bar - 275) / 25) ** 2)
+    rc = 2 * math.sqrt(c_bar ** 7 / (c_bar ** 7 + 25 ** 7))
+    sl = 1 + 0.015 * (l_bar - 50) ** 2 / math.sqrt(20 + (l_bar - 50) ** 2)
+    sc = 1 + 0.045 * c_bar
+    sh = 1 + 0.015 * c_bar * t
+    rt = -math.sin(math.radians(2 * theta)) * rc
+    dl, dc, dh = dl / sl, dc / sc, dh / sh
+    return math.sqrt(dl ** 2 + dc ** 2 + dh ** 2 + rt * dc * dh)
+
+
+#: Color difference metrics, each with the color space it is computed in.
+_METRICS = {
+    "cie76": ("lab", _euclidean),
+    "ciede2000": ("lab", _delta_e2000),
+    "oklab": ("oklab", _euclidean),
+}
+
+
+# The conversion graph. Every edge converts the raw channels of one space
+# directly into another; conversions between spaces without an edge follow
+# the shortest path through the graph.
+_CONVERSIONS = {
+    ("rgb", "float"): _rgb_to_float,
+    ("float", "rgb"): _float_to_rgb,
+    ("float", "hsv"): _float_to_hsv,
+    ("hsv", "float"): _hsv_to_float,
+    ("hsv", "rgb"): _hsv_to_rgb,
+    ("rgb", "hex"): _rgb_to_hex,
+    ("hex", "rgb"): _hex_to_rgb,
+    ("hex", "float"): _hex_to_float,
+    ("rgb", "linear"): _rgb_to_linear,
+    ("float", "linear"): _float_to_linear,
+    ("linear", "float"): _linear_to_float,
+    ("linear", "xyz"): _linear_to_xyz,
+    ("xyz", "linear"): _xyz_to_linear,
+    ("xyz", "lab"): _xyz_to_lab,
+    ("lab", "xyz"): _lab_to_xyz,
+    ("linear", "oklab"): _linear_to_oklab,
+    ("oklab", "linear"): _oklab_to_linear,
+}
+
+
+# Porter-Duff operators: the fractions of the source and of the backdrop that
+# remain, as a function of their alphas. Works on floats and arrays alike.
+_PORTER_DUFF = {
+    "over": lambda a_s, a_b: (1.0, 1 - a_s),
+    "in": lambda a_s, a_b: (a_b, 0.0),
+    "out": lambda a_s, a_b: (1 - a_b, 0.0),
+    "atop": lambda a_s, a_b: (a_b, 1 - a_s),
+    "xor": lambda a_s, a_b: (1 - a_b, 1 - a_s),
+}
+
+# Blend modes, one channel at a time. ``a`` is the channel of the color the
+# method is called on, ``b`` the one of the other color.
+_BLEND_FORMULAS = {
+    "multiply": lambda a, b: min(1, a * b),
+    "add": lambda a, b: min(1, a + b),
+    "divide": lambda a, b: max(0, min(1, 1 / (a / b))),
+    "subtract": lambda a, b: max(0, (b - a)),
+    "screen": lambda a, b: 1 - (((1 - a) * (1 - b)) / 1.0),
+    "difference": lambda a, b: abs(a - b),
+    "overlay": lambda a, b: (b > 0.5) * (1 - (1 - 2 * (b - 0.5)) * (1 - a)) + (b <= 0.5) * ((2 * b) * a),
+    "color_dodge": lambda a, b: max(0, min(1, b / (1 - a))),
+    "color_burn": lambda a, b: max(0, min(1, 1 - (1 - b) / a)),
+    "linear_burn": lambda a, b: max(0, min(1, a + b - 1)),
+}
+_BLEND_FORMULAS["linear_dodge"] = _BLEND_FORMULAS["add"]
+_BLEND_MODES = frozenset(_BLEND_FORMULAS)
+
+
+def _py_blend(mode: str, a, b) -> list:
+    """ The float channels of blend mode ``mode`` applied to the float channels ``a`` and ``b``. """
+    return list(map(_BLEND_FORMULAS[mode], a, b))
+
+
+# The pure-Python edges, kept for comparing with the compiled ones.
+_PY_CONVERSIONS = dict(_CONVERSIONS)
+if _speedups is None:
+    _blend = _py_blend
+else:
+    _blend = _speedups.blend
+    _CONVERSIONS.update({
+        edge: getattr(_speedups, "%s_to_%s" % edge) for edge in _CONVERSIONS if hasattr(_speedups, "%s_to_%s" % edge)
+    })
+
+
+def _composite(source, a_s: float, backdrop, a_b: float, operator: str, mode=None) -> tuple:
+    """Composite float channels following the W3C Compositing and Blending spec.
+
+    Where both colors are present the source is first mixed with the blend
+    mode, ``Cs' = (1 - ab) * Cs + ab * B(Cb, Cs)``, then the Porter-Duff
+    ``operator`` is applied. Returns the channels, not premultiplied, and alpha.
+    """
+    try:
+        fa, fb = _PORTER_DUFF[operator](a_s, a_b)
+    except KeyError:
+        raise ValueError(f"Unknown operator {operator!r}") from None
+    if mode is not None and mode not in _BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}")
+    if mode is not None and a_s and a_b:
+        # Blend methods are called on the backdrop, see colors.blend.blend
+        mixed = getattr(RGBFloatColor, mode)(RGBFloatColor._from_trusted(*backdrop),
+                                             RGBFloatColor._from_trusted(*source))._color
+        source = [(1 - a_b) * s + a_b * m for s, m in zip(source, mixed)]
+    alpha = a_s * fa + a_b * fb
+    if not alpha:
+        return (0.0, 0.0, 0.0), 0.0
+    return tuple((a_s * fa * s + a_b * fb * b) / alpha for s, b in zip(source, backdrop)), alpha
+
+
+@lru_cache(maxsize=None)
+def _path(src: str, dst: str) -> tuple:
+    """ The edges of the shortest route from ``src`` to ``dst``. """
+    if src == dst:
+        return ()
+    previous = {src: None}
+    queue = deque([src])
+    while queue:
+        node = queue.popleft()
+        for a, b in _CONVERSIONS:
+            if a == node and b not in previous:
+                previous[b] = node
+                if b == dst:
+                    edges = []
+                    while b != src:
+                        edges.append((previous[b], b))
+                        b = previous[b]
+                    return tuple(reversed(edges))
+                queue.append(b)
+    raise ValueError(f"No conversion from {src} to {dst}")
+
+
+def _copy(color):
+    """ Identity conversion, channel lists are returned as tuples. """
+    return color if isinstance(color, int) else tuple(color)
+
+
+@lru_cache(maxsize=None)
+def _route(src: str, dst: str):
+    """ A function converting raw channels from ``src`` to ``dst``. """
+    edges = [_CONVERSIONS[edge] for edge in _path(src, dst)]
+    if not edges:
+        return _copy
+    if len(edges) == 1:
+        return edges[0]
+
+    def convert(color):
+        for edge in edges:
+            color = edge(color)
+        return color
+    return convert
+
 
 class Color:
     """ Abstract base class for all color types. """
+    # The channels are slots, but colors still take weak references and
+    # attributes of their own like any other object. The frozen types refuse
+    # the attributes, see _FrozenColor.
+    __slots__ = ("__dict__", "__weakref__")
     _color: list
+    #: How raw channels are stored in ``_color``.
+    _pack = list
+    #: Name of the color space in the conversion graph.
+    _space: str
+    #: The class used for each color space when converting.
+    _types: dict
+    #: Opacity from 0 to 1, colors without an alpha channel are opaque.
+    alpha = 1.0
+
+    @classmethod
+    def _from_channels(cls: type[T], color) -> T:
+        """ Create a color from raw channels that are already known to be valid. """
+        self = cls.__new__(cls)
+        self._color = cls._pack(color)
+        return self
+
+    @classmethod
+    def _from_trusted(cls: type[T], *channels) -> T:
+        """ Create a color from channels known to be valid, e.g. ``RGBColor._from_trusted(51, 102, 153)``.
+
+        Skips the validation, rounding and logging of the public constructor.
+        """
+        self = cls.__new__(cls)
+        self._color = cls._pack(channels)
+        return self
+
+    def _blended(self: T, color) -> T:
+        """ The result of a blend mode from its float channels, in the type of this color. """
+        return self._from_channels(_route("float", self._space)(color))
+
+    def _channels(self, space: str) -> tuple:
+        """ The raw channels of this color converted to ``space``. """
+        return _route(self._space, space)(self._color)
+
+    def _convert(self, space: str):
+        return self._types[space]._from_channels(self._channels(space))
 
     @property
     def hex(self) -> HexColor:
-        """ Hex is used the same way for all types. """
-        return HexColor("{:02x}{:02x}{:02x}".format(*[int(x) for x in self.rgb]))
+        return self._convert("hex")
 
     @property
     def float(self) -> RGBFloatColor:
-        raise NotImplementedError
+        return self._convert("float")
 
     @property
     def rgb(self) -> RGBColor:
-        raise NotImplementedError
+        return self._convert("rgb")
 
     @property
     def hsv(self) -> HSVColor:
-        raise NotImplementedError
+        return self._convert("hsv")
+
+    @property
+    def linear(self) -> LinearRGBColor:
+        return self._convert("linear")
+
+    @property
+    def xyz(self) -> XYZColor:
+        return self._convert("xyz")
+
+    @property
+    def lab(self) -> LabColor:
+        return self._convert("lab")
+
+    @property
+    def oklab(self) -> OKLabColor:
+        return self._convert("oklab")
+
+    @property
+    def rgba(self) -> RGBAColor:
+        return RGBAColor._from_channels(self._channels("rgb"), self.alpha)
+
+    @property
+    def hsva(self) -> HSVAColor:
+        return HSVAColor._from_channels(self._channels("hsv"), self.alpha)
 
     def multiply(self: T, other: AnyColor) -> T:
         """Blend mode operation."""
-        color = [min(1, a * b) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("multiply", self._channels("float"), other._channels("float")))
 
     def __mul__(self: T, other: AnyColor) -> RGBFloatColor:
         """Basic multiplication operation.
 
         Always returns a non-clamped RGBFloatColor.
         """
-        color = [a * b for a, b in zip(self.float, other.float)]
-        return RGBFloatColor(*color)
+        if not isinstance(other, Color):
+            return NotImplemented
+        color = [a * b for a, b in zip(self._channels("float"), other._channels("float"))]
+        return RGBFloatColor._from_trusted(*color)
 
     def add(self: T, other: AnyColor) -> T:
         """Blend mode operation."""
-        color = [min(1, a + b) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("add", self._channels("float"), other._channels("float")))
 
     def __add__(self: T, other: AnyColor) -> RGBFloatColor:
         """Basic add operation.
 
         Always returns a non-clamped RGBFloatColor.
         """
-        color = [a + b for a, b in zip(self.float, other.float)]
-        return RGBFloatColor(*color)
+        if not isinstance(other, Color):
+            return NotImplemented
+        color = [a + b for a, b in zip(self._channels("float"), other._channels("float"))]
+        return RGBFloatColor._from_trusted(*color)
 
     def divide(self: T, other: AnyColor) -> T:
         """Blend mode operation."""
-        color = [max(0, min(1, 1 / (a / b))) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("divide", self._channels("float"), other._channels("float")))
 
     def __truediv__(self: T, other: AnyColor) -> RGBFloatColor:
         """Basic division operation.
 
         Always returns a non-clamped RGBFloatColor.
         """
-        color = [a / b for a, b in zip(self.float, other.float)]
-        return RGBFloatColor(*color)
+        if not isinstance(other, Color):
+            return NotImplemented
+        color = [a / b for a, b in zip(self._channels("float"), other._channels("float"))]
+        return RGBFloatColor._from_trusted(*color)
 
     def subtract(self: T, other: AnyColor) -> T:
         """Blend mode operation."""
-        color = [max(0, (b - a)) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("subtract", self._channels("float"), other._channels("float")))
 
     def __sub__(self: T, other: AnyColor) -> RGBFloatColor:
         """Basic subtraction operation.
 
         Always returns a non-clamped RGBFloatColor.
         """
-        color = [a - b for a, b in zip(self.float, other.float)]
-        return RGBFloatColor(*color)
+        if not isinstance(other, Color):
+            return NotImplemented
+        color = [a - b for a, b in zip(self._channels("float"), other._channels("float"))]
+        return RGBFloatColor._from_trusted(*color)
 
     def screen(self: T, other: AnyColor) -> T:
         """Wherever either colors are darker than white, the composite is brighter."""
-        color = [1 - (((1 - a) * (1- b)) / 1.0) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("screen", self._channels("float"), other._channels("float")))
 
     def difference(self: T, other: AnyColor) -> T:
-        color = [abs(a - b) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("difference", self._channels("float"), other._channels("float")))
 
     def overlay(self: T, other: AnyColor) -> T:
         """Blend mode. A combination of multiply and screen.
@@ -112,8 +602,7 @@ class Color:
          the top becomes darker; where the base layer is mid grey, the top is unaffected.
          An overlay with the same picture looks like an S-curve.
         """
-        color = [(b> 0.5) * (1 - (1-2 * (b-0.5)) * (1 - a)) + (b <= 0.5) * ((2 * b) * a) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("overlay", self._channels("float"), other._channels("float")))
 
     def invert(self: T) -> T:
         """Invert the current color."""
@@ -122,8 +611,7 @@ class Color:
     def color_dodge(self: T, other: AnyColor) -> T:
         """Blend mode. Brighter than the Screen blend mode. Results in an intense,
         contrasty color-typically results in saturated mid-tones and blown highlights."""
-        color = [max(0, min(1, b / (1 - a))) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("color_dodge", self._channels("float"), other._channels("float")))
 
     def linear_dodge(self: T, other: AnyColor) -> T:
         """Blend mode. Brighter than the Color Dodge blend mode, but less saturated and intense."""
@@ -131,18 +619,28 @@ class Color:
 
     def color_burn(self: T, other: AnyColor) -> T:
         """Blend mode. Darker than Multiply, with more highly saturated mid-tones and reduced highlights."""
-        color = [max(0, min(1, 1 - (1 - b) / a)) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("color_burn", self._channels("float"), other._channels("float")))
 
     def linear_burn(self: T, other: AnyColor) -> T:
         """Blend mode. Darker than Multiply, but less saturated than Color Burn. """
-        color = [max(0, min(1, a + b - 1)) for a, b in zip(self.float, other.float)]
-        return self.__class__(RGBFloatColor(*color))
+        return self._blended(_blend("linear_burn", self._channels("float"), other._channels("float")))
+
+    def distance(self, other: AnyColor, metric: str = "cie76") -> float:
+        """Perceptual difference between two colors.
+
+        ``metric`` is ``"cie76"`` (euclidean distance in CIELAB), ``"ciede2000"``
+        or ``"oklab"`` (euclidean distance in OKLab).
+        """
+        try:
+            space, func = _METRICS[metric]
+        except KeyError:
+            raise ValueError(f"Unknown metric {metric!r}") from None
+        return func(self._channels(space), other._channels(space))
 
     def __eq__(self, other: AnyColor) -> bool:
-        self_rgb = self.rgb
-        other_rgb = other.rgb
-        return self_rgb.red == other_rgb.red and self_rgb.green == other_rgb.green and self_rgb.blue == other_rgb.blue
+        if isinstance(other, Color):
+            return self._channels("rgb") == other._channels("rgb") and self.alpha == other.alpha
+        return NotImplemented
 
     def __contains__(self, item: AnyColor) -> bool:
         return item in self._color
@@ -152,6 +650,14 @@ class Color:
             return not self.__eq__(other)
         return NotImplemented
 
+    def __reduce__(self):
+        # Rebuilt from the raw channels without calling the constructor. Only the
+        # class and the channels are stored, which keeps large lists of colors small.
+        return copyreg.__newobj__, (self.__class__,), self._color
+
+    def __setstate__(self, state):
+        self._color = state
+
     def __iter__(self):
         """ Treat the color object as an iterable to iterate over color values"""
         return iter(self._color)
@@ -165,6 +671,8 @@ class Color:
 
 class HSVColor(Color):
     """ Hue Saturation Value """
+    __slots__ = ("_color",)
+    _space = "hsv"
 
     @overload
     def __init__(self, color: RGBColor): ...
@@ -186,7 +694,7 @@ class HSVColor(Color):
 
     def __init__(self, h=0.0, s=0.0, v=0.0):
         if isinstance(h, Color):
-            self._color = h.rgb._color
+            self._color = list(h._channels("hsv"))
         else:
             if s > 1:
                 raise ValueError("Saturation has to be less than 1")
@@ -226,21 +734,15 @@ class HSVColor(Color):
     def value(self, value: float):
         self._color[2] = value
 
-    @property
-    def rgb(self) -> RGBColor:
-        return RGBColor(*map(lambda c: c * 255, colorsys.hsv_to_rgb(*self._color)))
-
     @property
     def hsv(self):
         return self
 
-    @property
-    def float(self) -> RGBFloatColor:
-        return RGBFloatColor(*map(lambda c: c, colorsys.hsv_to_rgb(*self._color)))
-
 
 class RGBColor(Color):
     """ Red Green Blue colors represented in a 0 - 255 range"""
+    __slots__ = ("_color",)
+    _space = "rgb"
 
     @overload
     def __init__(self, color: RGBColor): ...
@@ -262,12 +764,15 @@ class RGBColor(Color):
 
     def __init__(self, r = 0, g = 0, b = 0):
         if isinstance(r, Color):
-            self._color = r.rgb._color
+            self._color = list(r._channels("rgb"))
         else:
-            self._color = [round(r), round(g), round(b)]
-
+            self._color = color = [round(r), round(g), round(b)]
+            # Only walk the channels for the warning and error when something is off
+            if color == [r, g, b] and 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255:
+                return
+            strict = _strict.get()
             for i, c in enumerate([r, g, b]):
-                if not isinstance(c, Integral) and not c.is_integer():
+                if strict and not isinstance(c, Integral) and not c.is_integer():
                     logger.warning("%s = %s value is not an integer, it will be rounded to %s.", "rgb"[i], c, round(c))
                 if not 0 <= c <= 255:
                     raise ValueError("Color values must be between 0 and 255 (is %s)", c)
@@ -279,14 +784,6 @@ class RGBColor(Color):
     def rgb(self) -> RGBColor:
         return self
 
-    @property
-    def hsv(self) -> HSVColor:
-        return self.float.hsv
-
-    @property
-    def float(self) -> RGBFloatColor:
-        return RGBFloatColor(*map(lambda c: c / 255, self._color))
-
     @property
     def red(self) -> int:
         return self._color[0]
@@ -314,6 +811,9 @@ class RGBColor(Color):
 
 class RGBFloatColor(Color):
     """ Red Green Blue colors represented in a 0-1 range """
+    __slots__ = ("_color",)
+    _space = "float"
+
     @overload
     def __init__(self, color: RGBColor): ...
 
@@ -334,26 +834,13 @@ class RGBFloatColor(Color):
 
     def __init__(self, r = 0.0, g = 0.0, b = 0.0):
         if isinstance(r, Color):
-            self._color = r.float._color
+            self._color = list(r._channels("float"))
         else:
             self._color =  [r, g, b]
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(r={self.red}, g={self.green}, b={self.blue})"
 
-    @property
-    def hsv(self) -> HSVColor:
-        color = colorsys.rgb_to_hsv(*map(lambda c_: c_, self._color))
-        for c in color:
-            if not 0 <= c <= 1:
-                logger.info("Color value not in 0-1 range, clamping will occur.")
-
-        return HSVColor(*[min(1.0, max(0.0, c)) for c in color])
-
-    @property
-    def rgb(self) -> RGBColor:
-        return self.hsv.rgb
-
     @property
     def float(self) -> RGBFloatColor:
         return self
@@ -387,7 +874,14 @@ class HexColor(RGBColor):
     """ Typical 6 digit hexadecimal colors.
 
     Warning: accuracy is lost when converting a color to hex
+
+    The color is stored as a packed 24-bit integer, the channels are exposed as
+    2 digit hex strings.
     """
+    __slots__ = ()
+    _space = "hex"
+    _pack = int
+
     @overload
     def __init__(self, color: RGBColor): ...
 
@@ -408,7 +902,7 @@ class HexColor(RGBColor):
 
     def __init__(self, hex_string="000000"):
         if isinstance(hex_string, Color):
-            self._color = hex_string.hex._color
+            self._color = hex_string._channels("hex")
         else:
             if not isinstance(hex_string, str):
                 raise ValueError("Hex must be string")
@@ -416,49 +910,674 @@ class HexColor(RGBColor):
             if len(hex_string) != 6:
                 raise ValueError("Hex color must be 6 digits")
 
-            _hex = hex_string.lower()
-            if not set(_hex).issubset(HEX_RANGE):
+            if hex_string.translate(_HEX_DIGITS):
                 raise ValueError("Not a valid hex number")
 
-            self._color = [_hex[:2], _hex[2:4], _hex[4:6]]
+            self._color = int(hex_string, 16)
 
     def __repr__(self) -> str:
-        return f'{self.__class__.__name__}("{"".join(self._color)}")'
+        return f'{self.__class__.__name__}("{self}")'
+
+    @classmethod
+    def _from_trusted(cls: type[T], value: int) -> T:
+        """ Create a color from a packed 24-bit value, e.g. ``HexColor._from_trusted(0x336699)``. """
+        self = cls.__new__(cls)
+        self._color = value
+        return self
 
     @property
     def rgb(self) -> RGBColor:
-        return RGBColor(*[int(c, 16) for c in self._color])
+        return self._convert("rgb")
 
     @property
-    def hsv(self) -> HSVColor:
-        return self.rgb.hsv
+    def hex(self) -> HexColor:
+        return self
 
     @property
-    def hex(self) -> HexColor:
+    def red(self) -> str:
+        return "%02x" % (self._color >> 16)
+
+    @red.setter
+    def red(self, value: str):
+        self._color = self._color & 0x00ffff | _parse_channel(value) << 16
+
+    @property
+    def green(self) -> str:
+        return "%02x" % (self._color >> 8 & 0xff)
+
+    @green.setter
+    def green(self, value: str):
+        self._color = self._color & 0xff00ff | _parse_channel(value) << 8
+
+    @property
+    def blue(self) -> str:
+        return "%02x" % (self._color & 0xff)
+
+    @blue.setter
+    def blue(self, value: str):
+        self._color = self._color & 0xffff00 | _parse_channel(value)
+
+    def __iter__(self):
+        return iter((self.red, self.green, self.blue))
+
+    def __contains__(self, item: str) -> bool:
+        return item in tuple(self)
+
+    def __len__(self) -> int:
+        return 3
+
+    def __str__(self) -> str:
+        return "%06x" % self._color
+
+
+class LinearRGBColor(Color):
+    """ Red Green Blue without the sRGB gamma curve, in a 0-1 range. """
+    __slots__ = ("_color",)
+    _space = "linear"
+
+    @overload
+    def __init__(self, color: Color): ...
+
+    @overload
+    def __init__(self, r: float, g: float, b: float): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, r=0.0, g=0.0, b=0.0):
+        if isinstance(r, Color):
+            self._color = list(r._channels("linear"))
+        else:
+            self._color = [r, g, b]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(r={self.red}, g={self.green}, b={self.blue})"
+
+    @property
+    def linear(self) -> LinearRGBColor:
         return self
 
     @property
-    def float(self) -> RGBFloatColor:
-        return RGBFloatColor(*[int(c, 16)/255.0 for c in self._color])
+    def red(self) -> float:
+        return self._color[0]
+
+    @red.setter
+    def red(self, value: float):
+        self._color[0] = value
+
+    @property
+    def green(self) -> float:
+        return self._color[1]
+
+    @green.setter
+    def green(self, value: float):
+        self._color[1] = value
+
+    @property
+    def blue(self) -> float:
+        return self._color[2]
+
+    @blue.setter
+    def blue(self, value: float):
+        self._color[2] = value
+
+
+class XYZColor(Color):
+    """ CIE 1931 XYZ with a D65 white point, Y of white is 1. """
+    __slots__ = ("_color",)
+    _space = "xyz"
+
+    @overload
+    def __init__(self, color: Color): ...
+
+    @overload
+    def __init__(self, x: float, y: float, z: float): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, Color):
+            self._color = list(x._channels("xyz"))
+        else:
+            self._color = [x, y, z]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(x={self.x}, y={self.y}, z={self.z})"
+
+    @property
+    def xyz(self) -> XYZColor:
+        return self
+
+    @property
+    def x(self) -> float:
+        return self._color[0]
+
+    @x.setter
+    def x(self, value: float):
+        self._color[0] = value
+
+    @property
+    def y(self) -> float:
+        return self._color[1]
+
+    @y.setter
+    def y(self, value: float):
+        self._color[1] = value
+
+    @property
+    def z(self) -> float:
+        return self._color[2]
+
+    @z.setter
+    def z(self, value: float):
+        self._color[2] = value
+
+
+class _LabChannels(Color):
+    """ Shared channel accessors of the Lab color spaces. """
+    __slots__ = ("_color",)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(l={self.lightness}, a={self.a}, b={self.b})"
+
+    @property
+    def lightness(self) -> float:
+        return self._color[0]
+
+    @lightness.setter
+    def lightness(self, value: float):
+        self._color[0] = value
+
+    @property
+    def a(self) -> float:
+        return self._color[1]
+
+    @a.setter
+    def a(self, value: float):
+        self._color[1] = value
+
+    @property
+    def b(self) -> float:
+        return self._color[2]
+
+    @b.setter
+    def b(self, value: float):
+        self._color[2] = value
+
+
+class LabColor(_LabChannels):
+    """ CIELAB with a D65 white point. Lightness is in a 0-100 range. """
+    __slots__ = ()
+    _space = "lab"
+
+    @overload
+    def __init__(self, color: Color): ...
+
+    @overload
+    def __init__(self, l: float, a: float, b: float): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, l=0.0, a=0.0, b=0.0):
+        if isinstance(l, Color):
+            self._color = list(l._channels("lab"))
+        else:
+            self._color = [l, a, b]
+
+    @property
+    def lab(self) -> LabColor:
+        return self
+
+
+class OKLabColor(_LabChannels):
+    """ Björn Ottosson's OKLab. Lightness is in a 0-1 range. """
+    __slots__ = ()
+    _space = "oklab"
+
+    @overload
+    def __init__(self, color: Color): ...
+
+    @overload
+    def __init__(self, l: float, a: float, b: float): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, l=0.0, a=0.0, b=0.0):
+        if isinstance(l, Color):
+            self._color = list(l._channels("oklab"))
+        else:
+            self._color = [l, a, b]
+
+    @property
+    def oklab(self) -> OKLabColor:
+        return self
+
+
+class _AlphaColor(Color):
+    """ Mixin adding an alpha channel, from 0 (transparent) to 1 (opaque), to a color type.
+
+    The blend modes composite ``other`` over this color with the W3C formula,
+    opaque colors give the same result as the types without alpha. The
+    Porter-Duff operators composite this color, the source, with ``other``, the
+    backdrop, optionally mixing them with a blend mode where both are present.
+    """
+    __slots__ = ()
+    _alpha: float
+
+    @classmethod
+    def _from_channels(cls: type[T], color, alpha: float = 1.0) -> T:
+        self = cls.__new__(cls)
+        self._color = cls._pack(color)
+        self._alpha = alpha
+        return self
+
+    @classmethod
+    def _from_trusted(cls: type[T], *channels) -> T:
+        """ Create a color from channels and alpha known to be valid, e.g. ``RGBAColor._from_trusted(51, 102, 153, 0.5)``. """
+        return cls._from_channels(channels[:3], channels[3])
+
+    def _init_alpha(self, color, alpha):
+        if alpha is None:
+            alpha = color.alpha if isinstance(color, Color) else 1.0
+        elif not 0 <= alpha <= 1:
+            raise ValueError(f"Alpha must be between 0 and 1 (is {alpha})")
+        self._alpha = alpha
+
+    @property
+    def alpha(self) -> float:
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, value: float):
+        self._alpha = value
+
+    def _composited(self: T, source: AnyColor, backdrop: AnyColor, operator: str, mode) -> T:
+        color, alpha = _composite(source._channels("float"), source.alpha,
+                                  backdrop._channels("float"), backdrop.alpha, operator, mode)
+        return self._from_channels(_route("float", self._space)(color), alpha)
+
+    def over(self: T, other: AnyColor, mode: str = None) -> T:
+        """Porter-Duff source over: this color on top of ``other``.
+
+        ``mode`` is the name of a blend method mixing the two where they overlap.
+        """
+        return self._composited(self, other, "over", mode)
+
+    def in_(self: T, other: AnyColor, mode: str = None) -> T:
+        """ Porter-Duff source in: this color where ``other`` is present. """
+        return self._composited(self, other, "in", mode)
+
+    def out(self: T, other: AnyColor, mode: str = None) -> T:
+        """ Porter-Duff source out: this color where ``other`` is absent. """
+        return self._composited(self, other, "out", mode)
+
+    def atop(self: T, other: AnyColor, mode: str = None) -> T:
+        """ Porter-Duff source atop: this color over ``other``, only where ``other`` is present. """
+        return self._composited(self, other, "atop", mode)
+
+    def xor(self: T, other: AnyColor, mode: str = None) -> T:
+        """ Porter-Duff xor: each color only where the other one is absent. """
+        return self._composited(self, other, "xor", mode)
+
+    def multiply(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "multiply")
+
+    def add(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "add")
+
+    def divide(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "divide")
+
+    def subtract(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "subtract")
+
+    def screen(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "screen")
+
+    def difference(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "difference")
+
+    def overlay(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "overlay")
+
+    def invert(self: T) -> T:
+        """Invert the current color, keeping its alpha."""
+        color = [abs(a - 1) for a in self._channels("float")]
+        return self._from_channels(_route("float", self._space)(color), self._alpha)
+
+    def color_dodge(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "color_dodge")
+
+    def linear_dodge(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "add")
+
+    def color_burn(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "color_burn")
+
+    def linear_burn(self: T, other: AnyColor) -> T:
+        return self._composited(other, self, "over", "linear_burn")
+
+    def __reduce__(self):
+        return copyreg.__newobj__, (self.__class__,), (self._color, self._alpha)
+
+    def __setstate__(self, state):
+        self._color, self._alpha = state
+
+    def __iter__(self):
+        yield from self._color
+        yield self._alpha
+
+    def __len__(self) -> int:
+        return 4
 
     def __str__(self) -> str:
-        return "{}{}{}".format(*self._color)
+        return ", ".join(map(str, self))
+
+
+class RGBAColor(_AlphaColor, RGBColor):
+    """ :class:`RGBColor` with an alpha channel in a 0-1 range. """
+    __slots__ = ("_alpha",)
+
+    @overload
+    def __init__(self, color: Color, a: float = None): ...
+
+    @overload
+    def __init__(self, r: int, g: int, b: int, a: float = 1.0): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, r=0, g=0, b=0, a=None):
+        RGBColor.__init__(self, r, g, b)
+        self._init_alpha(r, a)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(r={self.red}, g={self.green}, b={self.blue}, a={self.alpha})"
+
+    @property
+    def rgb(self) -> RGBColor:
+        return self._convert("rgb")
+
+    @property
+    def rgba(self) -> RGBAColor:
+        return self
+
+
+class HSVAColor(_AlphaColor, HSVColor):
+    """ :class:`HSVColor` with an alpha channel in a 0-1 range. """
+    __slots__ = ("_alpha",)
+
+    @overload
+    def __init__(self, color: Color, a: float = None): ...
+
+    @overload
+    def __init__(self, h: float, s: float, v: float, a: float = 1.0): ...
+
+    @overload
+    def __init__(self): ...
+
+    def __init__(self, h=0.0, s=0.0, v=0.0, a=None):
+        HSVColor.__init__(self, h, s, v)
+        self._init_alpha(h, a)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(h={self.hue}, s={self.saturation}, v={self.value}, a={self.alpha})"
+
+    @property
+    def hsv(self) -> HSVColor:
+        return self._convert("hsv")
+
+    @property
+    def hsva(self) -> HSVAColor:
+        return self
+
+
+def _parse_channel(value: str) -> int:
+    if not isinstance(value, str) or len(value) != 2 or value.translate(_HEX_DIGITS):
+        raise ValueError("Hex channel must be 2 hex digits")
+    return int(value, 16)
+
+
+class _FrozenColor(Color):
+    """ Immutable and hashable variant of a color type.
+
+    Channels are stored in a tuple, and the hash is the hash of the 8-bit rgb
+    channels so it agrees with ``__eq__`` across all color types. Conversions
+    are computed on first access and cached on the instance.
+    """
+    __slots__ = ()
+    _pack = tuple
+    _cache: dict
+
+    def _convert(self, space: str):
+        try:
+            cache = self._cache
+        except AttributeError:
+            cache = {}
+            object.__setattr__(self, "_cache", cache)
+        try:
+            return cache[space]
+        except KeyError:
+            pass
+        if space == "rgb" and _intern_rgb is not None:
+            color = _intern_rgb(*self._channels("rgb"))
+        else:
+            color = super()._convert(space)
+        cache[space] = color
+        return color
+
+    @classmethod
+    def _from_channels(cls: type[T], color) -> T:
+        self = cls.__new__(cls)
+        object.__setattr__(self, "_color", cls._pack(color))
+        return self
+
+    def __setattr__(self, name: str, value):
+        # Only the constructors assign to _color
+        if name != "_color":
+            raise AttributeError(f"{self.__class__.__name__} is immutable")
+        object.__setattr__(self, name, self._pack(value))
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __hash__(self) -> int:
+        return hash(self._channels("rgb"))
+
+
+class FrozenHSVColor(_FrozenColor, HSVColor):
+    """ Immutable, hashable :class:`HSVColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenRGBColor(_FrozenColor, RGBColor):
+    """ Immutable, hashable :class:`RGBColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenRGBFloatColor(_FrozenColor, RGBFloatColor):
+    """ Immutable, hashable :class:`RGBFloatColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenHexColor(_FrozenColor, HexColor):
+    """ Immutable, hashable :class:`HexColor`. """
+    __slots__ = ("_cache",)
+    _pack = int
+
+
+class FrozenLinearRGBColor(_FrozenColor, LinearRGBColor):
+    """ Immutable, hashable :class:`LinearRGBColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenXYZColor(_FrozenColor, XYZColor):
+    """ Immutable, hashable :class:`XYZColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenLabColor(_FrozenColor, LabColor):
+    """ Immutable, hashable :class:`LabColor`. """
+    __slots__ = ("_cache",)
+
+
+class FrozenOKLabColor(_FrozenColor, OKLabColor):
+    """ Immutable, hashable :class:`OKLabColor`. """
+    __slots__ = ("_cache",)
+
+
+Color._types = {
+    "rgb": RGBColor, "float": RGBFloatColor, "hsv": HSVColor, "hex": HexColor,
+    "linear": LinearRGBColor, "xyz": XYZColor, "lab": LabColor, "oklab": OKLabColor,
+}
+_FrozenColor._types = {
+    "rgb": FrozenRGBColor, "float": FrozenRGBFloatColor, "hsv": FrozenHSVColor, "hex": FrozenHexColor,
+    "linear": FrozenLinearRGBColor, "xyz": FrozenXYZColor, "lab": FrozenLabColor, "oklab": FrozenOKLabColor,
+}
+
+
+def _palette_module(namespace: dict, table: dict) -> tuple:
+    """Module level ``__getattr__`` and ``__dir__`` for a palette module.
+
+    ``table`` maps every color name to its packed 24-bit rgb value. The
+    RGBColor constant is created on first access and stored in ``namespace``,
+    so later lookups no longer go through ``__getattr__``.
+    """
+    def __getattr__(name: str) -> RGBColor:
+        try:
+            value = table[name]
+        except KeyError:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}") from None
+        color = namespace[name] = RGBColor._from_trusted(value >> 16, value >> 8 & 0xff, value & 0xff)
+        return color
+
+    def __dir__() -> list:
+        return sorted(set(namespace) | set(table))
+    return __getattr__, __dir__
 
 
 class ColorWheel:
-    """Iterate random colors distributed relatively evenly around the color wheel."""
-    def __init__(self, start: float = 0):
+    """Iterate colors distributed relatively evenly around the color wheel.
+
+    ``mode`` picks how the hue moves from one color to the next:
+
+    ``"random"``
+        A random step of 0.1 to 0.2 turns, so no hue is repeated right away.
+    ``"golden"``
+        A step of the golden ratio conjugate, which keeps the hues of any
+        number of colors close to evenly spread.
+    ``"halton"``
+        The base 2 Halton (van der Corput) sequence, which fills every gap
+        between the hues so far by halving it.
+
+    ``seed`` is an int, a :class:`random.Random` or a NumPy ``Generator``
+    giving a reproducible stream. Without it the random mode uses the
+    :mod:`random` module, and the other modes are deterministic. With it they
+    start from a random rotation, so wheels with different seeds give
+    different colors. Every color has the given ``saturation`` and ``value``.
+    """
+    MODES = frozenset(("random", "golden", "halton"))
+
+    def __init__(self, start: float = 0, *, seed=None, mode: str = "random", saturation: float = 1.0,
+                 value: float = 0.8):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode {mode!r}")
+        if not 0 <= saturation <= 1 or not 0 <= value <= 1:
+            raise ValueError("Saturation and value must be between 0 and 1")
+        if seed is None:
+            self._random = random_
+        elif hasattr(seed, "random"):
+            self._random = seed
+        else:
+            self._random = random_.Random(seed)
+        if mode != "random" and seed is not None:
+            start += float(self._random.random())
         # A 1.1 shift is identical to 0.1
         if start >= 1:
-            start -= 1
-        self._phase = start
+            start -= int(start)
+        # The phase is a 64-bit fraction of a turn, so every step wraps it exactly, however long the wheel runs
+        self._phase = int(start * _TURN)
+        self._mode = mode
+        self._index = 0
+        self.saturation = saturation
+        self.value = value
 
     def __iter__(self) -> ColorWheel:
         return self
 
+    def _hue(self) -> float:
+        if self._mode == "halton":
+            self._index += 1
+            return (self._phase / _TURN + _van_der_corput(self._index)) % 1.0
+        if self._mode == "random":
+            step = int(((float(self._random.random()) * 0.1) + 0.1) * _TURN)
+        else:
+            step = _GOLDEN
+        self._phase = (self._phase + step) % _TURN
+        # Rounding to a float can give a whole turn
+        return self._phase / _TURN % 1.0
+
     def __next__(self) -> HSVColor:
-        shift = (random_.random() * 0.1) + 0.1
-        self._phase += shift
-        if self._phase >= 1:
-            self._phase -= 1
-        return HSVColor(self._phase, 1, 0.8)
+        return HSVColor._from_trusted(self._hue(), self.saturation, self.value)
+
+    def take(self, n: int, space: str = "hsv"):
+        """The next ``n`` colors as a :class:`~colors.array.ColorArray` in ``space``.
+
+        The colors are the same as ``n`` calls to ``next()`` would give, without
+        creating a color object for each.
+        """
+        from .array import ColorArray, np
+        if n < 0:
+            raise ValueError("n must not be negative")
+        if np is None:
+            hue, s, v = self._hue, self.saturation, self.value
+            return ColorArray([(hue(), s, v) for _ in range(n)], "hsv").to(space)
+        if self._mode == "halton":
+            index = np.arange(self._index + 1, self._index + n + 1)
+            offsets = np.zeros(n)
+            scale = 0.5
+            while index.any():
+                offsets += (index & 1) * scale
+                index >>= 1
+                scale /= 2
+            self._index += n
+            hues = (self._phase / _TURN + offsets) % 1.0
+        else:
+            if self._mode == "golden":
+                steps = np.full(n, _GOLDEN, dtype=np.uint64)
+            elif isinstance(self._random, np.random.Generator):
+                steps = ((self._random.random(n) * 0.1 + 0.1) * float(_TURN)).astype(np.uint64)
+            else:
+                rand = self._random.random
+                shifts = np.array([rand() for _ in range(n)], dtype=np.float64)
+                steps = ((shifts * 0.1 + 0.1) * float(_TURN)).astype(np.uint64)
+            # Unsigned 64-bit sums wrap around a turn the same way __next__ does
+            phases = np.cumsum(steps, dtype=np.uint64) + np.uint64(self._phase)
+            if n:
+                self._phase = int(phases[-1])
+            hues = (phases.astype(np.float64) / float(_TURN)) % 1.0
+        data = np.empty((n, 3), dtype=np.float64)
+        data[:, 0] = hues
+        data[:, 1] = self.saturation
+        data[:, 2] = self.value
+        return ColorArray.from_buffer(data, "hsv").to(space)
+
+
+# A whole turn of the color wheel in the 64-bit fixed point phase
+_TURN = 1 << 64
+# The golden ratio conjugate, (sqrt(5) - 1) / 2, of a turn
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _van_der_corput(index: int) -> float:
+    """ The base 2 radical inverse of ``index``: its binary digits mirrored around the point. """
+    result, scale = 0.0, 0.5
+    while index:
+        if index & 1:
+            result += scale
+        index >>= 1
+        scale /= 2
+    return result
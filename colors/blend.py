@@ -0,0 +1,240 @@
+"""
+colors.blend
+============
+Blend modes applied to whole :class:`~colors.array.ColorArray` layers.
+
+The formulas are the ones used by the blend methods on :class:`colors.base.Color`
+and the results are identical to calling those methods color by color.
+"""
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+from operator import getitem
+
+from .array import ColorArray, np, _is_numpy
+from . import base as base_
+from .base import Color, _BLEND_FORMULAS, _clamp
+
+__all__ = ("blend", "blend_buffer", "BLEND_MODES", "LAYOUTS")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Optional, Union
+
+
+# One channel at a time, the formulas of the Color methods.
+_PY_MODES = _BLEND_FORMULAS
+
+
+def _nonzero(divisor):
+    """ Raise like the scalar methods do when any channel would divide by zero. """
+    if not divisor.all():
+        raise ZeroDivisionError("float division by zero")
+    return divisor
+
+
+def _np_divide(a, b):
+    return np.maximum(0, np.minimum(1, 1 / _nonzero(a / _nonzero(b))))
+
+
+_NP_MODES = {
+    "multiply": lambda a, b: np.minimum(1, a * b),
+    "add": lambda a, b: np.minimum(1, a + b),
+    "divide": _np_divide,
+    "subtract": lambda a, b: np.maximum(0, (b - a)),
+    "screen": lambda a, b: 1 - (((1 - a) * (1 - b)) / 1.0),
+    "difference": lambda a, b: np.abs(a - b),
+    "overlay": lambda a, b: (b > 0.5) * (1 - (1 - 2 * (b - 0.5)) * (1 - a)) + (b <= 0.5) * ((2 * b) * a),
+    "color_dodge": lambda a, b: np.maximum(0, np.minimum(1, b / _nonzero(1 - a))),
+    "color_burn": lambda a, b: np.maximum(0, np.minimum(1, 1 - (1 - b) / _nonzero(a))),
+    "linear_burn": lambda a, b: np.maximum(0, np.minimum(1, a + b - 1)),
+}
+_NP_MODES["linear_dodge"] = _NP_MODES["add"]
+
+#: Names of the supported blend modes, matching the Color method names.
+BLEND_MODES = frozenset(_PY_MODES)
+
+
+def _blend_chunk(base: ColorArray, top: Union[ColorArray, Color], mode: str) -> ColorArray:
+    return blend(mode, base, top)
+
+
+def blend(mode: str, base: ColorArray, top: Union[ColorArray, Color], out: Optional[ColorArray] = None, *,
+          executor: Optional[Executor] = None, workers: Optional[int] = None) -> ColorArray:
+    """Blend ``top`` onto every color of ``base``.
+
+    ``top`` is either an array of the same length or a single color applied to
+    every element. The result has the color space of ``base``, the same way the
+    Color methods return the caller's type. When ``out`` is given the result is
+    written into its buffer, which may be ``base`` itself. ``workers`` or
+    ``executor`` split large arrays across several processes, see
+    :mod:`colors.parallel`.
+    """
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}")
+    if not isinstance(top, Color) and len(top) != len(base):
+        raise ValueError("Blended arrays must have the same length")
+    if executor is not None or workers is not None:
+        from . import parallel
+        executor = parallel._resolve(len(base), executor, workers)
+    if executor is not None:
+        if isinstance(top, Color):
+            inputs, args = [base], (top, mode)
+        else:
+            inputs, args = [base, top], (mode,)
+        if out is not None and len(out) != len(base):
+            raise ValueError("Output array has a different length")
+        return parallel.map_chunks(_blend_chunk, inputs, base.space, executor, args, out, workers)
+
+    a = base.float.data
+    if isinstance(top, Color):
+        b = array("d", top.float._color)
+        if _is_numpy(a):
+            b = np.array([b], dtype=np.float64)
+        else:
+            b *= len(base)
+    else:
+        b = top.float.data
+
+    if _is_numpy(a):
+        result = _NP_MODES[mode](a, b)
+    elif base_._speedups is not None:
+        result = array("d", bytes(8 * len(a)))
+        base_._speedups.blend_many(mode, a, b, result)
+    else:
+        func = _PY_MODES[mode]
+        result = array("d", [func(x, y) for x, y in zip(a, b)])
+    return ColorArray.from_buffer(result, "float").to(base.space, out=out)
+
+
+#: Packed 8-bit pixel layouts understood by :func:`blend_buffer`, with their channel counts.
+LAYOUTS = {"rgb": 3, "rgba": 4}
+
+#: Default number of pixels processed per tile by :func:`blend_buffer`.
+TILE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def _byte_table(mode: str) -> array:
+    """The result of ``mode`` for every pair of 8-bit channels, indexed by ``base << 8 | top``.
+
+    Values are rounded the way RGBColor does, so looking them up is identical to
+    calling the Color method. Pairs that divide by zero hold -1.
+    """
+    func = _PY_MODES[mode]
+    table = array("h", bytes(2 << 16))
+    for a in range(256):
+        for b in range(256):
+            try:
+                table[a << 8 | b] = round(_clamp(func(a / 255, b / 255)) * 255)
+            except ZeroDivisionError:
+                table[a << 8 | b] = -1
+    return table
+
+
+@lru_cache(maxsize=None)
+def _byte_rows(mode: str) -> tuple:
+    table = _byte_table(mode)
+    return tuple(tuple(table[a << 8:(a + 1) << 8]) for a in range(256))
+
+
+def _bytes_view(buffer, name: str, size: Optional[int] = None) -> memoryview:
+    view = memoryview(buffer).cast("B")
+    if size is not None and len(view) != size:
+        raise ValueError(f"{name} must be {size} bytes long, got {len(view)}")
+    return view
+
+
+def _np_tile(table, a, b, channels):
+    """ Blend one tile of uint8 pixels with NumPy, returning the blended bytes. """
+    if channels == 3:
+        result = table[a.astype(np.intp) << 8 | b]
+        if (result < 0).any():
+            raise ZeroDivisionError("float division by zero")
+        return result
+    a, b = a.reshape(-1, 4), b.reshape(-1, 4)
+    result = table[a[:, :3].astype(np.intp) << 8 | b[:, :3]]
+    if (result < 0).any():
+        raise ZeroDivisionError("float division by zero")
+    alpha = b[:, 3:].astype(np.intp)
+    if (alpha != 255).any():
+        result = (a[:, :3] * (255 - alpha) + result * alpha + 127) // 255
+    pixels = np.empty_like(a)
+    pixels[:, :3] = result
+    pixels[:, 3] = a[:, 3]
+    return pixels.reshape(-1)
+
+
+def _py_tile(rows, a, b, channels):
+    """ Blend one tile of pixels in pure Python, returning the blended bytes. """
+    try:
+        if channels == 3:
+            return bytes(map(getitem, map(rows.__getitem__, a), b))
+        pixels = bytearray(a)
+        alpha = bytes(b[3::4])
+        for c in range(3):
+            result = bytes(map(getitem, map(rows.__getitem__, a[c::4]), b[c::4]))
+            if alpha.count(255) != len(alpha):
+                result = bytes((x * (255 - t) + y * t + 127) // 255 for x, y, t in zip(a[c::4], result, alpha))
+            pixels[c::4] = result
+        return pixels
+    except ValueError:
+        # -1 marks a pair that divides by zero
+        raise ZeroDivisionError("float division by zero") from None
+
+
+def blend_buffer(mode: str, base, top, out=None, layout: str = "rgb", tile_size: int = TILE_SIZE):
+    """Blend ``top`` onto a buffer of packed 8-bit pixels.
+
+    ``base``, ``top`` and ``out`` are any objects supporting the buffer
+    protocol (bytes, bytearray, memoryview, mmap, ...) holding pixels in the
+    ``"rgb"`` or ``"rgba"`` layout. ``top`` can also be a single color applied
+    to every pixel. The buffers are read and written ``tile_size`` pixels at a
+    time without copying them whole, so memory mapped files larger than RAM can
+    be blended. When ``out`` is not given a new bytearray is returned, ``out``
+    may also be ``base`` itself.
+
+    The color channels are identical to calling the blend method of RGBColor
+    on every pixel. With ``"rgba"`` the alpha of ``top`` sets how much of the
+    blended color covers ``base``, and the alpha of ``base`` is kept.
+    """
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}")
+    try:
+        channels = LAYOUTS[layout]
+    except KeyError:
+        raise ValueError(f"Unknown pixel layout {layout!r}") from None
+    base = _bytes_view(base, "base")
+    if len(base) % channels:
+        raise ValueError(f"base is not a whole number of {layout} pixels")
+    step = max(1, tile_size) * channels
+
+    if isinstance(top, Color):
+        pixel = bytes(top._channels("rgb")) + bytes([round(top.alpha * 255)]) * (channels - 3)
+        tile = pixel * (step // channels)
+        top = None
+    else:
+        top = _bytes_view(top, "top", len(base))
+    if out is None:
+        out = bytearray(len(base))
+    view = _bytes_view(out, "out", len(base))
+    if view.readonly:
+        raise TypeError("out must be a writable buffer")
+
+    if np is not None:
+        table = np.frombuffer(_byte_table(mode), dtype=np.int16)
+        if top is None:
+            tile = np.frombuffer(tile, dtype=np.uint8)
+        for start in range(0, len(base), step):
+            a = np.frombuffer(base[start:start + step], dtype=np.uint8)
+            b = tile[:len(a)] if top is None else np.frombuffer(top[start:start + step], dtype=np.uint8)
+            np.frombuffer(view[start:start + len(a)], dtype=np.uint8)[:] = _np_tile(table, a, b, channels)
+    else:
+        rows = _byte_rows(mode)
+        for start in range(0, len(base), step):
+            a = base[start:start + step]
+            b = tile[:len(a)] if top is None else top[start:start + step]
+            view[start:start + len(a)] = _py_tile(rows, a, b, channels)
+    return out
@@ -0,0 +1,157 @@
+"""
+colors.composite
+================
+Alpha compositing of whole layers of colors.
+
+A layer is a batch of colors with premultiplied alpha: an (N, 4) float64
+ndarray of ``r * a, g * a, b * a, a`` rows with NumPy, a flat ``array('d')``
+of the same values otherwise. :func:`premultiply` builds one from a
+:class:`~colors.array.ColorArray` and its alphas, :func:`unpremultiply` turns
+it back.
+
+:func:`composite` applies a Porter-Duff operator, optionally mixing the layers
+with a blend mode first, using the formula of the W3C Compositing and Blending
+spec. The result matches :meth:`RGBAColor.over <colors.base.RGBAColor.over>`
+and the other operators color by color. :func:`flatten` composites a whole
+stack of layers, making one pass over the result per layer.
+"""
+from __future__ import annotations
+from array import array
+
+from .array import ColorArray, np, _is_numpy
+from .base import _PORTER_DUFF
+from .blend import BLEND_MODES, TILE_SIZE, _NP_MODES, _PY_MODES
+
+__all__ = ("OPERATORS", "composite", "flatten", "premultiply", "unpremultiply")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Optional, Sequence, Tuple, Union
+
+#: Names of the Porter-Duff operators.
+OPERATORS = frozenset(_PORTER_DUFF)
+
+
+def premultiply(colors: ColorArray, alpha: Union[float, Sequence[float]] = 1.0):
+    """ A layer from ``colors`` and their alphas, a single value or one per color. """
+    data = colors.float.data
+    if _is_numpy(data):
+        layer = np.empty((len(data), 4), dtype=np.float64)
+        layer[:, 3] = alpha
+        layer[:, :3] = data * layer[:, 3:]
+        return layer
+    if isinstance(alpha, (int, float)):
+        alpha = [alpha] * len(colors)
+    elif len(alpha) != len(colors):
+        raise ValueError("Expected one alpha per color")
+    it = iter(data)
+    return array("d", [c for (r, g, b), a in zip(zip(it, it, it), alpha) for c in (r * a, g * a, b * a, a)])
+
+
+def unpremultiply(layer, space: str = "float") -> Tuple[ColorArray, object]:
+    """The colors of a layer in ``space`` and their alphas.
+
+    Alphas are an ndarray with NumPy, an ``array('d')`` otherwise. Fully
+    transparent colors come back black.
+    """
+    if _is_numpy(layer):
+        alpha = layer[:, 3].copy()
+        data = np.divide(layer[:, :3], layer[:, 3:], out=np.zeros((len(layer), 3)), where=layer[:, 3:] != 0)
+        return ColorArray.from_buffer(data, "float").to(space), alpha
+    alpha = array("d", layer[3::4])
+    data = array("d")
+    for i in range(0, len(layer), 4):
+        a = layer[i + 3]
+        data.extend((layer[i] / a, layer[i + 1] / a, layer[i + 2] / a) if a else (0.0, 0.0, 0.0))
+    return ColorArray.from_buffer(data, "float").to(space), alpha
+
+
+def _np_composite(source, backdrop, out, fractions, mode):
+    a_s, a_b = source[:, 3:], backdrop[:, 3:]
+    fa, fb = fractions(a_s, a_b)
+    color = source[:, :3]
+    if mode is not None:
+        # The blend mode mixes the colors without their alpha, only where both are present
+        both = (a_s[:, 0] != 0) & (a_b[:, 0] != 0)
+        mixed = np.zeros_like(color)
+        mixed[both] = _NP_MODES[mode](backdrop[both, :3] / a_b[both], color[both] / a_s[both])
+        color = (1 - a_b) * color + a_s * a_b * mixed
+    alpha = a_s * fa + a_b * fb
+    out[:, :3] = color * fa + backdrop[:, :3] * fb
+    out[:, 3:] = alpha
+
+
+def _py_composite(source, backdrop, out, fractions, mode):
+    blend = _PY_MODES[mode] if mode is not None else None
+    for i in range(0, len(out), 4):
+        sr, sg, sb, a_s = source[i:i + 4]
+        br, bg, bb, a_b = backdrop[i:i + 4]
+        fa, fb = fractions(a_s, a_b)
+        if blend is not None and a_s and a_b:
+            mix = a_s * a_b
+            sr, sg, sb = ((1 - a_b) * s + mix * blend(b / a_b, s / a_s) for s, b in ((sr, br), (sg, bg), (sb, bb)))
+        out[i:i + 4] = array("d", (sr * fa + br * fb, sg * fa + bg * fb, sb * fa + bb * fb, a_s * fa + a_b * fb))
+
+
+def _check(operator: str, mode: Optional[str]):
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown operator {operator!r}")
+    if mode is not None and mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}")
+    return _PORTER_DUFF[operator]
+
+
+def _apply(source, backdrop, out, fractions, mode):
+    if _is_numpy(out):
+        for start in range(0, len(out), TILE_SIZE):
+            rows = slice(start, start + TILE_SIZE)
+            _np_composite(source[rows], backdrop[rows], out[rows], fractions, mode)
+    else:
+        _py_composite(source, backdrop, out, fractions, mode)
+
+
+def composite(source, backdrop, operator: str = "over", mode: Optional[str] = None, out=None):
+    """Composite the ``source`` layer with the ``backdrop`` layer.
+
+    ``operator`` is one of :data:`OPERATORS` and ``mode`` the name of a blend
+    mode mixing the colors where both layers are present. The result is
+    written into ``out`` when given, which may be either layer.
+    """
+    fractions = _check(operator, mode)
+    if len(source) != len(backdrop):
+        raise ValueError("Composited layers must have the same length")
+    if out is None:
+        out = np.empty_like(backdrop) if _is_numpy(backdrop) else array("d", bytes(len(backdrop) * 8))
+    elif len(out) != len(backdrop):
+        raise ValueError("out must have the same length as the layers")
+    _apply(source, backdrop, out, fractions, mode)
+    return out
+
+
+def flatten(layers: Sequence, modes: Optional[Sequence[Optional[str]]] = None, out=None):
+    """Composite a stack of layers, from the bottom one up, each over the ones below.
+
+    ``modes`` holds the blend mode of every layer, or None for normal. The one
+    of the bottom layer has no effect since there is nothing below it. The
+    stack is accumulated in ``out``, or a new layer, one layer at a time.
+    """
+    if not layers:
+        raise ValueError("Nothing to flatten")
+    if modes is None:
+        modes = [None] * len(layers)
+    elif len(modes) != len(layers):
+        raise ValueError("Expected one blend mode per layer")
+    fractions = _check("over", None)
+    for mode in modes:
+        _check("over", mode)
+    bottom = layers[0]
+    if any(len(layer) != len(bottom) for layer in layers):
+        raise ValueError("Flattened layers must have the same length")
+    if out is None:
+        out = bottom.copy() if _is_numpy(bottom) else array("d", bottom)
+    else:
+        out[:] = bottom
+    for layer, mode in zip(layers[1:], modes[1:]):
+        _apply(layer, out, out, fractions, mode)
+    return out
@@ -0,0 +1,214 @@
+"""
+colors.css
+==========
+Parse and serialize CSS color values.
+
+:func:`parse` reads ``#rgb``, ``#rgba``, ``#rrggbb``, ``#rrggbbaa``, ``rgb()``,
+``rgba()``, ``hsl()``, ``hsla()`` (with commas or the space separated syntax of
+CSS Color 4), ``transparent`` and the named colors of :mod:`colors.w3c`.
+Colors without alpha come back as :class:`~colors.base.RGBColor`, the others as
+:class:`~colors.base.RGBAColor`. Out of range values are clamped like browsers
+do.
+
+:func:`parse_many` streams large inputs, one color per line, into
+:class:`~colors.array.ColorArray` chunks. Parsed values are cached, so the
+repeated colors of a stylesheet are only parsed once.
+"""
+from __future__ import annotations
+import colorsys
+import math
+from array import array
+from functools import lru_cache
+from itertools import islice
+
+from . import w3c
+from .array import ColorArray, np, _packed
+from .base import Color, RGBAColor, RGBColor, _HEX_DIGITS
+
+__all__ = ("STYLES", "parse", "parse_many", "serialize", "serialize_many")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+#: Output styles accepted by :func:`serialize`.
+STYLES = frozenset(("hex", "rgb", "hsl", "name"))
+
+#: Default number of colors in each chunk of :func:`parse_many`.
+CHUNK_SIZE = 1 << 16
+
+# Packed 24-bit value of every named color, built once.
+_NAMED = dict(sorted(w3c._TABLE.items()))
+# The first name of every value, for serializing.
+_NAMES = {}
+for _name, _value in _NAMED.items():
+    _NAMES.setdefault(_value, _name)
+del _name, _value
+
+# Hue units in turns.
+_ANGLES = {"deg": 1 / 360, "grad": 1 / 400, "rad": 1 / math.tau, "turn": 1.0}
+
+
+def _error(text: str) -> ValueError:
+    return ValueError(f"Not a valid CSS color: {text!r}")
+
+
+def _channel(value: str) -> int:
+    """ An rgb() channel, a number from 0 to 255 or a percentage. """
+    if value[-1:] == "%":
+        c = float(value[:-1]) * 255 / 100
+    else:
+        c = float(value)
+    return round(min(255.0, max(0.0, c)))
+
+
+def _fraction(value: str) -> float:
+    """ An alpha, saturation or lightness, a number from 0 to 1 or a percentage. """
+    c = float(value[:-1]) / 100 if value[-1:] == "%" else float(value)
+    return min(1.0, max(0.0, c))
+
+
+def _hue(value: str) -> float:
+    """ A hue in turns from 0 to 1. """
+    for unit, scale in _ANGLES.items():
+        if value.endswith(unit):
+            return float(value[:-len(unit)]) * scale % 1.0
+    return float(value) / 360 % 1.0
+
+
+def _parse_hex(digits: str, text: str) -> tuple:
+    if digits.translate(_HEX_DIGITS):
+        raise _error(text)
+    if len(digits) in (3, 4):
+        digits = "".join(d + d for d in digits)
+    if len(digits) == 6:
+        return int(digits, 16), None
+    if len(digits) == 8:
+        return int(digits[:6], 16), int(digits[6:], 16) / 255
+    raise _error(text)
+
+
+@lru_cache(maxsize=1 << 12)
+def _parse(text: str) -> tuple:
+    """ The packed 24-bit rgb value and alpha, None when not given, of a CSS color. """
+    token = text.strip().lower()
+    if token[:1] == "#":
+        return _parse_hex(token[1:], text)
+    name, paren, args = token.partition("(")
+    if not paren:
+        if token == "transparent":
+            return 0, 0.0
+        try:
+            return _NAMED[token], None
+        except KeyError:
+            raise _error(text) from None
+    if args[-1:] != ")":
+        raise _error(text)
+    # "1, 2, 3, 0.5" and "1 2 3 / 0.5" both split into the channels and alpha
+    values = args[:-1].replace(",", " ").replace("/", " ").split()
+    if len(values) not in (3, 4):
+        raise _error(text)
+    try:
+        alpha = _fraction(values[3]) if len(values) == 4 else None
+        if name in ("rgb", "rgba"):
+            r, g, b = _channel(values[0]), _channel(values[1]), _channel(values[2])
+        elif name in ("hsl", "hsla"):
+            rgb = colorsys.hls_to_rgb(_hue(values[0]), _fraction(values[2]), _fraction(values[1]))
+            r, g, b = (round(c * 255) for c in rgb)
+        else:
+            raise _error(text)
+    except ValueError:
+        raise _error(text) from None
+    return r << 16 | g << 8 | b, alpha
+
+
+def parse(text: str) -> Color:
+    """ Parse a CSS color, an RGBAColor when it has an alpha component and an RGBColor otherwise. """
+    value, alpha = _parse(text)
+    rgb = (value >> 16, value >> 8 & 0xff, value & 0xff)
+    if alpha is None:
+        return RGBColor._from_channels(rgb)
+    return RGBAColor._from_channels(rgb, alpha)
+
+
+def parse_many(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[ColorArray, object]]:
+    """Parse one CSS color per line, yielding ``(colors, alpha)`` chunks of up to ``chunk_size`` colors.
+
+    ``colors`` is a ColorArray in the rgb space, ``alpha`` holds the alpha of
+    every color (1 when not given), an ndarray with NumPy and an
+    ``array('d')`` otherwise. Blank lines are skipped. Only one chunk is held
+    in memory at a time.
+    """
+    lines = filter(str.strip, lines)
+    parse_ = _parse
+    while True:
+        parsed = [parse_(line) for line in islice(lines, chunk_size)]
+        if not parsed:
+            return
+        packed = [value for value, _ in parsed]
+        alpha = array("d", [1.0 if a is None else a for _, a in parsed])
+        if np is not None:
+            values = np.array(packed, dtype=np.int64)
+            data = np.empty((len(packed), 3), dtype=np.float64)
+            data[:, 0] = values >> 16
+            data[:, 1] = values >> 8 & 0xff
+            data[:, 2] = values & 0xff
+            alpha = np.frombuffer(alpha, dtype=np.float64)
+        else:
+            data = array("d", [c for v in packed for c in (v >> 16, v >> 8 & 0xff, v & 0xff)])
+        yield ColorArray.from_buffer(data, "rgb"), alpha
+
+
+def _number(value: float) -> str:
+    return "%g" % round(value, 3)
+
+
+def _serialize(value: int, alpha: float, style: str) -> str:
+    opaque = alpha >= 1
+    if style == "name":
+        if opaque and value in _NAMES:
+            return _NAMES[value]
+        if not alpha and not value:
+            return "transparent"
+        style = "hex"
+    if style == "hex":
+        if opaque:
+            return "#%06x" % value
+        return "#%06x%02x" % (value, round(alpha * 255))
+    r, g, b = value >> 16, value >> 8 & 0xff, value & 0xff
+    if style == "rgb":
+        if opaque:
+            return f"rgb({r}, {g}, {b})"
+        return f"rgba({r}, {g}, {b}, {_number(alpha)})"
+    h, l, s = colorsys.rgb_to_hls(r / 255, g / 255, b / 255)
+    hsl = f"{_number(h * 360)}, {_number(s * 100)}%, {_number(l * 100)}%"
+    if opaque:
+        return f"hsl({hsl})"
+    return f"hsla({hsl}, {_number(alpha)})"
+
+
+def serialize(color: Color, style: str = "hex") -> str:
+    """Write a color as CSS.
+
+    ``style`` is ``"hex"`` (``#rrggbb``), ``"rgb"`` (``rgb(r, g, b)``),
+    ``"hsl"`` or ``"name"``, which falls back to hex for colors without a
+    name. Translucent colors are written with their alpha.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style {style!r}")
+    return _serialize(color._channels("hex"), color.alpha, style)
+
+
+def serialize_many(colors: ColorArray, alpha: Optional[Sequence[float]] = None, style: str = "hex") -> list:
+    """ Write every color of an array as CSS, with one alpha per color when given. """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style {style!r}")
+    packed = _packed(colors)
+    if alpha is None:
+        if style == "hex":
+            return ["#%06x" % v for v in packed]
+        alpha = [1.0] * len(packed)
+    elif len(alpha) != len(packed):
+        raise ValueError("Expected one alpha per color")
+    return [_serialize(v, a, style) for v, a in zip(packed, map(float, alpha))]
@@ -0,0 +1,216 @@
+"""
+colors.distance
+===============
+Color differences between whole :class:`~colors.array.ColorArray` batches.
+
+The metrics are the ones of :meth:`colors.base.Color.distance`: ``"cie76"``,
+``"ciede2000"`` and ``"oklab"``. Pairwise distances are computed in blocks of
+bounded size, so two large arrays can be compared without ever holding the
+full distance matrix in memory.
+"""
+from __future__ import annotations
+import heapq
+from array import array
+
+from . import base
+from .array import ColorArray, np, _is_numpy
+
+__all__ = ("METRICS", "distance", "distance_matrix", "iter_distance_blocks", "nearest", "pairs_within")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterator, Optional, Tuple
+
+#: Names of the supported metrics.
+METRICS = frozenset(base._METRICS)
+
+#: Default number of rows and columns of a block of the distance matrix.
+BLOCK_SIZE = 512
+
+
+def _np_euclidean(l1, a1, b1, l2, a2, b2):
+    return np.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+
+def _np_delta_e2000(l1, a1, b1, l2, a2, b2):
+    c_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    c_bar7 = c_bar ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + 25 ** 7)))
+    a1, a2 = (1 + g) * a1, (1 + g) * a2
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+    chroma = c1 * c2 != 0
+
+    dh = h2 - h1
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma, dh, 0.0)
+    dl = l2 - l1
+    dc = c2 - c1
+    dh = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh / 2))
+
+    l_bar = (l1 + l2) / 2
+    c_bar = (c1 + c2) / 2
+    h_sum = h1 + h2
+    wrap = chroma & (np.abs(h1 - h2) > 180)
+    h_bar = np.where(wrap, h_sum + np.where(h_sum < 360, 360, -360), h_sum)
+    h_bar = np.where(chroma, h_bar / 2, h_bar)
+
+    t = (1 - 0.17 * np.cos(np.radians(h_bar - 30)) + 0.24 * np.cos(np.radians(2 * h_bar))
+         + 0.32 * np.cos(np.radians(3 * h_bar + 6)) - 0.20 * np.cos(np.radians(4 * h_bar - 63)))
+    theta = 30 * np.exp(-((h_bar - 275) / 25) ** 2)
+    c_bar7 = c_bar ** 7
+    rc = 2 * np.sqrt(c_bar7 / (c_bar7 + 25 ** 7))
+    sl = 1 + 0.015 * (l_bar - 50) ** 2 / np.sqrt(20 + (l_bar - 50) ** 2)
+    sc = 1 + 0.045 * c_bar
+    sh = 1 + 0.015 * c_bar * t
+    rt = -np.sin(np.radians(2 * theta)) * rc
+    dl, dc, dh = dl / sl, dc / sc, dh / sh
+    return np.sqrt(dl ** 2 + dc ** 2 + dh ** 2 + rt * dc * dh)
+
+
+_NP_METRICS = {
+    "cie76": _np_euclidean,
+    "ciede2000": _np_delta_e2000,
+    "oklab": _np_euclidean,
+}
+
+
+def _metric(metric: str):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r}")
+    return base._METRICS[metric]
+
+
+def _triples(data) -> list:
+    it = iter(data)
+    return list(zip(it, it, it))
+
+
+def distance(a: ColorArray, b: ColorArray, metric: str = "cie76"):
+    """ Distance between each color of ``a`` and the color at the same index of ``b``. """
+    if len(a) != len(b):
+        raise ValueError("Compared arrays must have the same length")
+    space, func = _metric(metric)
+    x, y = a.to(space).data, b.to(space).data
+    if _is_numpy(x):
+        return _NP_METRICS[metric](x[:, 0], x[:, 1], x[:, 2], y[:, 0], y[:, 1], y[:, 2])
+    return array("d", map(func, _triples(x), _triples(y)))
+
+
+def iter_distance_blocks(a: ColorArray, b: Optional[ColorArray] = None, metric: str = "cie76",
+                         block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, int, object]]:
+    """Distances between every color of ``a`` and every color of ``b``, block by block.
+
+    Yields ``(row, column, block)`` where ``block`` holds the distances of
+    ``a[row:row + block_size]`` to ``b[column:column + block_size]``: a 2D
+    ndarray with NumPy, a list of ``array('d')`` rows otherwise. ``b`` defaults
+    to ``a``. At most one block is held in memory at a time.
+    """
+    space, func = _metric(metric)
+    x = a.to(space).data
+    y = x if b is None else b.to(space).data
+    if _is_numpy(x):
+        kernel = _NP_METRICS[metric]
+        for i in range(0, len(x), block_size):
+            rows = x[i:i + block_size]
+            l1, a1, b1 = rows[:, 0, None], rows[:, 1, None], rows[:, 2, None]
+            for j in range(0, len(y), block_size):
+                cols = y[j:j + block_size]
+                yield i, j, kernel(l1, a1, b1, cols[None, :, 0], cols[None, :, 1], cols[None, :, 2])
+        return
+    x, y = _triples(x), _triples(y)
+    for i in range(0, len(x), block_size):
+        rows = x[i:i + block_size]
+        for j in range(0, len(y), block_size):
+            cols = y[j:j + block_size]
+            yield i, j, [array("d", [func(row, col) for col in cols]) for row in rows]
+
+
+def distance_matrix(a: ColorArray, b: Optional[ColorArray] = None, metric: str = "cie76"):
+    """The full ``len(a)`` by ``len(b)`` distance matrix, ``b`` defaults to ``a``.
+
+    This holds the whole matrix in memory, use :func:`iter_distance_blocks`,
+    :func:`nearest` or :func:`pairs_within` for large arrays.
+    """
+    other = a if b is None else b
+    if _is_numpy(a.data):
+        out = np.empty((len(a), len(other)), dtype=np.float64)
+        for i, j, block in iter_distance_blocks(a, b, metric):
+            out[i:i + block.shape[0], j:j + block.shape[1]] = block
+        return out
+    out = [array("d") for _ in range(len(a))]
+    for i, _, block in iter_distance_blocks(a, b, metric):
+        for row, values in enumerate(block):
+            out[i + row].extend(values)
+    return out
+
+
+def nearest(a: ColorArray, b: ColorArray, metric: str = "cie76", k: int = 1,
+            block_size: int = BLOCK_SIZE) -> Tuple[list, list]:
+    """For every color of ``a``, the indices of and distances to the ``k`` nearest colors of ``b``.
+
+    Returns ``(indices, distances)``, two lists with one entry per color of
+    ``a``. With ``k == 1`` the entries are a single index and distance,
+    otherwise lists ordered from nearest to farthest.
+    """
+    if not len(b):
+        raise ValueError("Cannot find the nearest color among no candidates")
+    if _is_numpy(a.data):
+        return _np_nearest(a, b, metric, k, block_size)
+    best = [[] for _ in range(len(a))]
+    for i, j, block in iter_distance_blocks(a, b, metric, block_size):
+        for row, values in enumerate(block):
+            candidates = best[i + row] + [(d, j + c) for c, d in enumerate(values)]
+            best[i + row] = heapq.nsmallest(k, candidates)
+    if k == 1:
+        return [c[0][1] for c in best], [c[0][0] for c in best]
+    return [[i for _, i in c] for c in best], [[d for d, _ in c] for c in best]
+
+
+def _np_nearest(a, b, metric, k, block_size):
+    count = min(k, len(b))
+    indices = np.zeros((len(a), count), dtype=np.int64)
+    distances = np.full((len(a), count), np.inf)
+    for i, j, block in iter_distance_blocks(a, b, metric, block_size):
+        rows = slice(i, i + block.shape[0])
+        if count == 1:
+            best = block.argmin(axis=1)
+            values = block[np.arange(len(block)), best]
+            # Strictly nearer only, so ties keep the lowest index.
+            closer = values < distances[rows, 0]
+            distances[rows, 0] = np.where(closer, values, distances[rows, 0])
+            indices[rows, 0] = np.where(closer, best + j, indices[rows, 0])
+            continue
+        part = np.argpartition(block, min(count, block.shape[1]) - 1, axis=1)[:, :count]
+        merged_d = np.concatenate((distances[rows], np.take_along_axis(block, part, axis=1)), axis=1)
+        merged_i = np.concatenate((indices[rows], part + j), axis=1)
+        order = np.lexsort((merged_i, merged_d), axis=1)[:, :count]
+        distances[rows] = np.take_along_axis(merged_d, order, axis=1)
+        indices[rows] = np.take_along_axis(merged_i, order, axis=1)
+    if k == 1:
+        return indices[:, 0].tolist(), distances[:, 0].tolist()
+    return indices.tolist(), distances.tolist()
+
+
+def pairs_within(a: ColorArray, b: Optional[ColorArray] = None, threshold: float = 2.3, metric: str = "cie76",
+                 block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, int, float]]:
+    """Yield ``(i, j, distance)`` for every pair closer than ``threshold``.
+
+    Without ``b`` the colors of ``a`` are compared with each other, and every
+    pair is reported once with ``i < j``. The default threshold of 2.3 is the
+    usual just noticeable difference for ΔE76.
+    """
+    for i, j, block in iter_distance_blocks(a, b, metric, block_size):
+        if b is None and j + block_size <= i:
+            continue
+        if _is_numpy(block):
+            rows, cols = np.nonzero(block < threshold)
+            found = zip(rows.tolist(), cols.tolist(), block[rows, cols].tolist())
+        else:
+            found = ((r, c, d) for r, values in enumerate(block) for c, d in enumerate(values) if d < threshold)
+        for row, col, d in found:
+            if b is None and i + row >= j + col:
+                continue
+            yield i + row, j + col, d
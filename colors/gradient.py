@@ -0,0 +1,153 @@
+"""
+colors.gradient
+===============
+Interpolating between colors: :func:`mix` for a single color, :func:`gradient`
+for a whole ramp as a :class:`~colors.array.ColorArray`.
+
+Colors are interpolated in one of :data:`SPACES`. ``"oklab"``, the default,
+gives perceptually even ramps, ``"rgb"`` is the plain linear blend of the sRGB
+channels and ``"hsv"`` goes around the hue circle the shorter way. A gray has
+no hue of its own in HSV, so it takes the hue of the color it is mixed with.
+Ramps are cached by their stops, asking for the same colormap twice only
+computes it once.
+"""
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+
+from .array import ColorArray, np
+from .base import Color, _AlphaColor, _route
+
+__all__ = ("SPACES", "gradient", "mix")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Sequence, Tuple, Union, TypeVar
+    T = TypeVar("T", bound=Color)
+    Stop = Union[Color, Tuple[float, Color]]
+
+#: Color spaces colors can be interpolated in.
+SPACES = frozenset(("oklab", "rgb", "hsv"))
+
+
+def _space(space: str) -> str:
+    """ The space of the conversion graph channels are interpolated in. """
+    if space not in SPACES:
+        raise ValueError(f"Unknown interpolation space {space!r}")
+    # Float channels, so ramps between 8-bit colors are not rounded at every step
+    return "float" if space == "rgb" else space
+
+
+def _hues(a: tuple, b: tuple) -> tuple:
+    """ HSV channels of ``a`` and ``b`` with the hue of ``b`` moved onto the shorter arc from ``a``. """
+    (h1, s1, v1), (h2, s2, v2) = a, b
+    if not s1:
+        h1 = h2
+    elif not s2:
+        h2 = h1
+    return (h1, s1, v1), (h1 + ((h2 - h1 + 0.5) % 1.0 - 0.5), s2, v2)
+
+
+def mix(a: T, b: Color, t: float = 0.5, space: str = "oklab") -> T:
+    """ The color ``t`` of the way from ``a`` to ``b``, in the type of ``a``. Alpha is interpolated too. """
+    interpolation = _space(space)
+    x, y = a._channels(interpolation), b._channels(interpolation)
+    if interpolation == "hsv":
+        x, y = _hues(x, y)
+    channels = [p + t * (q - p) for p, q in zip(x, y)]
+    if interpolation == "hsv":
+        channels[0] %= 1.0
+    channels = _route(interpolation, a._space)(channels)
+    if isinstance(a, _AlphaColor):
+        return a._from_channels(channels, a.alpha + t * (b.alpha - a.alpha))
+    return a._from_channels(channels)
+
+
+def _stops(stops: Sequence[Stop]) -> list:
+    """``(position, color)`` of every stop.
+
+    Like CSS gradients, stops without a position are spread evenly between
+    the ones around them, the first and last default to 0 and 1.
+    """
+    if len(stops) < 2:
+        raise ValueError("A gradient needs at least 2 stops")
+    positions, colors = [], []
+    for stop in stops:
+        position, color = (None, stop) if isinstance(stop, Color) else stop
+        positions.append(position)
+        colors.append(color)
+    if positions[0] is None:
+        positions[0] = 0.0
+    if positions[-1] is None:
+        positions[-1] = 1.0
+    known = 0
+    for i in range(1, len(positions)):
+        if positions[i] is None:
+            continue
+        for j in range(known + 1, i):
+            positions[j] = positions[known] + (positions[i] - positions[known]) * (j - known) / (i - known)
+        known = i
+    for i, position in enumerate(positions):
+        if not 0 <= position <= 1 or (i and position < positions[i - 1]):
+            raise ValueError("Stop positions must increase from 0 to 1")
+    return [(float(position), color) for position, color in zip(positions, colors)]
+
+
+@lru_cache(maxsize=64)
+def _ramp(key: tuple, n: int, space: str, out: str):
+    """ The raw channels of an ``n`` step ramp in ``out``, ``key`` holds ``(position, channels)`` per stop. """
+    positions = [position for position, _ in key]
+    channels = [color for _, color in key]
+    segments = []
+    for i in range(len(key) - 1):
+        a, b = channels[i], channels[i + 1]
+        if space == "hsv":
+            a, b = _hues(a, b)
+        segments.append((a, b))
+    last = max(n - 1, 1)
+    if np is not None:
+        t = np.arange(n, dtype=np.float64) / last
+        index = np.clip(np.searchsorted(positions, t, side="right") - 1, 0, len(segments) - 1)
+        start = np.array(positions[:-1])[index]
+        width = np.array(positions[1:])[index] - start
+        u = np.clip(np.divide(t - start, width, out=np.zeros(n), where=width > 0), 0.0, 1.0)[:, None]
+        a = np.array([a for a, _ in segments])[index]
+        b = np.array([b for _, b in segments])[index]
+        data = a + u * (b - a)
+        if space == "hsv":
+            data[:, 0] %= 1.0
+        data = ColorArray.from_buffer(data, space).to(out).data
+        data.flags.writeable = False
+        return data
+    data = array("d")
+    segment = 0
+    for i in range(n):
+        t = i / last
+        while segment < len(segments) - 1 and t >= positions[segment + 1]:
+            segment += 1
+        (a, b), start = segments[segment], positions[segment]
+        width = positions[segment + 1] - start
+        u = min(1.0, max(0.0, (t - start) / width)) if width > 0 else 0.0
+        color = [p + u * (q - p) for p, q in zip(a, b)]
+        if space == "hsv":
+            color[0] %= 1.0
+        data.extend(color)
+    return ColorArray.from_buffer(data, space).to(out).data
+
+
+def gradient(stops: Sequence[Stop], n: int, space: str = "oklab") -> ColorArray:
+    """An ``n`` color ramp through ``stops``, in the color space of the first stop.
+
+    ``stops`` are colors, spread evenly from start to end, or ``(position,
+    color)`` pairs with positions increasing from 0 to 1. Before the first and
+    after the last position the ramp holds the color of that stop.
+    """
+    interpolation = _space(space)
+    if n < 1:
+        raise ValueError("A gradient needs at least 1 color")
+    stops = _stops(stops)
+    key = tuple((position, tuple(color._channels(interpolation))) for position, color in stops)
+    data = _ramp(key, n, interpolation, stops[0][1]._space)
+    # The cached ramp is shared, every caller gets its own copy
+    return ColorArray.from_buffer(array("d", data) if isinstance(data, array) else data.copy(), stops[0][1]._space)
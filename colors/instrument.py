@@ -0,0 +1,202 @@
+"""
+colors.instrument
+=================
+Opt-in counters and timing for the hot paths of :mod:`colors.base`.
+
+While enabled, every call of a conversion edge (``hex`` to ``rgb``, ``rgb``
+to ``float``, ...) and of a blend mode is counted and timed. ``HexColor.hsv``
+for example shows up as one ``hex -> float`` and one ``float -> hsv`` call.
+Enabling swaps the functions of the conversion graph and the blend kernel for
+timed wrappers, and disabling puts the originals back, so the instrumentation
+costs nothing at all while it is off.
+
+:func:`collect` scopes collection to a ``with`` block. :func:`snapshot` and
+:func:`prometheus` export what was collected as a dict or in the Prometheus
+text format. Counts can be slightly off when several threads convert at once.
+Compiled :mod:`colors.lazy` chains keep the conversions they were compiled
+with.
+
+:func:`enable` and :func:`disable` are reference counted, the functions stay
+instrumented until every ``enable()`` and every :func:`collect` block has been
+matched. The metrics of a :func:`collect` block are held in a
+:class:`~contextvars.ContextVar`, so blocks running at once in different
+threads or asyncio tasks each see their own calls.
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from . import base
+
+__all__ = ("Metrics", "enable", "disable", "is_enabled", "reset", "snapshot", "prometheus", "collect")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+
+class Metrics:
+    """ Calls and cumulative seconds per conversion edge and per blend mode. """
+    __slots__ = ("conversions", "blend_modes")
+
+    def __init__(self):
+        #: ``(src, dst)`` edge to ``[calls, seconds]``.
+        self.conversions = {}
+        #: Blend mode name to ``[calls, seconds]``.
+        self.blend_modes = {}
+
+    def _merge(self, other: Metrics):
+        for mine, theirs in ((self.conversions, other.conversions), (self.blend_modes, other.blend_modes)):
+            for key, (calls, seconds) in theirs.items():
+                stat = mine.setdefault(key, [0, 0.0])
+                stat[0] += calls
+                stat[1] += seconds
+
+    def snapshot(self) -> dict:
+        """ A copy of the metrics, ``{"conversions": {"hex->rgb": {"calls": 1, "seconds": 1e-06}}, "blend_modes": {...}}``. """
+        return {
+            "conversions": {
+                f"{src}->{dst}": {"calls": calls, "seconds": seconds}
+                for (src, dst), (calls, seconds) in sorted(self.conversions.items())
+            },
+            "blend_modes": {
+                mode: {"calls": calls, "seconds": seconds} for mode, (calls, seconds) in sorted(self.blend_modes.items())
+            },
+        }
+
+    def prometheus(self, prefix: str = "colors") -> str:
+        """ The metrics in the Prometheus text exposition format. """
+        lines = []
+        for name, per, table, labels in (
+            ("conversion", "conversion edge", self.conversions, lambda edge: 'src="%s",dst="%s"' % edge),
+            ("blend", "blend mode", self.blend_modes, lambda mode: 'mode="%s"' % mode),
+        ):
+            for i, (metric, kind) in enumerate((("calls", "Calls"), ("seconds", "Seconds spent"))):
+                metric = f"{prefix}_{name}_{metric}_total"
+                lines.append(f"# HELP {metric} {kind} per {per}.")
+                lines.append(f"# TYPE {metric} counter")
+                lines.extend(f"{metric}{{{labels(key)}}} {stat[i]!r}" for key, stat in sorted(table.items()))
+        return "\n".join(lines) + "\n"
+
+
+# Everything collected outside of collect() blocks.
+_global = Metrics()
+# The metrics of the innermost collect() block of the current context, None outside of one.
+_current = ContextVar("colors_metrics", default=None)
+# The original conversion edges and blend kernel while enabled, None otherwise.
+_originals = None
+# Number of enable() calls and collect() blocks not matched yet.
+_users = 0
+_lock = threading.Lock()
+
+
+def _timed_edge(edge: tuple, func):
+    perf_counter = time.perf_counter
+
+    def timed(color):
+        start = perf_counter()
+        try:
+            return func(color)
+        finally:
+            elapsed = perf_counter() - start
+            table = (_current.get() or _global).conversions
+            stat = table.get(edge)
+            if stat is None:
+                stat = table[edge] = [0, 0.0]
+            stat[0] += 1
+            stat[1] += elapsed
+    return timed
+
+
+def _timed_blend(func):
+    perf_counter = time.perf_counter
+
+    def timed(mode, a, b):
+        start = perf_counter()
+        try:
+            return func(mode, a, b)
+        finally:
+            elapsed = perf_counter() - start
+            table = (_current.get() or _global).blend_modes
+            stat = table.get(mode)
+            if stat is None:
+                stat = table[mode] = [0, 0.0]
+            stat[0] += 1
+            stat[1] += elapsed
+    return timed
+
+
+def is_enabled() -> bool:
+    return _originals is not None
+
+
+def enable() -> None:
+    """ Start counting and timing conversions and blend modes in the whole process. """
+    global _originals, _users
+    with _lock:
+        _users += 1
+        if _originals is not None:
+            return
+        _originals = dict(base._CONVERSIONS), base._blend
+        base._CONVERSIONS.update({edge: _timed_edge(edge, func) for edge, func in _originals[0].items()})
+        base._blend = _timed_blend(_originals[1])
+        # Routes are cached with the edges they were built from
+        base._route.cache_clear()
+
+
+def disable() -> None:
+    """Match an :func:`enable` call.
+
+    The uninstrumented functions are put back once no other ``enable()`` or
+    :func:`collect` block is left. The metrics are kept.
+    """
+    global _originals, _users
+    with _lock:
+        if _users == 0:
+            return
+        _users -= 1
+        if _users or _originals is None:
+            return
+        base._CONVERSIONS.update(_originals[0])
+        base._blend = _originals[1]
+        _originals = None
+        base._route.cache_clear()
+
+
+def reset() -> None:
+    """ Forget everything collected outside of :func:`collect` blocks so far. """
+    _global.conversions.clear()
+    _global.blend_modes.clear()
+
+
+def snapshot() -> dict:
+    """ The metrics collected so far, see :meth:`Metrics.snapshot`. """
+    return _global.snapshot()
+
+
+def prometheus(prefix: str = "colors") -> str:
+    """ The metrics collected so far in the Prometheus text format, see :meth:`Metrics.prometheus`. """
+    return _global.prometheus(prefix)
+
+
+@contextmanager
+def collect() -> Iterator[Metrics]:
+    """Collect inside a ``with`` block, yielding the metrics of that block alone.
+
+    Only calls made in the current thread or asyncio task, and in tasks it
+    starts, are collected by the block. Instrumentation stays on while any
+    block or :func:`enable` call is active, and what the block collected is
+    added to the enclosing block, or to the process wide metrics, after it.
+    """
+    outer, metrics = _current.get(), Metrics()
+    token = _current.set(metrics)
+    enable()
+    try:
+        yield metrics
+    finally:
+        disable()
+        _current.reset(token)
+        (outer or _global)._merge(metrics)
@@ -0,0 +1,68 @@
+"""
+colors.intern
+=============
+An optional, process-wide intern table for 8-bit rgb colors.
+
+While enabled, :func:`intern_rgb` and every ``.rgb`` conversion of a frozen
+color return one shared :class:`~colors.base.FrozenRGBColor` per value, kept
+in a bounded LRU table. Frozen colors cache their own conversions, so a color
+that stays in the table is converted to hsv, float or hex only once.
+"""
+from __future__ import annotations
+from functools import lru_cache
+
+from . import base
+from .base import Color, FrozenRGBColor
+
+__all__ = ("enable", "disable", "enabled", "info", "clear", "intern_rgb", "intern")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Optional
+
+#: Default number of colors kept in the table.
+DEFAULT_MAXSIZE = 65536
+
+
+def enable(maxsize: Optional[int] = DEFAULT_MAXSIZE):
+    """ Turn interning on with room for ``maxsize`` colors, ``None`` allows all 16.7M.
+
+    Enabling again resizes the table, which empties it and resets the counters.
+    """
+    base._intern_rgb = lru_cache(maxsize=maxsize)(FrozenRGBColor)
+
+
+def disable():
+    """ Turn interning off and drop the table. """
+    base._intern_rgb = None
+
+
+def enabled() -> bool:
+    return base._intern_rgb is not None
+
+
+def info():
+    """ Hits, misses, maxsize and current size of the table, or None when disabled. """
+    if base._intern_rgb is None:
+        return None
+    return base._intern_rgb.cache_info()
+
+
+def clear():
+    """ Empty the table and reset its counters. """
+    if base._intern_rgb is not None:
+        base._intern_rgb.cache_clear()
+
+
+def intern_rgb(r: int, g: int, b: int) -> FrozenRGBColor:
+    """ The shared frozen color for an 8-bit rgb value. A new one when interning is disabled. """
+    table = base._intern_rgb
+    if table is None:
+        return FrozenRGBColor(r, g, b)
+    return table(r, g, b)
+
+
+def intern(color: Color) -> FrozenRGBColor:
+    """ The shared frozen color for the 8-bit rgb value of any color. """
+    return intern_rgb(*color._channels("rgb"))
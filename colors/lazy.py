@@ -0,0 +1,315 @@
+"""
+colors.lazy
+===========
+Lazily evaluated chains of blend modes and arithmetic.
+
+Calling blend methods one after another creates a new color at every step,
+converted to the caller's type and back to float channels for the next step.
+:func:`lazy` wraps a color or a :class:`~colors.array.ColorArray` in an
+:class:`Expression` that records the same methods and the ``+ - * /``
+operators instead. Evaluating it runs the whole graph in one pass over float
+channels, and only builds the result in its final type at the end::
+
+    >>> lazy(base).multiply(top).screen(glow).invert().evaluate()
+
+The result is identical to the eager chain. Where an intermediate step of the
+eager chain would round its color to the caller's type (8-bit channels for
+RGBColor and HexColor), the expression rounds its float channels the same
+way. Arrays are evaluated tile by tile so the intermediate results stay small.
+"""
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+from operator import add, mul, sub, truediv
+
+from .array import ColorArray, np, _convert, _is_numpy
+from .base import Color, RGBFloatColor, _BLEND_FORMULAS, _clamp, _route
+from .blend import _NP_MODES, _nonzero
+
+__all__ = ("Expression", "lazy")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Union
+    Operand = Union["Expression", Color, ColorArray]
+
+# Number of colors an array expression is evaluated over at a time.
+TILE_SIZE = 1 << 14
+
+# The operators, which always give unclamped float colors.
+_NP_OPS = {"__add__": add, "__sub__": sub, "__mul__": mul, "__truediv__": lambda a, b: a / _nonzero(b)}
+_SYMBOLS = {"__add__": "+", "__sub__": "-", "__mul__": "*", "__truediv__": "/"}
+
+_WHITE = RGBFloatColor(1, 1, 1)
+
+
+def lazy(value: Union[Color, ColorArray]) -> Expression:
+    """ Start an expression from a color or an array of colors. """
+    if isinstance(value, Expression):
+        return value
+    if not isinstance(value, (Color, ColorArray)):
+        raise TypeError(f"Cannot build an expression from {type(value).__name__}")
+    if isinstance(value, Color) and value.alpha != 1:
+        raise TypeError("Expressions do not composite alpha, use colors.composite for translucent colors")
+    return Expression(None, (value,))
+
+
+# The blend modes and operators per channel, the same functions the Color
+# methods use so the fused steps compute the same values.
+_FORMULAS = dict(_BLEND_FORMULAS, __add__=add, __sub__=sub, __mul__=mul, __truediv__=truediv)
+
+# Spaces whose round trip from float is rounding to 8 bits, done in place by fused steps.
+_EIGHT_BIT = frozenset(("rgb", "hex"))
+
+
+def _load(space: str):
+    """ A fused step reading the next leaf's raw channels as float channels. """
+    if space == "float":
+        return lambda registers, leaves: next(leaves)
+    convert = _route(space, "float")
+    return lambda registers, leaves: convert(next(leaves))
+
+
+def _step(op: str, left: int, right: int, rounding):
+    """ A fused step applying ``op`` to two registers, rounded through ``rounding``. """
+    formula = _FORMULAS[op]
+    if rounding in _EIGHT_BIT:
+        return lambda registers, leaves: [
+            round(_clamp(formula(a, b)) * 255) / 255 for a, b in zip(registers[left], registers[right])]
+    if rounding:
+        there, back = _route("float", rounding), _route(rounding, "float")
+        return lambda registers, leaves: back(there(tuple(map(formula, registers[left], registers[right]))))
+    return lambda registers, leaves: list(map(formula, registers[left], registers[right]))
+
+
+@lru_cache(maxsize=256)
+def _fuse(shape: tuple, space: str):
+    """Compose a flattened graph into one function.
+
+    ``shape`` holds a step per node: the color space of the raw channels
+    passed in for a leaf, ``(op, left, right, space)`` otherwise. The function
+    takes the raw channels of every leaf in order and returns the last step
+    converted to ``space``.
+    """
+    steps = [_load(step) if isinstance(step, str) else _step(*step) for step in shape]
+    store = _route("float", space)
+
+    def fused(*leaves):
+        leaves = iter(leaves)
+        registers = []
+        for step in steps:
+            registers.append(step(registers, leaves))
+        return store(tuple(registers[-1]))
+    return fused
+
+
+class Expression:
+    """ A graph of blend operations evaluated on demand.
+
+    Build one with :func:`lazy`. Every blend method of :class:`colors.base.Color`
+    and the ``+ - * /`` operators return a new expression; :meth:`evaluate`
+    computes the result.
+    """
+    __slots__ = ("_op", "_operands", "_type", "_space", "_batch", "_plan", "_kernel")
+
+    def __init__(self, op, operands):
+        self._op = op
+        self._operands = operands
+        self._plan = self._kernel = None
+        if op is None:
+            value, = operands
+            self._batch = isinstance(value, ColorArray)
+            self._type = None if self._batch else type(value)
+            self._space = value.space if self._batch else value._space
+            return
+        left, right = operands
+        self._batch = left._batch or right._batch
+        if op in _SYMBOLS:
+            # Like the eager operators, always an RGBFloatColor
+            self._type, self._space = RGBFloatColor, "float"
+        else:
+            self._type, self._space = left._type, left._space
+
+    @property
+    def space(self) -> str:
+        """ The color space of the result. """
+        return self._space
+
+    def _apply(self, op: str, other: Operand) -> Expression:
+        return Expression(op, (self, lazy(other)))
+
+    def _apply_reflected(self, op: str, other: Operand) -> Expression:
+        if not isinstance(other, (Color, ColorArray, Expression)):
+            return NotImplemented
+        return Expression(op, (lazy(other), self))
+
+    def multiply(self, other: Operand) -> Expression:
+        return self._apply("multiply", other)
+
+    def add(self, other: Operand) -> Expression:
+        return self._apply("add", other)
+
+    def divide(self, other: Operand) -> Expression:
+        return self._apply("divide", other)
+
+    def subtract(self, other: Operand) -> Expression:
+        return self._apply("subtract", other)
+
+    def screen(self, other: Operand) -> Expression:
+        return self._apply("screen", other)
+
+    def difference(self, other: Operand) -> Expression:
+        return self._apply("difference", other)
+
+    def overlay(self, other: Operand) -> Expression:
+        return self._apply("overlay", other)
+
+    def invert(self) -> Expression:
+        return self._apply("difference", _WHITE)
+
+    def color_dodge(self, other: Operand) -> Expression:
+        return self._apply("color_dodge", other)
+
+    def linear_dodge(self, other: Operand) -> Expression:
+        return self._apply("add", other)
+
+    def color_burn(self, other: Operand) -> Expression:
+        return self._apply("color_burn", other)
+
+    def linear_burn(self, other: Operand) -> Expression:
+        return self._apply("linear_burn", other)
+
+    def __add__(self, other: Operand) -> Expression:
+        return self._apply("__add__", other)
+
+    def __sub__(self, other: Operand) -> Expression:
+        return self._apply("__sub__", other)
+
+    def __mul__(self, other: Operand) -> Expression:
+        return self._apply("__mul__", other)
+
+    def __truediv__(self, other: Operand) -> Expression:
+        return self._apply("__truediv__", other)
+
+    def __radd__(self, other: Operand) -> Expression:
+        return self._apply_reflected("__add__", other)
+
+    def __rsub__(self, other: Operand) -> Expression:
+        return self._apply_reflected("__sub__", other)
+
+    def __rmul__(self, other: Operand) -> Expression:
+        return self._apply_reflected("__mul__", other)
+
+    def __rtruediv__(self, other: Operand) -> Expression:
+        return self._apply_reflected("__truediv__", other)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._describe()}>"
+
+    def _describe(self) -> str:
+        if self._op is None:
+            value, = self._operands
+            return repr(value)
+        left, right = (operand._describe() for operand in self._operands)
+        if self._op in _SYMBOLS:
+            return f"({left} {_SYMBOLS[self._op]} {right})"
+        return f"{left}.{self._op}({right})"
+
+    def _compile(self) -> list:
+        """Flatten the graph into steps, each node once even when it is shared.
+
+        A step is ``(None, value)`` for a leaf or ``(op, left, right, space)``
+        with the register indices of the operands. ``space`` is the space the
+        result is rounded through before it is used, None when it is not.
+        """
+        if self._plan is not None:
+            return self._plan
+        plan, registers = [], {}
+
+        def visit(node):
+            index = registers.get(id(node))
+            if index is None:
+                if node._op is None:
+                    plan.append((None, node._operands[0]))
+                else:
+                    left = visit(node._operands[0])
+                    right = visit(node._operands[1])
+                    space = None if node is self or node._space == "float" else node._space
+                    plan.append((node._op, left, right, space))
+                index = registers[id(node)] = len(plan) - 1
+            return index
+        visit(self)
+        self._plan = plan
+        return plan
+
+    def _fused(self):
+        if self._kernel is None:
+            shape = tuple(step[1]._space if step[0] is None else step for step in self._compile())
+            self._kernel = _fuse(shape, self._space)
+        return self._kernel
+
+    def evaluate(self) -> Union[Color, ColorArray]:
+        """ Compute the expression, a color of the first operand's type or an array in its space. """
+        if self._batch:
+            return self._evaluate_batch()
+        plan = self._compile()
+        if plan[-1][0] is None:
+            return plan[-1][1]
+        return self._type._from_channels(self._fused()(*[step[1]._color for step in plan if step[0] is None]))
+
+    def _evaluate_batch(self) -> ColorArray:
+        plan = self._compile()
+        size = None
+        for step in plan:
+            if step[0] is None and isinstance(step[1], ColorArray):
+                if size is not None and len(step[1]) != size:
+                    raise ValueError("Arrays in an expression must have the same length")
+                size = len(step[1])
+        if plan[-1][0] is None:
+            return plan[-1][1]
+        out = ColorArray.empty(size, self._space)
+        if _is_numpy(out.data):
+            for start in range(0, size, TILE_SIZE):
+                stop = min(start + TILE_SIZE, size)
+                out.data[start:stop] = _convert(self._np_tile(plan, start, stop), "float", self._space)
+            return out
+        return self._py_batch(plan, size)
+
+    def _np_tile(self, plan: list, start: int, stop: int):
+        """ The raw float result of rows ``start:stop``. """
+        registers = []
+        for step in plan:
+            if step[0] is None:
+                value = step[1]
+                if isinstance(value, ColorArray):
+                    registers.append(_convert(value.data[start:stop], value.space, "float"))
+                else:
+                    registers.append(np.array([value._channels("float")], dtype=np.float64))
+                continue
+            op, left, right, space = step
+            func = _NP_OPS.get(op) or _NP_MODES[op]
+            color = func(registers[left], registers[right])
+            if space:
+                color = _convert(_convert(color, "float", space), space, "float")
+            registers.append(color)
+        result = registers[-1]
+        if result.shape[0] != stop - start:
+            result = np.broadcast_to(result, (stop - start, 3))
+        return result
+
+    def _py_batch(self, plan: list, size: int) -> ColorArray:
+        fused = _fuse(tuple("float" if step[0] is None else step for step in plan), "float")
+        leaves = []
+        for step in plan:
+            if step[0] is None:
+                value = step[1]
+                if isinstance(value, ColorArray):
+                    it = iter(value.float.data)
+                    leaves.append(zip(it, it, it))
+                else:
+                    leaves.append([value._channels("float")] * size)
+        result = array("d")
+        for color in map(fused, *leaves):
+            result.extend(color)
+        return ColorArray.from_buffer(result, "float").to(self._space)
@@ -0,0 +1,253 @@
+"""
+colors.lut
+==========
+3D lookup tables sampling a color transform once and applying it to many colors.
+
+A :class:`ColorLUT` evaluates any ``Color -> Color`` callable, such as a chain
+of blend methods, on an evenly spaced grid over the rgb cube. Applying the
+table interpolates between the grid points, which turns a per-color chain of
+method calls into a single lookup. A table of size 256 covers every 8-bit rgb
+value and is applied by exact lookup instead.
+
+Tables are stored in the order of the ``.cube`` format (red changing fastest,
+then green, then blue) and can be saved to and loaded from ``.cube`` files.
+"""
+from __future__ import annotations
+from array import array
+from itertools import product
+
+from .array import ColorArray, np, _is_numpy
+from .base import Color, RGBColor, RGBFloatColor, _AlphaColor, _route
+
+__all__ = ("ColorLUT", "INTERPOLATIONS")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import os
+    from typing import Callable, Optional, Union
+
+#: Interpolation methods accepted by :meth:`ColorLUT.apply`.
+INTERPOLATIONS = frozenset(("trilinear", "tetrahedral"))
+
+# Size of the table covering every 8-bit rgb value, applied without interpolation.
+EXACT_SIZE = 256
+
+
+def _grid(size: int):
+    """ The rgb coordinates of every grid point, red changing fastest. """
+    if size == EXACT_SIZE:
+        return [(r, g, b) for b, g, r in product(range(size), repeat=3)]
+    steps = [i / (size - 1) for i in range(size)]
+    return [(r, g, b) for b, g, r in product(steps, repeat=3)]
+
+
+class ColorLUT:
+    """ A color transform sampled on a ``size``³ grid over the rgb cube.
+
+    Grid values are float rgb channels, or 8-bit rgb values for the exact
+    table of size 256.
+    """
+    __slots__ = ("_size", "_table", "title")
+
+    def __init__(self, table, size: int, title: Optional[str] = None):
+        if size < 2:
+            raise ValueError("A LUT needs at least 2 points per axis")
+        if len(table) != size ** 3 * (3 if not _is_numpy(table) else 1):
+            raise ValueError(f"Table must hold {size ** 3} colors")
+        self._size = size
+        self._table = table
+        self.title = title
+
+    @classmethod
+    def from_function(cls, func: Callable, size: int = 33, batch: bool = False) -> ColorLUT:
+        """Sample ``func`` on a ``size``³ grid, usually 17, 33 or 65 points per axis, or 256.
+
+        ``func`` is called with every grid point as an RGBFloatColor (RGBColor
+        for size 256) and may return any color. With ``batch`` it is called once
+        with a ColorArray of the whole grid and returns a ColorArray, which is
+        much faster for functions built on :func:`colors.blend.blend`.
+        """
+        if size < 2:
+            raise ValueError("A LUT needs at least 2 points per axis")
+        exact = size == EXACT_SIZE
+        space = "rgb" if exact else "float"
+        if batch:
+            if np is not None:
+                steps = np.arange(size, dtype=np.float64) / (1 if exact else size - 1)
+                b, g, r = np.meshgrid(steps, steps, steps, indexing="ij")
+                grid = ColorArray.from_buffer(np.stack((r.ravel(), g.ravel(), b.ravel()), axis=1), space)
+            else:
+                grid = ColorArray(_grid(size), space)
+            data = func(grid).to(space).data
+        else:
+            cls_ = RGBColor if exact else RGBFloatColor
+            colors = (func(cls_._from_channels(point))._channels(space) for point in _grid(size))
+            if np is not None:
+                data = np.array(list(colors), dtype=np.float64)
+            else:
+                data = array("d", [c for color in colors for c in color])
+        if exact:
+            data = np.asarray(data, dtype=np.uint8) if _is_numpy(data) else bytearray(map(int, data))
+        return cls(data, size)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def exact(self) -> bool:
+        """ Whether this is the table over every 8-bit rgb value. """
+        return self._size == EXACT_SIZE
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._size}x{self._size}x{self._size}>"
+
+    def __len__(self) -> int:
+        return self._size ** 3
+
+    def _point(self, index: int) -> tuple:
+        if _is_numpy(self._table):
+            return tuple(self._table[index].tolist())
+        return tuple(self._table[index * 3:index * 3 + 3])
+
+    def _lookup(self, r: float, g: float, b: float, interpolation: str) -> tuple:
+        """ Interpolated float channels, or 8-bit rgb for exact tables, at one rgb point. """
+        size = self._size
+        if self.exact:
+            r, g, b = (min(255, max(0, round(c * 255))) for c in (r, g, b))
+            return self._point((b * size + g) * size + r)
+        index, frac = [], []
+        for c in (r, g, b):
+            c = min(1.0, max(0.0, c)) * (size - 1)
+            i = min(int(c), size - 2)
+            index.append(i)
+            frac.append(c - i)
+        strides = (1, size, size * size)
+        origin = sum(i * s for i, s in zip(index, strides))
+        if interpolation == "trilinear":
+            result = [0.0, 0.0, 0.0]
+            for corner in product((0, 1), repeat=3):
+                weight = 1.0
+                for bit, f in zip(corner, frac):
+                    weight *= f if bit else 1 - f
+                point = self._point(origin + sum(bit * s for bit, s in zip(corner, strides)))
+                result = [x + weight * p for x, p in zip(result, point)]
+            return tuple(result)
+        # Tetrahedral: walk from the origin corner along the axes in order of
+        # decreasing fraction, weighting each vertex by the drop in fraction.
+        order = sorted(range(3), key=frac.__getitem__, reverse=True)
+        fractions = [1.0] + [frac[axis] for axis in order] + [0.0]
+        result = [0.0, 0.0, 0.0]
+        vertex = origin
+        for step in range(4):
+            if step:
+                vertex += strides[order[step - 1]]
+            weight = fractions[step] - fractions[step + 1]
+            result = [x + weight * p for x, p in zip(result, self._point(vertex))]
+        return tuple(result)
+
+    def __call__(self, color: Color, interpolation: str = "tetrahedral") -> Color:
+        """ Apply the table to a single color, returning the same color type with the same alpha. """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation {interpolation!r}")
+        values = self._lookup(*color._channels("float"), interpolation)
+        channels = _route("rgb" if self.exact else "float", color._space)(values)
+        if isinstance(color, _AlphaColor):
+            return color._from_channels(channels, color.alpha)
+        return color._from_channels(channels)
+
+    def apply(self, colors: ColorArray, interpolation: str = "tetrahedral",
+              out: Optional[ColorArray] = None) -> ColorArray:
+        """ Apply the table to every color of an array, keeping its color space. """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Unknown interpolation {interpolation!r}")
+        space = "rgb" if self.exact else "float"
+        data = colors.float.data
+        if _is_numpy(data):
+            result = self._np_apply(data, interpolation)
+        else:
+            it = iter(data)
+            lookup = self._lookup
+            result = array("d", [c for p in zip(it, it, it) for c in lookup(*p, interpolation)])
+        return ColorArray.from_buffer(result, space).to(colors.space, out=out)
+
+    def _np_apply(self, data, interpolation: str):
+        size = self._size
+        table = np.asarray(self._table).reshape(-1, 3)
+        if self.exact:
+            rgb = np.clip(np.round(data * 255), 0, 255).astype(np.intp)
+            return table[(rgb[:, 2] * size + rgb[:, 1]) * size + rgb[:, 0]].astype(np.float64)
+        scaled = np.clip(data, 0.0, 1.0) * (size - 1)
+        index = np.minimum(scaled.astype(np.intp), size - 2)
+        frac = scaled - index
+        strides = np.array([1, size, size * size], dtype=np.intp)
+        origin = index @ strides
+        result = np.zeros_like(data)
+        if interpolation == "trilinear":
+            for corner in product((0, 1), repeat=3):
+                weight = np.ones(len(data))
+                for axis, bit in enumerate(corner):
+                    weight *= frac[:, axis] if bit else 1 - frac[:, axis]
+                result += weight[:, None] * table[origin + np.dot(corner, strides)]
+            return result
+        order = np.argsort(-frac, axis=1, kind="stable")
+        fractions = np.take_along_axis(frac, order, axis=1)
+        fractions = np.hstack((np.ones((len(data), 1)), fractions, np.zeros((len(data), 1))))
+        vertex = origin.copy()
+        for step in range(4):
+            if step:
+                vertex += strides[order[:, step - 1]]
+            weight = fractions[:, step] - fractions[:, step + 1]
+            result += weight[:, None] * table[vertex]
+        return result
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """ Write the table as a ``.cube`` file. """
+        scale = 255 if self.exact else 1
+        data = self._table.reshape(-1).tolist() if _is_numpy(self._table) else self._table
+        with open(path, "w", encoding="utf-8") as f:
+            if self.title is not None:
+                f.write(f'TITLE "{self.title}"\n')
+            f.write(f"LUT_3D_SIZE {self._size}\n")
+            it = iter(data)
+            f.writelines("%.6f %.6f %.6f\n" % (r / scale, g / scale, b / scale) for r, g, b in zip(it, it, it))
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> ColorLUT:
+        """ Read a 3D ``.cube`` file. Only the default 0 to 1 domain is supported. """
+        size = title = None
+        values = array("d")
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                keyword, _, rest = line.partition(" ")
+                if keyword == "TITLE":
+                    title = rest.strip().strip('"')
+                elif keyword == "LUT_3D_SIZE":
+                    size = int(rest)
+                elif keyword in ("DOMAIN_MIN", "DOMAIN_MAX"):
+                    if [float(v) for v in rest.split()] != [0.0 if keyword == "DOMAIN_MIN" else 1.0] * 3:
+                        raise ValueError(f"Unsupported {keyword} {rest}")
+                elif keyword == "LUT_3D_INPUT_RANGE":
+                    if [float(v) for v in rest.split()] != [0.0, 1.0]:
+                        raise ValueError(f"Unsupported {keyword} {rest}")
+                elif keyword in ("LUT_1D_SIZE", "LUT_1D_INPUT_RANGE"):
+                    raise ValueError("1D LUTs are not supported")
+                elif keyword[0].isalpha() or keyword[0] == "_":
+                    # Other keywords, such as a vendor's, don't change the table
+                    continue
+                else:
+                    values.extend(map(float, line.split()))
+        if size is None:
+            raise ValueError("Missing LUT_3D_SIZE")
+        if len(values) != size ** 3 * 3:
+            raise ValueError(f"Expected {size ** 3} colors, got {len(values) // 3}")
+        if size == EXACT_SIZE:
+            values = bytearray(round(v * 255) for v in values)
+            table = np.frombuffer(values, dtype=np.uint8).reshape(-1, 3) if np is not None else values
+        else:
+            table = np.frombuffer(values, dtype=np.float64).reshape(-1, 3) if np is not None else values
+        return cls(table, size, title)
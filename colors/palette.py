@@ -0,0 +1,180 @@
+"""
+colors.palette
+==============
+Nearest named color lookups over a set of named colors, such as the constants
+in :mod:`colors.w3c`, :mod:`colors.rainbow` and :mod:`colors.primary`.
+
+Distances are squared euclidean distances between 8-bit rgb values. Answers
+are memoized in a lookup table over the whole 8-bit cube, so every distinct
+rgb value is only searched once. Misses are answered through a coarse grid
+that narrows the search down to the few colors that can be nearest in a cell.
+"""
+from __future__ import annotations
+import heapq
+from array import array
+from operator import add
+from typing import NamedTuple
+
+from .array import ColorArray, np, _is_numpy
+from .base import Color
+
+__all__ = ("Palette", "PaletteEntry")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+    from typing import Iterable, List, Mapping, Union
+
+# Grid cells are _CELL wide along each axis of the 8-bit cube.
+_CELL = 8
+_CELLS = 256 // _CELL
+
+
+class PaletteEntry(NamedTuple):
+    name: str
+    color: Color
+
+
+class Palette:
+    """ A collection of named colors answering nearest color queries.
+
+    Names are unique, when a name is given more than once the first color wins.
+    Colors that are equally near are returned in palette order.
+    """
+
+    def __init__(self, colors: Union[Mapping[str, Color], Iterable[tuple]]):
+        if hasattr(colors, "items"):
+            colors = colors.items()
+        entries = {}
+        for name, color in colors:
+            entries.setdefault(name, PaletteEntry(name, color))
+        if not entries:
+            raise ValueError("A palette needs at least one color")
+        self._entries = list(entries.values())
+        self._names = {entry.name: entry for entry in self._entries}
+        self._rgb = [entry.color._channels("rgb") for entry in self._entries]
+        # Per axis and cell coordinate, the squared distance of every color to
+        # the nearest and the farthest side of the cell along that axis.
+        self._near = []
+        self._far = []
+        for axis in range(3):
+            values = [rgb[axis] for rgb in self._rgb]
+            cells = [(c * _CELL, c * _CELL + _CELL - 1) for c in range(_CELLS)]
+            self._near.append([[max(lo - v, 0, v - hi) ** 2 for v in values] for lo, hi in cells])
+            self._far.append([[max(v - lo, hi - v) ** 2 for v in values] for lo, hi in cells])
+        self._cells = {}
+        self._lut = None
+
+    @classmethod
+    def from_modules(cls, *modules: ModuleType) -> Palette:
+        """ A palette of every public color constant of the given modules, e.g. ``colors.w3c``. """
+        def constants(module):
+            for name in dir(module):
+                value = getattr(module, name)
+                if not name.startswith("_") and isinstance(value, Color):
+                    yield name, value
+        return cls([item for module in modules for item in constants(module)])
+
+    @property
+    def entries(self) -> List[PaletteEntry]:
+        return list(self._entries)
+
+    def __getitem__(self, name: str) -> PaletteEntry:
+        return self._names[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {len(self)} colors>"
+
+    def _candidates(self, cell: tuple) -> list:
+        """ Indices of the colors that can be nearest to some point of a grid cell. """
+        try:
+            return self._cells[cell]
+        except KeyError:
+            pass
+        x, y, z = cell
+        near, far = self._near, self._far
+        nearest = map(add, map(add, near[0][x], near[1][y]), near[2][z])
+        bound = min(map(add, map(add, far[0][x], far[1][y]), far[2][z]))
+        candidates = self._cells[cell] = [i for i, d in enumerate(nearest) if d <= bound]
+        return candidates
+
+    def _search(self, r: int, g: int, b: int) -> int:
+        best = best_index = None
+        for i in self._candidates((r // _CELL, g // _CELL, b // _CELL)):
+            pr, pg, pb = self._rgb[i]
+            d = (pr - r) ** 2 + (pg - g) ** 2 + (pb - b) ** 2
+            if best is None or d < best:
+                best, best_index = d, i
+        return best_index
+
+    def _table(self) -> array:
+        """ The lookup table over the 8-bit cube, -1 marks values not searched yet. """
+        if self._lut is None:
+            self._lut = array("h" if len(self) < 2 ** 15 else "i", [-1]) * (1 << 24)
+        return self._lut
+
+    def _index(self, r: int, g: int, b: int) -> int:
+        lut = self._table()
+        key = r << 16 | g << 8 | b
+        index = lut[key]
+        if index < 0:
+            index = lut[key] = self._search(r, g, b)
+        return index
+
+    def nearest(self, color: Color, k: int = 1) -> Union[PaletteEntry, List[PaletteEntry]]:
+        """ The entry nearest to ``color``, or a list of the ``k`` nearest entries when ``k > 1``. """
+        r, g, b = color._channels("rgb")
+        if k == 1:
+            return self._entries[self._index(r, g, b)]
+        distances = (((pr - r) ** 2 + (pg - g) ** 2 + (pb - b) ** 2, i) for i, (pr, pg, pb) in enumerate(self._rgb))
+        return [self._entries[i] for _, i in heapq.nsmallest(k, distances)]
+
+    def nearest_indices(self, colors: ColorArray):
+        """ Index of the nearest entry for every color of an array.
+
+        Returns an int array with NumPy, an ``array`` otherwise.
+        """
+        rgb = colors.rgb.data
+        lut = self._table()
+        if _is_numpy(rgb):
+            table = np.frombuffer(lut, dtype=np.int16 if lut.typecode == "h" else np.int32)
+            rgb = rgb.astype(np.int64)
+            keys = rgb[:, 0] << 16 | rgb[:, 1] << 8 | rgb[:, 2]
+            indices = table[keys]
+            missing = np.unique(keys[indices < 0])
+            if len(missing):
+                table[missing] = self._search_many(missing)
+                indices = table[keys]
+            return indices
+        it = map(int, rgb)
+        return array(lut.typecode, [self._index(r, g, b) for r, g, b in zip(it, it, it)])
+
+    def _search_many(self, keys):
+        """ Brute force nearest search over packed rgb keys, in chunks to bound memory. """
+        palette = np.array(self._rgb, dtype=np.int64)
+        result = np.empty(len(keys), dtype=np.int64)
+        chunk = max(1, (1 << 20) // len(palette))
+        for start in range(0, len(keys), chunk):
+            part = keys[start:start + chunk]
+            rgb = np.stack((part >> 16, part >> 8 & 0xff, part & 0xff), axis=1)
+            distances = ((rgb[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+            result[start:start + chunk] = distances.argmin(axis=1)
+        return result
+
+    def nearest_many(self, colors: ColorArray) -> List[PaletteEntry]:
+        """ The nearest entry for every color of an array. """
+        entries = self._entries
+        indices = self.nearest_indices(colors)
+        if _is_numpy(indices):
+            indices = indices.tolist()
+        return [entries[i] for i in indices]
@@ -0,0 +1,242 @@
+"""
+colors.parallel
+===============
+Splitting large batch conversions and blends across several workers.
+
+:meth:`ColorArray.to <colors.array.ColorArray.to>` and
+:func:`colors.blend.blend` accept ``workers=`` (a number of processes from a
+shared pool) or ``executor=`` (any :class:`concurrent.futures.Executor`).
+With a process pool the colors are placed in
+:mod:`multiprocessing.shared_memory`, every worker reads its own rows from
+there and writes its results back, so only the block names and row ranges are
+pickled. Arrays made by :func:`shared_array` already live in shared memory and
+are used in place, as inputs or as ``out=``, instead of being copied in and
+out. On Python 3.7, which lacks shared memory, the rows are pickled
+to the workers instead. Other executors,
+such as a thread pool, work on views of the arrays directly.
+
+Arrays smaller than :data:`PARALLEL_THRESHOLD` colors are always processed in
+the calling thread, where splitting them costs more than it saves.
+"""
+from __future__ import annotations
+import atexit
+import os
+import traceback
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover - Python 3.7
+    shared_memory = None
+
+from . import array as _array
+from .array import ColorArray, _is_numpy
+
+__all__ = ("PARALLEL_THRESHOLD", "get_executor", "map_chunks", "shared_array", "shutdown")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Callable, Iterator, Optional, Sequence
+
+#: Arrays with fewer colors than this are never split.
+PARALLEL_THRESHOLD = 1 << 18
+
+# Chunks are at least this many colors, and there are about four per worker.
+_MIN_CHUNK = 1 << 14
+_CHUNKS_PER_WORKER = 4
+
+_pools = {}
+# Shared memory block names of the live shared_array buffers, by buffer id.
+_segments = {}
+
+
+def get_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """ The shared process pool with ``workers`` processes, one per core by default. """
+    workers = workers or os.cpu_count() or 1
+    try:
+        return _pools[workers]
+    except KeyError:
+        pool = _pools[workers] = ProcessPoolExecutor(workers)
+        return pool
+
+
+def shutdown() -> None:
+    """ Shut down the shared process pools. They are started again on demand. """
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown()
+
+
+atexit.register(shutdown)
+
+
+def _resolve(size: int, executor: Optional[Executor], workers: Optional[int]) -> Optional[Executor]:
+    """ The executor to split ``size`` colors over, or None to stay in the calling thread. """
+    if executor is not None and workers is not None:
+        raise TypeError("Pass either executor or workers, not both")
+    if size < PARALLEL_THRESHOLD:
+        return None
+    if workers is not None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        return None if workers == 1 else get_executor(workers)
+    return executor
+
+
+def _chunks(size: int, workers: int) -> list:
+    step = max(_MIN_CHUNK, -(-size // (workers * _CHUNKS_PER_WORKER)))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _view(buffer, numpy: bool, start: int, stop: int):
+    """ Rows ``start:stop`` of a shared block of float64 colors. """
+    if numpy:
+        # Unlike ndarray(buffer=...), frombuffer keeps the buffer exported, so the block cannot close under it.
+        data = _array.np.frombuffer(buffer, _array.np.float64, (stop - start) * 3, start * 24)
+        return data.reshape(stop - start, 3)
+    return memoryview(buffer).cast("d")[start * 3:stop * 3]
+
+
+def _convert_chunk(colors: ColorArray, space: str) -> ColorArray:
+    return colors.to(space)
+
+
+def _rows(colors: ColorArray, start: int, stop: int) -> ColorArray:
+    data = colors.data[start * 3:stop * 3] if not _is_numpy(colors.data) else colors.data[start:stop]
+    return ColorArray.from_buffer(data, colors.space)
+
+
+def _store(out: ColorArray, result: ColorArray, start: int, stop: int) -> None:
+    if _is_numpy(out.data):
+        out.data[start:stop] = result.data
+    else:
+        out.data[start * 3:stop * 3] = result.data
+
+
+def _run(func: Callable, inputs: Sequence[ColorArray], out: ColorArray, args: tuple, start: int, stop: int) -> None:
+    """ Apply ``func`` to rows ``start:stop`` of ``inputs``, writing them into ``out``. """
+    _store(out, func(*(_rows(colors, start, stop) for colors in inputs), *args), start, stop)
+
+
+def _run_shared(func: Callable, inputs: Sequence[tuple], out: str, numpy: bool, args: tuple,
+                start: int, stop: int) -> None:
+    """ Like :func:`_run` in a worker process, on arrays held in shared memory blocks. """
+    blocks = [shared_memory.SharedMemory(name) for name, _ in inputs]
+    target = shared_memory.SharedMemory(out)
+    chunks = view = None
+    try:
+        # array('d') cannot wrap shared memory, so only NumPy reads the rows in place.
+        chunks = [ColorArray.from_buffer(_view(block.buf, True, start, stop) if numpy else
+                                         array("d", _view(block.buf, False, start, stop)), space)
+                  for block, (_, space) in zip(blocks, inputs)]
+        view = _view(target.buf, numpy, start, stop)
+        result = func(*chunks, *args).data
+        view[:] = result if numpy else memoryview(result)
+    except BaseException as error:
+        # The traceback holds the chunks, and the blocks cannot close while they are viewed.
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        chunks = view = None
+        for block in blocks + [target]:
+            block.close()
+
+
+def _share(colors: ColorArray) -> shared_memory.SharedMemory:
+    data = colors.data
+    block = shared_memory.SharedMemory(create=True, size=max(1, len(colors) * 24))
+    if _is_numpy(data):
+        _view(block.buf, True, 0, len(colors))[:] = data
+    else:
+        memoryview(block.buf).cast("d")[:len(data)] = data
+    return block
+
+
+@contextmanager
+def shared_array(size: int, space: str = "rgb") -> Iterator[ColorArray]:
+    """Allocate a zero filled array of ``size`` colors in shared memory for the ``with`` block.
+
+    Process pools use it in place as an input or as ``out=`` instead of copying
+    the colors into shared memory and back. Leaving the block frees the memory
+    and empties the array, so copy out anything needed afterwards and keep no
+    views of its data. Without NumPy, or on Python 3.7, this is an ordinary array.
+    """
+    if shared_memory is None or _array.np is None:
+        yield ColorArray.empty(size, space)
+        return
+    block = shared_memory.SharedMemory(create=True, size=max(1, size * 24))
+    colors = ColorArray.from_buffer(_view(block.buf, True, 0, size), space)
+    _segments[id(colors.data)] = block.name
+    try:
+        yield colors
+    finally:
+        del _segments[id(colors.data)]
+        colors._data = _array._empty(0)
+        block.close()
+        block.unlink()
+
+
+def map_chunks(func: Callable, inputs: Sequence[ColorArray], space: str, executor: Executor, args: tuple = (),
+               out: Optional[ColorArray] = None, workers: Optional[int] = None) -> ColorArray:
+    """Compute ``func(*chunks, *args)`` over row ranges of ``inputs`` on ``executor``.
+
+    ``func`` must be a module level function returning a ColorArray in
+    ``space`` with one color per input row. The results are written into
+    ``out``, or a new array, which is returned. The rows are split for
+    ``workers`` workers, one per core by default.
+    """
+    size = len(inputs[0])
+    if out is None:
+        out = ColorArray.empty(size, space)
+    chunks = _chunks(size, workers or os.cpu_count() or 1)
+    if not isinstance(executor, ProcessPoolExecutor):
+        futures = [executor.submit(_run, func, inputs, out, args, start, stop) for start, stop in chunks]
+        for future in futures:
+            future.result()
+        out._space = space
+        return out
+    if shared_memory is None:
+        futures = [(start, stop, executor.submit(func, *(_rows(colors, start, stop) for colors in inputs), *args))
+                   for start, stop in chunks]
+        for start, stop, future in futures:
+            _store(out, future.result(), start, stop)
+        out._space = space
+        return out
+
+    numpy = _is_numpy(out.data)
+    blocks = []
+    try:
+        shared = []
+        for colors in inputs:
+            name = _segments.get(id(colors.data))
+            if name is None:
+                blocks.append(_share(colors))
+                name = blocks[-1].name
+            shared.append((name, colors.space))
+        target = _segments.get(id(out.data))
+        if target is None:
+            blocks.append(shared_memory.SharedMemory(create=True, size=max(1, size * 24)))
+            copy = blocks[-1]
+            target = copy.name
+        else:
+            copy = None
+        futures = [executor.submit(_run_shared, func, shared, target, numpy, args, start, stop)
+                   for start, stop in chunks]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+        if copy is not None and numpy:
+            out.data[:] = _view(copy.buf, True, 0, size)
+        elif copy is not None:
+            out.data[:] = array("d", memoryview(copy.buf).cast("d")[:size * 3])
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    out._space = space
+    return out
@@ -2,10 +2,16 @@
 colors.primary
 ==============
 """
-from .base import RGBColor
+from .base import _palette_module
 
-black = RGBColor(0, 0, 0)
-white = RGBColor(255, 255, 255)
-red = RGBColor(255, 0, 0)
-green = RGBColor(0, 255, 0)
-blue = RGBColor(0, 0, 255)
+# Packed 24-bit rgb value of every color, the RGBColor constants are created on first use.
+_TABLE = {
+    "black": 0x000000,
+    "white": 0xffffff,
+    "red": 0xff0000,
+    "green": 0x00ff00,
+    "blue": 0x0000ff,
+}
+
+__all__ = tuple(_TABLE)
+__getattr__, __dir__ = _palette_module(globals(), _TABLE)
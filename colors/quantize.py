@@ -0,0 +1,382 @@
+"""
+colors.quantize
+===============
+Extract a palette of the most representative colors of an image.
+
+The pixels are read in a single pass, one chunk at a time, so a large image
+never has to be held in memory at once, let alone as color objects. Every
+chunk is subsampled and added to a histogram of the rgb cube at ``bits`` bits
+per channel, which also sums the exact channels falling into every bin. The
+palette is built with one of :data:`METHODS`:
+
+``"median_cut"``
+    Repeatedly splits the box of histogram colors with the largest spread in
+    two along its most spread out channel.
+``"octree"``
+    Builds an octree over the rgb cube from the histogram and merges the least
+    populated nodes of the deepest level until at most ``n`` leaves are left.
+``"kmeans"``
+    Mini-batch k-means in OKLab. Every chunk contributes a random batch of
+    pixels pulling the nearest centers towards it, then a few Lloyd iterations
+    over the histogram refine the centers.
+
+Population counts are numbers of sampled pixels.
+"""
+from __future__ import annotations
+import heapq
+import random as random_
+from collections import Counter
+from operator import itemgetter
+from typing import NamedTuple
+
+from .array import ColorArray, np, _is_numpy
+from .base import Color, _route
+from .blend import LAYOUTS
+from .distance import nearest
+
+__all__ = ("METHODS", "Swatch", "quantize")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, List, Optional, Union
+
+#: Names of the quantization methods.
+METHODS = frozenset(("median_cut", "octree", "kmeans"))
+
+#: Default number of pixels read at a time.
+CHUNK_SIZE = 1 << 20
+
+# Lloyd iterations over the histogram after the mini-batch pass.
+_KMEANS_ITERATIONS = 4
+
+
+class Swatch(NamedTuple):
+    color: Color
+    count: int
+
+
+def _sampled(pixels, layout: str, chunk_size: int, subsample: int) -> Iterator[tuple]:
+    """ The red, green and blue 8-bit values of the sampled pixels, three sequences per chunk. """
+    if isinstance(pixels, ColorArray):
+        data = pixels.data
+        numpy = _is_numpy(data)
+        for start in range(0, len(pixels), chunk_size):
+            stop = min(start + chunk_size, len(pixels))
+            chunk = data[start:stop] if numpy else data[start * 3:stop * 3]
+            rgb = ColorArray.from_buffer(chunk, pixels.space).rgb.data
+            if numpy:
+                rgb = rgb[::subsample].astype(np.intp)
+                yield rgb[:, 0], rgb[:, 1], rgb[:, 2]
+            else:
+                step = 3 * subsample
+                yield [int(c) for c in rgb[0::step]], [int(c) for c in rgb[1::step]], \
+                    [int(c) for c in rgb[2::step]]
+        return
+    if np is not None and isinstance(pixels, np.ndarray):
+        if pixels.dtype != np.uint8:
+            raise TypeError(f"Pixel arrays must be uint8, not {pixels.dtype}")
+        pixels = np.ascontiguousarray(pixels)
+    try:
+        view = memoryview(pixels)
+    except TypeError:
+        if isinstance(pixels, str) or not hasattr(pixels, "__iter__"):
+            raise TypeError(f"Cannot read pixels from {type(pixels).__name__}") from None
+        # An iterable of chunks
+        for chunk in pixels:
+            yield from _sampled(chunk, layout, chunk_size, subsample)
+        return
+    if view.format.lstrip("@=<>!") not in ("B", "c"):
+        raise TypeError(f"Pixel buffers must hold unsigned bytes, not {view.format!r} items")
+    view = view.cast("B")
+    channels = LAYOUTS[layout]
+    if len(view) % channels:
+        raise ValueError(f"Buffer size must be a multiple of {channels} for the {layout!r} layout")
+    step = chunk_size * channels
+    for start in range(0, len(view), step):
+        chunk = view[start:start + step]
+        if np is not None:
+            rgb = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, channels)[::subsample]
+            if channels == 4:
+                # Fully transparent pixels have no color
+                rgb = rgb[rgb[:, 3] != 0]
+            yield rgb[:, 0].astype(np.intp), rgb[:, 1].astype(np.intp), rgb[:, 2].astype(np.intp)
+            continue
+        chunk = bytes(chunk)
+        stride = channels * subsample
+        r, g, b = chunk[0::stride], chunk[1::stride], chunk[2::stride]
+        if channels == 4:
+            visible = [i for i, a in enumerate(chunk[3::stride]) if a]
+            if len(visible) != len(r):
+                r, g, b = bytes(r[i] for i in visible), bytes(g[i] for i in visible), bytes(b[i] for i in visible)
+        yield r, g, b
+
+
+class _Histogram:
+    """ Pixel counts and channel sums over the rgb cube at ``bits`` bits per channel. """
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self._shift = 8 - bits
+        if np is not None:
+            self._counts = np.zeros(1 << 3 * bits, dtype=np.int64)
+            self._sums = np.zeros((3, 1 << 3 * bits), dtype=np.float64)
+        else:
+            self._bins = {}
+
+    def add(self, r, g, b) -> None:
+        shift, bits = self._shift, self.bits
+        if np is not None:
+            index = (r >> shift) << 2 * bits | (g >> shift) << bits | (b >> shift)
+            size = len(self._counts)
+            self._counts += np.bincount(index, minlength=size)
+            for sums, channel in zip(self._sums, (r, g, b)):
+                sums += np.bincount(index, weights=channel, minlength=size)
+            return
+        bins = self._bins
+        for (cr, cg, cb), count in Counter(zip(r, g, b)).items():
+            key = (cr >> shift) << 2 * bits | (cg >> shift) << bits | (cb >> shift)
+            values = bins.get(key)
+            if values is None:
+                bins[key] = [count, cr * count, cg * count, cb * count]
+            else:
+                values[0] += count
+                values[1] += cr * count
+                values[2] += cg * count
+                values[3] += cb * count
+
+    def points(self) -> list:
+        """ ``(count, r, g, b)`` of every occupied bin, with the mean 8-bit channels of its pixels. """
+        if np is not None:
+            occupied = np.flatnonzero(self._counts)
+            counts = self._counts[occupied]
+            means = self._sums[:, occupied] / counts
+            return list(zip(counts.tolist(), *means.tolist()))
+        return [(count, r / count, g / count, b / count) for count, r, g, b in
+                (self._bins[key] for key in sorted(self._bins))]
+
+
+def _mean(points: list) -> tuple:
+    total = sum(p[0] for p in points)
+    return total, tuple(sum(p[0] * p[axis] for p in points) / total for axis in (1, 2, 3))
+
+
+def _median_cut(points: list, n: int) -> list:
+    """``(count, rgb)`` of every box.
+
+    Instead of the plain weighted median, which cuts a dominant cluster in
+    half, a box is split where the squared error of the two halves along the
+    channel is least, and the box with the largest squared error is split first.
+    """
+    def entry(box):
+        total = sum(p[0] for p in box)
+        errors = [sum(p[0] * p[axis] ** 2 for p in box) - sum(p[0] * p[axis] for p in box) ** 2 / total
+                  for axis in (1, 2, 3)]
+        error = max(errors)
+        # heapq pops the smallest, a box without error is a single color
+        return -error if error > 1e-9 else 0.0, id(box), errors.index(error) + 1, box
+
+    heap = [entry(points)]
+    done = []
+    while heap and len(heap) + len(done) < n:
+        score, _, axis, box = heapq.heappop(heap)
+        if not score:
+            done.append(box)
+            continue
+        box.sort(key=itemgetter(axis))
+        weights = [p[0] for p in box]
+        values = [p[axis] for p in box]
+        total_w = sum(weights)
+        total_s = sum(w * v for w, v in zip(weights, values))
+        total_q = sum(w * v * v for w, v in zip(weights, values))
+        best, split = None, 1
+        w = s = q = 0.0
+        for i in range(len(box) - 1):
+            w += weights[i]
+            s += values[i] * weights[i]
+            q += values[i] * values[i] * weights[i]
+            error = q - s * s / w + (total_q - q) - (total_s - s) ** 2 / (total_w - w)
+            if best is None or error < best:
+                best, split = error, i + 1
+        heapq.heappush(heap, entry(box[:split]))
+        heapq.heappush(heap, entry(box[split:]))
+    return [_mean(box) for box in done + [item[-1] for item in heap]]
+
+
+def _octree(points: list, n: int, bits: int) -> list:
+    """ ``(count, rgb)`` of every leaf. """
+    # Leaves keyed by depth and the position of their cell at that depth, with
+    # the count and channel sums of their pixels.
+    leaves = {}
+    for count, r, g, b in points:
+        shift = 8 - bits
+        leaves[(bits, int(r) >> shift, int(g) >> shift, int(b) >> shift)] = [count, r * count, g * count, b * count]
+    for depth in range(bits, 0, -1):
+        if len(leaves) <= n:
+            break
+        children = {}
+        for key in leaves:
+            if key[0] == depth:
+                children.setdefault((depth - 1, key[1] >> 1, key[2] >> 1, key[3] >> 1), []).append(key)
+        heap = [(sum(leaves[key][0] for key in keys), parent) for parent, keys in children.items()]
+        heapq.heapify(heap)
+        while heap and len(leaves) > n:
+            _, parent = heapq.heappop(heap)
+            merged = [0, 0.0, 0.0, 0.0]
+            for key in children[parent]:
+                merged = [a + b for a, b in zip(merged, leaves.pop(key))]
+            leaves[parent] = merged
+    return [(count, (r / count, g / count, b / count)) for count, r, g, b in leaves.values()]
+
+
+def _weighted_sums(data, labels, weights, k: int) -> tuple:
+    """ Per label, the total weight and the weighted sum of the rows of ``data``. """
+    if _is_numpy(data):
+        labels = np.asarray(labels)
+        totals = np.bincount(labels, weights=weights, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=data[:, c] * weights, minlength=k) for c in range(3)], axis=1)
+        return totals.tolist(), sums.tolist()
+    totals = [0.0] * k
+    sums = [[0.0, 0.0, 0.0] for _ in range(k)]
+    for i, (label, weight) in enumerate(zip(labels, weights)):
+        totals[label] += weight
+        row = sums[label]
+        row[0] += data[i * 3] * weight
+        row[1] += data[i * 3 + 1] * weight
+        row[2] += data[i * 3 + 2] * weight
+    return totals, sums
+
+
+class _MiniBatchKMeans:
+    """ Online k-means in OKLab, updated with one batch of pixels per chunk. """
+
+    def __init__(self, n: int, batch_size: int, seed: Optional[int]):
+        self._n = n
+        self._batch_size = batch_size
+        self._random = random_.Random(seed)
+        self.centers = None
+        self._seen = None
+
+    def _init_centers(self, batch: list) -> None:
+        """ k-means++ seeding from the distinct colors of the first batch. """
+        batch = list(dict.fromkeys(batch))
+        colors = ColorArray(batch, "oklab")
+        centers = [self._random.choice(batch)]
+        weights = None
+        while len(centers) < min(self._n, len(batch)):
+            # Squared distance of every color to its nearest center so far
+            distances = nearest(colors, ColorArray(centers[-1:], "oklab"), metric="oklab")[1]
+            new = [d * d for d in distances]
+            weights = new if weights is None else list(map(min, weights, new))
+            if not any(weights):
+                break
+            centers.append(self._random.choices(batch, weights)[0])
+        self.centers = centers
+        self._seen = [0] * len(centers)
+
+    def partial_fit(self, r, g, b) -> None:
+        size = len(r)
+        if not size:
+            return
+        picks = self._random.sample(range(size), min(size, self._batch_size))
+        if _is_numpy(r):
+            picks = np.array(picks, dtype=np.intp)
+            rgb = np.stack((r[picks], g[picks], b[picks]), axis=1).astype(np.float64)
+            batch = ColorArray.from_buffer(rgb, "rgb").oklab
+        else:
+            batch = ColorArray([(r[i], g[i], b[i]) for i in picks], "rgb").oklab
+        if self.centers is None:
+            self._init_centers(batch.tolist())
+            return
+        centers = ColorArray(self.centers, "oklab")
+        labels = nearest(batch, centers, metric="oklab")[0]
+        counts, sums = _weighted_sums(batch.data, labels, [1.0] * len(batch), len(self.centers))
+        for i, (count, total) in enumerate(zip(counts, sums)):
+            if count:
+                # The same as moving the center towards each pixel in turn by 1 / pixels seen
+                self._seen[i] += count
+                rate = count / self._seen[i]
+                self.centers[i] = tuple(c + rate * (t / count - c) for c, t in zip(self.centers[i], total))
+
+    def refine(self, points: list) -> list:
+        """ Lloyd iterations over the histogram, ``(count, oklab)`` of every non empty center. """
+        if self.centers is None:
+            return []
+        weights = [p[0] for p in points]
+        rgb = ColorArray([p[1:] for p in points], "rgb")
+        lab = rgb.oklab
+        centers = list(self.centers)
+        for iteration in range(_KMEANS_ITERATIONS + 1):
+            labels = nearest(lab, ColorArray(centers, "oklab"), metric="oklab")[0]
+            totals, sums = _weighted_sums(lab.data, labels, weights, len(centers))
+            if iteration == _KMEANS_ITERATIONS:
+                break
+            centers = [tuple(c / total for c in row) if total else center
+                       for center, total, row in zip(centers, totals, sums)]
+        return [(int(total), tuple(c / total for c in row)) for total, row in zip(totals, sums) if total]
+
+
+class _Quantizer:
+    """ One palette extraction, fed the sampled pixels one chunk at a time. """
+
+    def __init__(self, n: int, method: str, bits: int, batch_size: int, seed: Optional[int]):
+        self.n = n
+        self.method = method
+        self.bits = bits
+        self.histogram = _Histogram(bits)
+        self.kmeans = _MiniBatchKMeans(n, batch_size, seed) if method == "kmeans" else None
+
+    def add(self, r, g, b) -> None:
+        self.histogram.add(r, g, b)
+        if self.kmeans is not None:
+            self.kmeans.partial_fit(r, g, b)
+
+    def swatches(self, space: str) -> List[Swatch]:
+        points = self.histogram.points()
+        if not points:
+            return []
+        if self.method == "median_cut":
+            found, src = _median_cut(points, self.n), "rgb"
+        elif self.method == "octree":
+            found, src = _octree(points, self.n, self.bits), "rgb"
+        else:
+            found, src = self.kmeans.refine(points), "oklab"
+        convert, cls = _route("float" if src == "rgb" else src, space), Color._types[space]
+        swatches = []
+        for count, channels in sorted(found, key=itemgetter(0), reverse=True):
+            if src == "rgb":
+                channels = [c / 255 for c in channels]
+            swatches.append(Swatch(cls._from_channels(convert(channels)), count))
+        return swatches
+
+
+def _check(n: int, method: str, layout: str, subsample: int, bits: int, chunk_size: int, space: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}")
+    if space not in Color._types:
+        raise ValueError(f"Unknown color space {space!r}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}")
+    if n < 1 or subsample < 1 or chunk_size < 1:
+        raise ValueError("n, subsample and chunk_size must be at least 1")
+    if not 1 <= bits <= 8:
+        raise ValueError("bits must be between 1 and 8")
+
+
+def quantize(pixels: Union[ColorArray, Iterable], n: int = 8, method: str = "median_cut", *,
+             layout: str = "rgb", subsample: int = 1, bits: int = 5, chunk_size: int = CHUNK_SIZE,
+             batch_size: int = 1024, seed: Optional[int] = None, space: str = "rgb") -> List[Swatch]:
+    """Extract a palette of up to ``n`` colors, most populated first.
+
+    ``pixels`` is a ColorArray, a buffer of packed 8-bit ``layout`` pixels
+    (bytes, bytearray, mmap, a uint8 ndarray, ...) in which fully transparent
+    ``"rgba"`` pixels are skipped, or an iterable of chunks of either kind.
+    Only every ``subsample``-th pixel is read. ``bits`` sets the precision of
+    the histogram, ``batch_size`` and ``seed`` the k-means batches. The colors
+    are returned in the color type of ``space``, e.g. ``"hex"`` for HexColor.
+    """
+    _check(n, method, layout, subsample, bits, chunk_size, space)
+    quantizer = _Quantizer(n, method, bits, batch_size, seed)
+    for r, g, b in _sampled(pixels, layout, chunk_size, subsample):
+        quantizer.add(r, g, b)
+    return quantizer.swatches(space)
@@ -3,12 +3,18 @@ colors.rainbow
 ==============
 ROYGBIV!
 """
-from .base import RGBColor
+from .base import _palette_module
 
-red = RGBColor(255, 0, 0)
-orange = RGBColor(255, 165, 0)
-yellow = RGBColor(255, 255, 0)
-green = RGBColor(0, 128, 0)
-blue = RGBColor(0, 0, 255)
-indigo = RGBColor(75, 0, 130)
-violet = RGBColor(238, 130, 238)
+# Packed 24-bit rgb value of every color, the RGBColor constants are created on first use.
+_TABLE = {
+    "red": 0xff0000,
+    "orange": 0xffa500,
+    "yellow": 0xffff00,
+    "green": 0x008000,
+    "blue": 0x0000ff,
+    "indigo": 0x4b0082,
+    "violet": 0xee82ee,
+}
+
+__all__ = tuple(_TABLE)
+__getattr__, __dir__ = _palette_module(globals(), _TABLE)
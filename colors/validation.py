@@ -0,0 +1,54 @@
+"""
+colors.validation
+=================
+How strictly the public color constructors check their arguments.
+
+In the default ``"strict"`` mode :class:`~colors.base.RGBColor`,
+:class:`~colors.base.HSVColor` and :class:`~colors.base.HexColor` reject out of
+range channels and RGBColor rounds and warns about non-integer channels. In
+``"quiet"`` mode the channels are still rounded and checked, so every color
+stays usable by the rest of the library, but nothing is logged, for code that
+rounds on purpose. It validates as much as strict mode and is no faster; the
+cheap path is the internal ``_from_trusted`` constructors, which conversions
+and blend results use whatever the mode.
+
+The mode is held in a :class:`~contextvars.ContextVar`, so switching it only
+affects the current thread or asyncio task. New threads start in strict mode.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+
+from . import base
+
+__all__ = ("MODES", "get_mode", "set_mode", "mode")
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+#: The validation modes.
+MODES = ("strict", "quiet")
+
+
+def get_mode() -> str:
+    return "strict" if base._strict.get() else "quiet"
+
+
+def set_mode(name: str) -> None:
+    """ Switch the validation mode of the current thread or asyncio task. """
+    if name not in MODES:
+        raise ValueError(f"Unknown validation mode {name!r}")
+    base._strict.set(name == "strict")
+
+
+@contextmanager
+def mode(name: str) -> Iterator[None]:
+    """ Use a validation mode inside a ``with`` block, restoring the previous one after. """
+    if name not in MODES:
+        raise ValueError(f"Unknown validation mode {name!r}")
+    token = base._strict.set(name == "strict")
+    try:
+        yield
+    finally:
+        base._strict.reset(token)
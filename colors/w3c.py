@@ -3,152 +3,158 @@ colors.w3c
 ==========
 Official CSS colors, scraped from: http://www.w3schools.com/tags/ref_color_tryit.asp
 """
-from .base import RGBColor
+from .base import _palette_module
 
-aliceblue = RGBColor(240, 248, 255)
-antiquewhite = RGBColor(250, 235, 215)
-aqua = RGBColor(0, 255, 255)
-aquamarine = RGBColor(127, 255, 212)
-azure = RGBColor(240, 255, 255)
-beige = RGBColor(245, 245, 220)
-bisque = RGBColor(255, 228, 196)
-black = RGBColor(0, 0, 0)
-blanchedalmond = RGBColor(255, 235, 205)
-blue = RGBColor(0, 0, 255)
-blueviolet = RGBColor(138, 43, 226)
-brown = RGBColor(165, 42, 42)
-burlywood = RGBColor(222, 184, 135)
-cadetblue = RGBColor(95, 158, 160)
-chartreuse = RGBColor(127, 255, 0)
-chocolate = RGBColor(210, 105, 30)
-coral = RGBColor(255, 127, 80)
-cornflowerblue = RGBColor(100, 149, 237)
-cornsilk = RGBColor(255, 248, 220)
-crimson = RGBColor(220, 20, 60)
-cyan = RGBColor(0, 255, 255)
-darkblue = RGBColor(0, 0, 139)
-darkcyan = RGBColor(0, 139, 139)
-darkgoldenrod = RGBColor(184, 134, 11)
-darkgray = RGBColor(169, 169, 169)
-darkgrey = RGBColor(169, 169, 169)
-darkgreen = RGBColor(0, 100, 0)
-darkkhaki = RGBColor(189, 183, 107)
-darkmagenta = RGBColor(139, 0, 139)
-darkolivegreen = RGBColor(85, 107, 47)
-darkorange = RGBColor(255, 140, 0)
-darkorchid = RGBColor(153, 50, 204)
-darkred = RGBColor(139, 0, 0)
-darksalmon = RGBColor(233, 150, 122)
-darkseagreen = RGBColor(143, 188, 143)
-darkslateblue = RGBColor(72, 61, 139)
-darkslategray = RGBColor(47, 79, 79)
-darkslategrey = RGBColor(47, 79, 79)
-darkturquoise = RGBColor(0, 206, 209)
-darkviolet = RGBColor(148, 0, 211)
-deeppink = RGBColor(255, 20, 147)
-deepskyblue = RGBColor(0, 191, 255)
-dimgray = RGBColor(105, 105, 105)
-dimgrey = RGBColor(105, 105, 105)
-dodgerblue = RGBColor(30, 144, 255)
-firebrick = RGBColor(178, 34, 34)
-floralwhite = RGBColor(255, 250, 240)
-forestgreen = RGBColor(34, 139, 34)
-fuchsia = RGBColor(255, 0, 255)
-gainsboro = RGBColor(220, 220, 220)
-ghostwhite = RGBColor(248, 248, 255)
-gold = RGBColor(255, 215, 0)
-goldenrod = RGBColor(218, 165, 32)
-gray = RGBColor(128, 128, 128)
-grey = RGBColor(128, 128, 128)
-green = RGBColor(0, 128, 0)
-greenyellow = RGBColor(173, 255, 47)
-honeydew = RGBColor(240, 255, 240)
-hotpink = RGBColor(255, 105, 180)
-indianred = RGBColor(205, 92, 92)
-indigo = RGBColor(75, 0, 130)
-ivory = RGBColor(255, 255, 240)
-khaki = RGBColor(240, 230, 140)
-lavender = RGBColor(230, 230, 250)
-lavenderblush = RGBColor(255, 240, 245)
-lawngreen = RGBColor(124, 252, 0)
-lemonchiffon = RGBColor(255, 250, 205)
-lightblue = RGBColor(173, 216, 230)
-lightcoral = RGBColor(240, 128, 128)
-lightcyan = RGBColor(224, 255, 255)
-lightgoldenrodyellow = RGBColor(250, 250, 210)
-lightgray = RGBColor(211, 211, 211)
-lightgrey = RGBColor(211, 211, 211)
-lightgreen = RGBColor(144, 238, 144)
-lightpink = RGBColor(255, 182, 193)
-lightsalmon = RGBColor(255, 160, 122)
-lightseagreen = RGBColor(32, 178, 170)
-lightskyblue = RGBColor(135, 206, 250)
-lightslategray = RGBColor(119, 136, 153)
-lightslategrey = RGBColor(119, 136, 153)
-lightsteelblue = RGBColor(176, 196, 222)
-lightyellow = RGBColor(255, 255, 224)
-lime = RGBColor(0, 255, 0)
-limegreen = RGBColor(50, 205, 50)
-linen = RGBColor(250, 240, 230)
-magenta = RGBColor(255, 0, 255)
-maroon = RGBColor(128, 0, 0)
-mediumaquamarine = RGBColor(102, 205, 170)
-mediumblue = RGBColor(0, 0, 205)
-mediumorchid = RGBColor(186, 85, 211)
-mediumpurple = RGBColor(147, 112, 219)
-mediumseagreen = RGBColor(60, 179, 113)
-mediumslateblue = RGBColor(123, 104, 238)
-mediumspringgreen = RGBColor(0, 250, 154)
-mediumturquoise = RGBColor(72, 209, 204)
-mediumvioletred = RGBColor(199, 21, 133)
-midnightblue = RGBColor(25, 25, 112)
-mintcream = RGBColor(245, 255, 250)
-mistyrose = RGBColor(255, 228, 225)
-moccasin = RGBColor(255, 228, 181)
-navajowhite = RGBColor(255, 222, 173)
-navy = RGBColor(0, 0, 128)
-oldlace = RGBColor(253, 245, 230)
-olive = RGBColor(128, 128, 0)
-olivedrab = RGBColor(107, 142, 35)
-orange = RGBColor(255, 165, 0)
-orangered = RGBColor(255, 69, 0)
-orchid = RGBColor(218, 112, 214)
-palegoldenrod = RGBColor(238, 232, 170)
-palegreen = RGBColor(152, 251, 152)
-paleturquoise = RGBColor(175, 238, 238)
-palevioletred = RGBColor(219, 112, 147)
-papayawhip = RGBColor(255, 239, 213)
-peachpuff = RGBColor(255, 218, 185)
-peru = RGBColor(205, 133, 63)
-pink = RGBColor(255, 192, 203)
-plum = RGBColor(221, 160, 221)
-powderblue = RGBColor(176, 224, 230)
-purple = RGBColor(128, 0, 128)
-red = RGBColor(255, 0, 0)
-rosybrown = RGBColor(188, 143, 143)
-royalblue = RGBColor(65, 105, 225)
-saddlebrown = RGBColor(139, 69, 19)
-salmon = RGBColor(250, 128, 114)
-sandybrown = RGBColor(244, 164, 96)
-seagreen = RGBColor(46, 139, 87)
-seashell = RGBColor(255, 245, 238)
-sienna = RGBColor(160, 82, 45)
-silver = RGBColor(192, 192, 192)
-skyblue = RGBColor(135, 206, 235)
-slateblue = RGBColor(106, 90, 205)
-slategray = RGBColor(112, 128, 144)
-slategrey = RGBColor(112, 128, 144)
-snow = RGBColor(255, 250, 250)
-springgreen = RGBColor(0, 255, 127)
-steelblue = RGBColor(70, 130, 180)
-tan = RGBColor(210, 180, 140)
-teal = RGBColor(0, 128, 128)
-thistle = RGBColor(216, 191, 216)
-tomato = RGBColor(255, 99, 71)
-turquoise = RGBColor(64, 224, 208)
-violet = RGBColor(238, 130, 238)
-wheat = RGBColor(245, 222, 179)
-white = RGBColor(255, 255, 255)
-whitesmoke = RGBColor(245, 245, 245)
-yellow = RGBColor(255, 255, 0)
-yellowgreen = RGBColor(154, 205, 50)
+# Packed 24-bit rgb value of every color, the RGBColor constants are created on first use.
+_TABLE = {
+    "aliceblue": 0xf0f8ff,
+    "antiquewhite": 0xfaebd7,
+    "aqua": 0x00ffff,
+    "aquamarine": 0x7fffd4,
+    "azure": 0xf0ffff,
+    "beige": 0xf5f5dc,
+    "bisque": 0xffe4c4,
+    "black": 0x000000,
+    "blanchedalmond": 0xffebcd,
+    "blue": 0x0000ff,
+    "blueviolet": 0x8a2be2,
+    "brown": 0xa52a2a,
+    "burlywood": 0xdeb887,
+    "cadetblue": 0x5f9ea0,
+    "chartreuse": 0x7fff00,
+    "chocolate": 0xd2691e,
+    "coral": 0xff7f50,
+    "cornflowerblue": 0x6495ed,
+    "cornsilk": 0xfff8dc,
+    "crimson": 0xdc143c,
+    "cyan": 0x00ffff,
+    "darkblue": 0x00008b,
+    "darkcyan": 0x008b8b,
+    "darkgoldenrod": 0xb8860b,
+    "darkgray": 0xa9a9a9,
+    "darkgrey": 0xa9a9a9,
+    "darkgreen": 0x006400,
+    "darkkhaki": 0xbdb76b,
+    "darkmagenta": 0x8b008b,
+    "darkolivegreen": 0x556b2f,
+    "darkorange": 0xff8c00,
+    "darkorchid": 0x9932cc,
+    "darkred": 0x8b0000,
+    "darksalmon": 0xe9967a,
+    "darkseagreen": 0x8fbc8f,
+    "darkslateblue": 0x483d8b,
+    "darkslategray": 0x2f4f4f,
+    "darkslategrey": 0x2f4f4f,
+    "darkturquoise": 0x00ced1,
+    "darkviolet": 0x9400d3,
+    "deeppink": 0xff1493,
+    "deepskyblue": 0x00bfff,
+    "dimgray": 0x696969,
+    "dimgrey": 0x696969,
+    "dodgerblue": 0x1e90ff,
+    "firebrick": 0xb22222,
+    "floralwhite": 0xfffaf0,
+    "forestgreen": 0x228b22,
+    "fuchsia": 0xff00ff,
+    "gainsboro": 0xdcdcdc,
+    "ghostwhite": 0xf8f8ff,
+    "gold": 0xffd700,
+    "goldenrod": 0xdaa520,
+    "gray": 0x808080,
+    "grey": 0x808080,
+    "green": 0x008000,
+    "greenyellow": 0xadff2f,
+    "honeydew": 0xf0fff0,
+    "hotpink": 0xff69b4,
+    "indianred": 0xcd5c5c,
+    "indigo": 0x4b0082,
+    "ivory": 0xfffff0,
+    "khaki": 0xf0e68c,
+    "lavender": 0xe6e6fa,
+    "lavenderblush": 0xfff0f5,
+    "lawngreen": 0x7cfc00,
+    "lemonchiffon": 0xfffacd,
+    "lightblue": 0xadd8e6,
+    "lightcoral": 0xf08080,
+    "lightcyan": 0xe0ffff,
+    "lightgoldenrodyellow": 0xfafad2,
+    "lightgray": 0xd3d3d3,
+    "lightgrey": 0xd3d3d3,
+    "lightgreen": 0x90ee90,
+    "lightpink": 0xffb6c1,
+    "lightsalmon": 0xffa07a,
+    "lightseagreen": 0x20b2aa,
+    "lightskyblue": 0x87cefa,
+    "lightslategray": 0x778899,
+    "lightslategrey": 0x778899,
+    "lightsteelblue": 0xb0c4de,
+    "lightyellow": 0xffffe0,
+    "lime": 0x00ff00,
+    "limegreen": 0x32cd32,
+    "linen": 0xfaf0e6,
+    "magenta": 0xff00ff,
+    "maroon": 0x800000,
+    "mediumaquamarine": 0x66cdaa,
+    "mediumblue": 0x0000cd,
+    "mediumorchid": 0xba55d3,
+    "mediumpurple": 0x9370db,
+    "mediumseagreen": 0x3cb371,
+    "mediumslateblue": 0x7b68ee,
+    "mediumspringgreen": 0x00fa9a,
+    "mediumturquoise": 0x48d1cc,
+    "mediumvioletred": 0xc71585,
+    "midnightblue": 0x191970,
+    "mintcream": 0xf5fffa,
+    "mistyrose": 0xffe4e1,
+    "moccasin": 0xffe4b5,
+    "navajowhite": 0xffdead,
+    "navy": 0x000080,
+    "oldlace": 0xfdf5e6,
+    "olive": 0x808000,
+    "olivedrab": 0x6b8e23,
+    "orange": 0xffa500,
+    "orangered": 0xff4500,
+    "orchid": 0xda70d6,
+    "palegoldenrod": 0xeee8aa,
+    "palegreen": 0x98fb98,
+    "paleturquoise": 0xafeeee,
+    "palevioletred": 0xdb7093,
+    "papayawhip": 0xffefd5,
+    "peachpuff": 0xffdab9,
+    "peru": 0xcd853f,
+    "pink": 0xffc0cb,
+    "plum": 0xdda0dd,
+    "powderblue": 0xb0e0e6,
+    "purple": 0x800080,
+    "red": 0xff0000,
+    "rosybrown": 0xbc8f8f,
+    "royalblue": 0x4169e1,
+    "saddlebrown": 0x8b4513,
+    "salmon": 0xfa8072,
+    "sandybrown": 0xf4a460,
+    "seagreen": 0x2e8b57,
+    "seashell": 0xfff5ee,
+    "sienna": 0xa0522d,
+    "silver": 0xc0c0c0,
+    "skyblue": 0x87ceeb,
+    "slateblue": 0x6a5acd,
+    "slategray": 0x708090,
+    "slategrey": 0x708090,
+    "snow": 0xfffafa,
+    "springgreen": 0x00ff7f,
+    "steelblue": 0x4682b4,
+    "tan": 0xd2b48c,
+    "teal": 0x008080,
+    "thistle": 0xd8bfd8,
+    "tomato": 0xff6347,
+    "turquoise": 0x40e0d0,
+    "violet": 0xee82ee,
+    "wheat": 0xf5deb3,
+    "white": 0xffffff,
+    "whitesmoke": 0xf5f5f5,
+    "yellow": 0xffff00,
+    "yellowgreen": 0x9acd32,
+}
+
+__all__ = tuple(_TABLE)
+__getattr__, __dir__ = _palette_module(globals(), _TABLE)
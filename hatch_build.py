@@ -0,0 +1,64 @@
+"""
+Builds the optional ``colors._speedups`` extension into the wheel.
+
+The package works without it, so a missing compiler only prints a warning and
+a pure-Python wheel is built instead. ``python hatch_build.py`` compiles the
+extension in place for development.
+"""
+import sys
+import traceback
+
+from setuptools import Distribution, Extension
+from setuptools.command.build_ext import build_ext
+
+try:
+    from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+except ImportError:  # pragma: no cover - only imported by hatchling
+    BuildHookInterface = object
+
+SPEEDUPS = Extension("colors._speedups", ["colors/_speedups.c"])
+
+
+class _BuildExt(build_ext):
+    def build_extensions(self):
+        # A fused multiply-add rounds differently from the pure-Python code
+        if self.compiler.compiler_type == "msvc":
+            args = ["/fp:precise"]
+        else:
+            # A C API function missing from an older Python fails the build instead of the import
+            args = ["-O2", "-ffp-contract=off", "-Werror=implicit-function-declaration"]
+        for extension in self.extensions:
+            extension.extra_compile_args = args
+        super().build_extensions()
+
+
+def build_inplace() -> list:
+    """ Compile the extension next to its source, returning the built files. """
+    command = _BuildExt(Distribution({"ext_modules": [SPEEDUPS]}))
+    command.inplace = True
+    command.ensure_finalized()
+    command.run()
+    return [command.get_ext_fullpath(extension.name) for extension in command.extensions]
+
+
+class SpeedupsBuildHook(BuildHookInterface):
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version, build_data):
+        if self.target_name != "wheel":
+            return
+        try:
+            outputs = build_inplace()
+        except Exception:
+            traceback.print_exc()
+            print("colors._speedups could not be built, the wheel will be pure Python", file=sys.stderr)
+            return
+        build_data["pure_python"] = False
+        build_data["infer_tag"] = True
+        for path in outputs:
+            build_data["force_include"][path] = "colors/" + path.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+if __name__ == "__main__":
+    for path in build_inplace():
+        print(path)
@@ -0,0 +1,28 @@
+import importlib
+
+import pytest
+
+#: Every module that binds ``np`` from colors.array at import time.
+NUMPY_MODULES = (
+    "colors.array",
+    "colors.blend",
+    "colors.composite",
+    "colors.css",
+    "colors.distance",
+    "colors.gradient",
+    "colors.lazy",
+    "colors.lut",
+    "colors.palette",
+    "colors.quantize",
+)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """ Run a test with NumPy, and again with the pure Python fallbacks. """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        for name in NUMPY_MODULES:
+            monkeypatch.setattr(importlib.import_module(name), "np", None)
+    return request.param
@@ -0,0 +1,173 @@
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import colors.w3c
+from colors import RGBColor, aio, parallel
+from colors.array import ColorArray
+from colors.blend import blend
+from colors.palette import Palette
+from colors.quantize import quantize
+
+
+@pytest.fixture(params=["loop", "pool"])
+def threshold(request, monkeypatch):
+    """ Run everything on the event loop, or every chunk on the shared pool. """
+    if request.param == "pool":
+        monkeypatch.setattr(aio, "ASYNC_THRESHOLD", 0)
+    return request.param
+
+
+class Gate(ThreadPoolExecutor):
+    """ A single thread counting the chunks submitted, which wait for ``release`` before they run. """
+
+    def __init__(self):
+        super().__init__(1)
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def submit(self, fn, *args):
+        self.calls += 1
+
+        def run():
+            self.started.set()
+            self.release.wait(5)
+            return fn(*args)
+        return super().submit(run)
+
+
+def _layer(seed, size=100):
+    rand = random.Random(seed)
+    return ColorArray([RGBColor(rand.randint(1, 254), rand.randint(1, 254), rand.randint(1, 254)) for _ in range(size)])
+
+
+@pytest.mark.parametrize("space", ["rgb", "hsv", "hex", "lab"])
+def test_convert(backend, threshold, space):
+    layer = _layer(1)
+    result = asyncio.run(aio.convert(layer, space, chunk_size=7))
+    assert result.space == space
+    assert result.tolist() == layer.to(space).tolist()
+    with pytest.raises(ValueError):
+        asyncio.run(aio.convert(layer, "cmyk"))
+
+
+def test_iter_convert(backend, threshold):
+    layer = _layer(1)
+
+    async def collect():
+        return [chunk async for chunk in aio.iter_convert(layer, "oklab", chunk_size=30)]
+    chunks = asyncio.run(collect())
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+    assert sum((chunk.tolist() for chunk in chunks), []) == layer.oklab.tolist()
+
+
+def test_blend(backend, threshold):
+    base, top = _layer(1).hsv, _layer(2)
+    result = asyncio.run(aio.blend("overlay", base, top, chunk_size=7))
+    assert result.space == "hsv"
+    assert result.tolist() == blend("overlay", base, top).tolist()
+    result = asyncio.run(aio.blend("screen", base, RGBColor(10, 20, 30), chunk_size=7))
+    assert result.tolist() == blend("screen", base, RGBColor(10, 20, 30)).tolist()
+
+    async def collect():
+        return [chunk async for chunk in aio.iter_blend("multiply", base, top, chunk_size=60)]
+    assert sum((chunk.tolist() for chunk in asyncio.run(collect())), []) == blend("multiply", base, top).tolist()
+    with pytest.raises(ValueError):
+        asyncio.run(aio.blend("nope", base, top))
+    with pytest.raises(ValueError):
+        asyncio.run(aio.blend("screen", base, top[:10]))
+
+
+def test_nearest_many(backend, threshold):
+    palette = Palette.from_modules(colors.w3c)
+    layer = _layer(3)
+    assert asyncio.run(aio.nearest_many(palette, layer, chunk_size=7)) == palette.nearest_many(layer)
+
+
+def test_process_pool(monkeypatch):
+    monkeypatch.setattr(aio, "ASYNC_THRESHOLD", 0)
+    pool = parallel.get_executor(2)
+    palette = Palette.from_modules(colors.w3c)
+    layer = _layer(4)
+    try:
+        assert asyncio.run(aio.convert(layer, "lab", chunk_size=40, executor=pool)).tolist() == layer.lab.tolist()
+        assert asyncio.run(aio.nearest_many(palette, layer, chunk_size=40, executor=pool)) == \
+            palette.nearest_many(layer)
+        with pytest.raises(TypeError):
+            asyncio.run(aio.quantize(b"\0\0\0", executor=pool))
+    finally:
+        parallel.shutdown()
+
+
+def _pixels(size=5_000):
+    rand = random.Random(0)
+    return bytes(rand.randrange(256) for _ in range(size * 3))
+
+
+@pytest.mark.parametrize("method", ["median_cut", "kmeans"])
+def test_quantize(backend, threshold, method):
+    pixels = _pixels()
+    expected = quantize(pixels, 4, method, chunk_size=1000, seed=1)
+    assert asyncio.run(aio.quantize(pixels, 4, method, chunk_size=1000, seed=1)) == expected
+    layer = ColorArray([tuple(pixels[i:i + 3]) for i in range(0, len(pixels), 3)], "rgb")
+    assert asyncio.run(aio.quantize(layer, 4, method, chunk_size=1000, seed=1)) == expected
+
+    async def upload():
+        for start in range(0, len(pixels), 3000):
+            await asyncio.sleep(0)
+            yield pixels[start:start + 3000]
+    assert asyncio.run(aio.quantize(upload(), 4, method, chunk_size=1000, seed=1)) == expected
+    with pytest.raises(ValueError):
+        asyncio.run(aio.quantize(pixels, 0))
+
+
+def test_cancel_between_chunks(monkeypatch):
+    monkeypatch.setattr(aio, "ASYNC_THRESHOLD", 0)
+    gate = Gate()
+
+    async def main():
+        task = asyncio.create_task(aio.convert(_layer(1), "lab", chunk_size=10, executor=gate))
+        while not gate.started.is_set():
+            await asyncio.sleep(0.001)
+        task.cancel()
+        gate.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(main())
+    gate.shutdown()
+    assert gate.calls == 1
+
+
+def test_iterators_wait_for_the_consumer(monkeypatch):
+    monkeypatch.setattr(aio, "ASYNC_THRESHOLD", 0)
+    gate = Gate()
+    gate.release.set()
+
+    async def main():
+        chunks = aio.iter_convert(_layer(1), "hsv", chunk_size=10, executor=gate)
+        await chunks.__anext__()
+        await asyncio.sleep(0.01)
+        assert gate.calls == 1
+        await chunks.__anext__()
+        assert gate.calls == 2
+        await chunks.aclose()
+    asyncio.run(main())
+    gate.shutdown()
+
+
+def test_small_inputs_stay_on_the_loop(monkeypatch):
+    monkeypatch.setattr(aio, "_executor", None)
+    layer = _layer(1)
+    asyncio.run(aio.convert(layer, "lab"))
+    asyncio.run(aio.blend("screen", layer, layer))
+    asyncio.run(aio.quantize(layer, 2))
+    assert aio._executor is None
+    big = ColorArray.empty(aio.ASYNC_THRESHOLD)
+    assert len(asyncio.run(aio.convert(big, "hsv"))) == aio.ASYNC_THRESHOLD
+    assert aio._executor is not None
+    aio.shutdown()
+    assert aio._executor is None
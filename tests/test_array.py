@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor
+from colors.array import ColorArray
+
+
+def _sample():
+    rand = random.Random(4)
+    rgb = [RGBColor(rand.randint(0, 255), rand.randint(0, 255), rand.randint(0, 255)) for _ in range(500)]
+    rgb += [RGBColor(0, 0, 0), RGBColor(255, 255, 255), RGBColor(255, 0, 0), RGBColor(128, 128, 127)]
+    floats = [RGBFloatColor(rand.random(), rand.random(), rand.random()) for _ in range(500)]
+    return {
+        "rgb": rgb,
+        "float": floats,
+        "hsv": [c.hsv for c in rgb],
+        "hex": [c.hex for c in rgb],
+        "linear": [c.linear for c in floats],
+        "xyz": [c.xyz for c in floats],
+        "lab": [c.lab for c in floats],
+        "oklab": [c.oklab for c in floats],
+    }
+
+
+SPACES = ["rgb", "float", "hsv", "hex", "linear", "xyz", "lab", "oklab"]
+PERCEPTUAL = {"linear", "xyz", "lab", "oklab"}
+
+
+@pytest.mark.parametrize("source", SPACES)
+@pytest.mark.parametrize("target", SPACES)
+def test_conversions_match_scalar(backend, source, target):
+    scalars = _sample()[source]
+    array = ColorArray(scalars)
+    assert array.space == source
+
+    converted = getattr(array, target)
+    assert converted.space == target
+    assert len(converted) == len(scalars)
+    for got, color in zip(converted, scalars):
+        expected = list(getattr(color, target))
+        if backend == "numpy" and {source, target} & PERCEPTUAL:
+            # NumPy's vectorized pow may differ from math.pow in the last bits
+            if target in ("rgb", "hex"):
+                assert [int(c, 16) if target == "hex" else c for c in got] == pytest.approx(
+                    [int(c, 16) if target == "hex" else c for c in expected], abs=1)
+            else:
+                assert list(got) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        else:
+            assert list(got) == expected
+
+
+def test_raw_channels(backend):
+    array = ColorArray([(255, 0, 0), (0, 0, 255)], space="rgb")
+    assert array.tolist() == [(255.0, 0.0, 0.0), (0.0, 0.0, 255.0)]
+    assert array.hsv[1] == HSVColor(2 / 3, 1, 1)
+    assert array.hex[0] == HexColor("ff0000")
+
+
+def test_indexing(backend):
+    array = ColorArray([RGBColor(1, 2, 3), RGBColor(4, 5, 6), RGBColor(7, 8, 9)])
+    assert repr(array[-1]) == "RGBColor(r=7, g=8, b=9)"
+    assert array[1:].tolist() == [(4.0, 5.0, 6.0), (7.0, 8.0, 9.0)]
+    with pytest.raises(IndexError):
+        array[3]
+
+
+def test_convert_into_out(backend):
+    array = ColorArray([RGBColor(255, 255, 255), RGBColor(0, 0, 0)])
+    out = ColorArray.empty(2, "float")
+    assert array.to("float", out=out) is out
+    assert out.tolist() == [(1.0, 1.0, 1.0), (0.0, 0.0, 0.0)]
+
+
+def test_same_space_is_identity(backend):
+    array = ColorArray([RGBColor(1, 2, 3)])
+    assert array.rgb is array
+
+
+def test_from_buffer_validation(backend):
+    with pytest.raises(ValueError):
+        ColorArray.from_buffer(ColorArray([(1, 2, 3)]).data, space="cmyk")
+    with pytest.raises(ValueError):
+        ColorArray([(1, 2, 3)], space="cmyk")
+
+
+@pytest.mark.parametrize("channels", [[(1, 2, 3, 4, 5, 6)], [(1, 2)], [(1, 2, 3), (4, 5)], [(1, 2, 3, 4)]])
+def test_channel_count_validation(backend, channels):
+    with pytest.raises(ValueError, match="exactly 3 channels"):
+        ColorArray(channels, "rgb")
+
+
+@pytest.mark.parametrize("channel", [-1, 256, 300])
+def test_linear_rejects_out_of_range_rgb(backend, channel):
+    with pytest.raises(ValueError, match="between 0 and 255"):
+        ColorArray([(0, 0, 0), (channel, 0, 0)], "rgb").linear
+
+
+def test_parse_hex_many(backend):
+    from colors.array import parse_hex_many
+    array = parse_hex_many(["#abc", "#ABCD", "A1B2C3", "#a1b2c3ff"])
+    assert array.space == "hex"
+    assert list(array) == [HexColor("aabbcc"), HexColor("aabbcc"), HexColor("a1b2c3"), HexColor("a1b2c3")]
+    for invalid in ["#ab", "#abcde", "#gggggg", "0x1234"]:
+        with pytest.raises(ValueError):
+            parse_hex_many([invalid])
+
+
+def test_format_hex_many(backend):
+    from colors.array import format_hex_many
+    array = ColorArray([RGBFloatColor(1, 0.5, 0), HSVColor(0, 1, 1)])
+    assert format_hex_many(array) == ["ff8000", "ff0000"]
+    assert format_hex_many(array, prefix="#") == ["#ff8000", "#ff0000"]
@@ -0,0 +1,110 @@
+import pickle
+import random
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor, RGBAColor, FrozenRGBColor, OKLabColor
+from colors.array import ColorArray, DTYPES
+
+
+def _rgb(size=300):
+    rand = random.Random(size)
+    return ColorArray([RGBColor(*(rand.randrange(256) for _ in range(3))) for _ in range(size)])
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+@pytest.mark.parametrize("space", ["rgb", "hex", "hsv", "oklab"])
+def test_save_load(backend, tmp_path, space, mmap):
+    array = _rgb().to(space)
+    array.save(tmp_path / "colors.clr")
+    loaded = ColorArray.load(tmp_path / "colors.clr", mmap=mmap)
+    assert loaded.space == space
+    assert loaded.tolist() == array.tolist()
+    assert (tmp_path / "colors.clr").stat().st_size == 32 + len(array) * 3 * DTYPES["float64"]
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_uint8(backend, tmp_path, mmap):
+    array = _rgb()
+    array.save(tmp_path / "colors.clr", "uint8")
+    assert (tmp_path / "colors.clr").stat().st_size == 32 + len(array) * 3
+    loaded = ColorArray.load(tmp_path / "colors.clr", mmap=mmap)
+    assert loaded.tolist() == array.tolist()
+    with pytest.raises(ValueError):
+        array.hsv.save(tmp_path / "hsv.clr", "uint8")
+    with pytest.raises(ValueError):
+        ColorArray([(256, 0, 0)]).save(tmp_path / "big.clr", "uint8")
+    with pytest.raises(ValueError):
+        ColorArray([(0.5, 0, 0)]).save(tmp_path / "half.clr", "uint8")
+
+
+def test_mmap_is_a_read_only_view(tmp_path):
+    pytest.importorskip("numpy")
+    _rgb().save(tmp_path / "colors.clr")
+    loaded = ColorArray.load(tmp_path / "colors.clr", mmap=True)
+    assert not loaded.data.flags.writeable
+    assert not loaded.data.flags.owndata
+    with pytest.raises(ValueError):
+        loaded.data[0] = 0
+    # Conversions still work, into new arrays
+    assert loaded.hsv.tolist() == _rgb().hsv.tolist()
+    assert ColorArray.load(tmp_path / "colors.clr").data.flags.writeable
+
+
+def test_empty(backend, tmp_path):
+    ColorArray([], "lab").save(tmp_path / "empty.clr")
+    for mmap in (False, True):
+        loaded = ColorArray.load(tmp_path / "empty.clr", mmap=mmap)
+        assert len(loaded) == 0
+        assert loaded.space == "lab"
+
+
+def test_load_invalid(tmp_path):
+    (tmp_path / "text.clr").write_text("#336699\n")
+    with pytest.raises(ValueError, match="Not a color array"):
+        ColorArray.load(tmp_path / "text.clr")
+    _rgb().save(tmp_path / "colors.clr")
+    data = (tmp_path / "colors.clr").read_bytes()
+    (tmp_path / "short.clr").write_bytes(data[:-8])
+    with pytest.raises(ValueError, match="Truncated"):
+        ColorArray.load(tmp_path / "short.clr")
+    (tmp_path / "future.clr").write_bytes(data[:4] + b"\x02" + data[5:])
+    with pytest.raises(ValueError, match="version"):
+        ColorArray.load(tmp_path / "future.clr")
+    with pytest.raises(ValueError):
+        _rgb().save(tmp_path / "colors.clr", "float32")
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(backend, protocol):
+    array = _rgb().hsv
+    clone = pickle.loads(pickle.dumps(array, protocol=protocol))
+    assert clone.space == "hsv"
+    assert clone.tolist() == array.tolist()
+
+
+@pytest.mark.skipif(pickle.HIGHEST_PROTOCOL < 5, reason="out of band buffers need pickle protocol 5")
+def test_pickle_out_of_band(backend):
+    array = _rgb(1000)
+    buffers = []
+    data = pickle.dumps(array, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(data) < 100
+    clone = pickle.loads(data, buffers=buffers)
+    assert clone.tolist() == array.tolist()
+    if backend == "numpy":
+        import numpy as np
+        assert np.shares_memory(clone.data, array.data)
+
+
+def test_pickle_colors():
+    colors_ = [RGBColor(1, 2, 3), RGBFloatColor(0.1, 0.2, 0.3), HSVColor(0.5, 0.5, 0.5), HexColor("abcdef"),
+               OKLabColor(0.5, 0.1, -0.1), RGBAColor(1, 2, 3, 0.5), FrozenRGBColor(1, 2, 3)]
+    for color in colors_:
+        clone = pickle.loads(pickle.dumps(color, protocol=pickle.HIGHEST_PROTOCOL))
+        assert type(clone) is type(color)
+        assert list(clone) == list(color)
+    # The class is stored once, every color only adds its channels
+    many = [RGBColor(i % 256, 0, 0) for i in range(1000)]
+    assert len(pickle.dumps(many, protocol=pickle.HIGHEST_PROTOCOL)) < 20 * len(many)
+    assert pickle.loads(pickle.dumps(many, protocol=pickle.HIGHEST_PROTOCOL)) == many
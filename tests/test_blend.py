@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from colors import RGBAColor, RGBColor, RGBFloatColor, HSVColor, HexColor
+from colors.array import ColorArray
+import colors.blend
+from colors.blend import blend, blend_buffer, BLEND_MODES
+
+
+def _layer(seed, size=300):
+    rand = random.Random(seed)
+    # Channels stay away from 0 and 255 so divide, dodge and burn are defined everywhere
+    return [RGBColor(rand.randint(1, 254), rand.randint(1, 254), rand.randint(1, 254)) for _ in range(size)]
+
+
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+@pytest.mark.parametrize("cls", [RGBColor, RGBFloatColor, HSVColor, HexColor])
+def test_matches_color_methods(backend, mode, cls):
+    base = [cls(c) for c in _layer(1)]
+    top = _layer(2)
+    result = blend(mode, ColorArray(base), ColorArray(top))
+
+    assert result.space == ColorArray(base).space
+    for got, a, b in zip(result, base, top):
+        expected = getattr(a, mode)(b)
+        assert type(got) is type(expected)
+        assert list(got) == list(expected)
+
+
+def test_single_top_color(backend):
+    base = _layer(3)
+    result = blend("screen", ColorArray(base), HexColor("0a0a0a"))
+    assert list(result) == [c.screen(HexColor("0a0a0a")) for c in base]
+
+
+def test_in_place(backend):
+    base = ColorArray(_layer(4))
+    expected = blend("multiply", base, ColorArray(_layer(5))).tolist()
+    assert blend("multiply", base, ColorArray(_layer(5)), out=base) is base
+    assert base.tolist() == expected
+
+
+def test_zero_division(backend):
+    with pytest.raises(ZeroDivisionError):
+        blend("color_dodge", ColorArray([RGBColor(255, 0, 0)]), ColorArray([RGBColor(1, 1, 1)]))
+
+
+def test_errors(backend):
+    with pytest.raises(ValueError):
+        blend("dissolve", ColorArray(_layer(1, 2)), ColorArray(_layer(2, 2)))
+    with pytest.raises(ValueError):
+        blend("multiply", ColorArray(_layer(1, 2)), ColorArray(_layer(2, 3)))
+
+
+@pytest.fixture(params=["numpy", "python"])
+def buffer_backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(colors.blend, "np", None)
+    return request.param
+
+
+def _pixels(seed, size, channels=3):
+    rand = random.Random(seed)
+    return bytes(rand.randrange(1, 255) for _ in range(size * channels))
+
+
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+def test_buffer_matches_color_methods(buffer_backend, mode):
+    base, top = _pixels(1, 200), _pixels(2, 200)
+    result = blend_buffer(mode, base, top, tile_size=64)
+    for i in range(0, len(base), 3):
+        expected = getattr(RGBColor(*base[i:i + 3]), mode)(RGBColor(*top[i:i + 3]))
+        assert list(result[i:i + 3]) == list(expected.rgb)
+
+
+def test_buffer_rgba(buffer_backend):
+    base = bytes([10, 20, 30, 40, 200, 100, 50, 60])
+    top = bytes([100, 100, 100, 255, 100, 100, 100, 0])
+    result = blend_buffer("screen", base, top, layout="rgba")
+    expected = RGBColor(10, 20, 30).screen(RGBColor(100, 100, 100))
+    assert result == bytes([*expected.rgb, 40, 200, 100, 50, 60])
+
+    half = bytes([0, 0, 0, 255, 100, 100, 100, 128])
+    result = blend_buffer("add", bytes([0, 0, 0, 255, 200, 200, 200, 255]), half, layout="rgba")
+    # (200 * 127 + 255 * 128) / 255, rounded
+    assert result == bytes([0, 0, 0, 255, 228, 228, 228, 255])
+
+
+def test_buffer_out_and_single_color(buffer_backend):
+    base = bytearray(_pixels(1, 50))
+    expected = blend_buffer("multiply", bytes(base), bytes(RGBColor(128, 64, 32)) * 50)
+    view = memoryview(base)
+    assert blend_buffer("multiply", view, RGBColor(128, 64, 32), out=view, tile_size=8) is view
+    assert base == expected
+
+
+def test_buffer_single_color_alpha(buffer_backend):
+    base = bytes([100, 100, 100, 255, 200, 200, 200, 255])
+    assert blend_buffer("multiply", base, RGBAColor(0, 0, 0, 0.0), layout="rgba") == base
+    top = RGBAColor(100, 50, 0, 0.5)
+    assert blend_buffer("add", base, top, layout="rgba") == blend_buffer("add", base, bytes([100, 50, 0, 128]) * 2,
+                                                                         layout="rgba")
+
+
+def test_buffer_mmap(buffer_backend, tmp_path):
+    import mmap
+    path = tmp_path / "frame.rgb"
+    path.write_bytes(_pixels(1, 1000))
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as frame:
+        expected = blend_buffer("overlay", frame, _pixels(2, 1000))
+        blend_buffer("overlay", frame, _pixels(2, 1000), out=frame, tile_size=100)
+        assert frame[:] == expected
+
+
+def test_buffer_errors(buffer_backend):
+    with pytest.raises(ValueError):
+        blend_buffer("nope", b"abc", b"abc")
+    with pytest.raises(ValueError):
+        blend_buffer("screen", b"abc", b"abc", layout="bgr")
+    with pytest.raises(ValueError):
+        blend_buffer("screen", b"abcd", b"abcd")
+    with pytest.raises(ValueError):
+        blend_buffer("screen", b"abc", b"abcdef")
+    with pytest.raises(TypeError):
+        blend_buffer("screen", b"abc", b"abc", out=b"xyz")
+    with pytest.raises(ZeroDivisionError):
+        blend_buffer("divide", b"\x00\x01\x02", b"\x01\x01\x01")
@@ -138,3 +138,62 @@ def test_RGBColor_float():
 
 def test_HSVColor_float():
     assert RGBFloatColor(1, 0, 0) == HSVColor(0, 1, 1).float
+
+
+def test_HSVColor_from_color():
+    assert list(HSVColor(RGBColor(255, 0, 0))) == [0.0, 1.0, 1.0]
+
+
+def test_RGBFloatColor_rgb_clamps(caplog):
+    assert RGBFloatColor(1.2, -0.5, 0.2).rgb == RGBColor(255, 0, 51)
+    assert caplog.text == ""
+
+
+def test_conversion_routes():
+    from colors.base import _path
+    assert _path("float", "rgb") == (("float", "rgb"),)
+    assert _path("hex", "hsv") == (("hex", "float"), ("float", "hsv"))
+    assert _path("hsv", "hex") == (("hsv", "rgb"), ("rgb", "hex"))
+
+
+def test_hex_packed_storage():
+    color = HexColor("A1b2C3")
+    assert repr(color) == 'HexColor("a1b2c3")'
+    assert list(color) == ["a1", "b2", "c3"]
+    assert "b2" in color and len(color) == 3
+    assert color.rgb == RGBColor(161, 178, 195)
+    assert list(color.float) == [161 / 255.0, 178 / 255.0, 195 / 255.0]
+
+
+def test_hex_channel_setter():
+    color = HexColor("000000")
+    color.green = "Ff"
+    assert str(color) == "00ff00"
+    with pytest.raises(ValueError):
+        color.red = "fff"
+
+
+@pytest.mark.parametrize("hex_string", ["+fffff", "0x1234", "ff_fff", " fffff", "fffff\n"])
+def test_hex_value_error_int_syntax(hex_string):
+    with pytest.raises(ValueError):
+        HexColor(hex_string)
+
+
+def test_perceptual_spaces():
+    from colors import OKLabColor
+    assert list(RGBColor(255, 255, 255).lab) == pytest.approx([100, 0, 0], abs=1e-4)
+    assert list(HexColor("336699").lab) == pytest.approx([42.008, -0.152, -32.846], abs=1e-3)
+    assert list(RGBColor(255, 0, 0).oklab) == pytest.approx([0.627955, 0.224863, 0.125846], abs=1e-6)
+    assert list(RGBColor(255, 255, 255).xyz) == pytest.approx([0.95047, 1.0, 1.08883], abs=1e-4)
+    assert list(RGBColor(128, 128, 128).linear) == pytest.approx([0.2158605] * 3)
+    assert repr(OKLabColor(0.5, 0.1, -0.1)) == "OKLabColor(l=0.5, a=0.1, b=-0.1)"
+
+
+def test_perceptual_round_trip():
+    from colors import LinearRGBColor, XYZColor, LabColor, OKLabColor
+    for color in (RGBColor(51, 102, 153), RGBColor(0, 0, 0), RGBColor(255, 254, 1)):
+        for cls in (LinearRGBColor, XYZColor, LabColor, OKLabColor):
+            assert cls(color).rgb == color
+            assert cls(color).hex == color
+    assert RGBColor(17, 34, 51).float.linear == RGBColor(17, 34, 51).linear
+    assert list(LabColor(OKLabColor(RGBColor(51, 102, 153)))) == pytest.approx(list(HexColor("336699").lab), abs=1e-5)
@@ -0,0 +1,114 @@
+import pickle
+import random
+
+import pytest
+
+from colors import RGBAColor, HSVAColor, RGBColor, HSVColor
+from colors.array import ColorArray
+from colors.blend import BLEND_MODES
+from colors.composite import OPERATORS, composite, flatten, premultiply, unpremultiply
+
+
+def _layer(seed, size=200):
+    rand = random.Random(seed)
+    # Channels stay away from 0 and 255 so divide, dodge and burn are defined everywhere
+    return [RGBColor(*(rand.randint(1, 254) for _ in range(3))) for _ in range(size)], \
+        [rand.choice((0.0, 1.0, rand.random())) for _ in range(size)]
+
+
+def test_constructors():
+    color = RGBAColor(255, 128, 0, 0.5)
+    assert color.alpha == 0.5
+    assert list(color) == [255, 128, 0, 0.5]
+    assert len(color) == 4
+    assert repr(color) == "RGBAColor(r=255, g=128, b=0, a=0.5)"
+    assert RGBAColor(255, 128, 0).alpha == 1.0
+    assert RGBAColor(color).alpha == 0.5
+    assert RGBAColor(color, a=0.25).alpha == 0.25
+    assert HSVAColor(color).alpha == 0.5
+    assert HSVAColor(color).rgba == color
+    assert color.rgb == RGBColor(255, 128, 0) and type(color.rgb) is RGBColor
+    assert type(HSVAColor(0.5, 1, 1, 0.5).hsv) is HSVColor
+    assert RGBColor(1, 2, 3).rgba.alpha == 1.0
+    with pytest.raises(ValueError):
+        RGBAColor(0, 0, 0, 1.5)
+
+
+def test_equality_and_pickle():
+    assert RGBAColor(1, 2, 3) == RGBColor(1, 2, 3)
+    assert RGBAColor(1, 2, 3, 0.5) != RGBColor(1, 2, 3)
+    color = HSVAColor(0.25, 0.5, 0.75, 0.5)
+    assert pickle.loads(pickle.dumps(color)) == color
+
+
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+def test_opaque_blend_matches_rgb(mode):
+    base, _ = _layer(1, 50)
+    top, _ = _layer(2, 50)
+    for a, b in zip(base, top):
+        assert getattr(RGBAColor(a), mode)(b) == getattr(RGBColor(a), mode)(b)
+
+
+def test_invert_keeps_alpha():
+    assert RGBAColor(255, 0, 10, 0.5).invert() == RGBAColor(0, 255, 245, 0.5)
+
+
+def test_porter_duff():
+    red, blue = RGBAColor(255, 0, 0, 0.5), RGBAColor(0, 0, 255, 0.5)
+    assert red.over(blue) == RGBAColor(170, 0, 85, 0.75)
+    assert red.in_(blue) == RGBAColor(255, 0, 0, 0.25)
+    assert red.out(blue) == RGBAColor(255, 0, 0, 0.25)
+    assert red.atop(blue) == RGBAColor(128, 0, 128, 0.5)
+    assert red.xor(blue) == RGBAColor(128, 0, 128, 0.5)
+    assert red.in_(RGBAColor(0, 0, 0, 0)).alpha == 0
+    # Half transparent white screened onto opaque black stays black-ish grey
+    assert RGBAColor(0, 0, 0).screen(RGBAColor(255, 255, 255, 0.5)) == RGBColor(128, 128, 128)
+    with pytest.raises(ValueError):
+        red.over(blue, mode="dissolve")
+
+
+@pytest.mark.parametrize("mode", [None, "multiply", "screen", "overlay", "color_burn"])
+@pytest.mark.parametrize("operator", sorted(OPERATORS))
+def test_composite_matches_colors(backend, operator, mode):
+    source, source_alpha = _layer(3)
+    backdrop, backdrop_alpha = _layer(4)
+    result = composite(premultiply(ColorArray(source), source_alpha),
+                       premultiply(ColorArray(backdrop), backdrop_alpha), operator, mode)
+    colors_, alpha = unpremultiply(result)
+    method = "in_" if operator == "in" else operator
+    for s, a_s, b, a_b, got, got_alpha in zip(source, source_alpha, backdrop, backdrop_alpha, colors_, alpha):
+        expected = getattr(RGBAColor(s, a=a_s), method)(RGBAColor(b, a=a_b), mode)
+        assert got_alpha == pytest.approx(expected.alpha)
+        if expected.alpha:
+            assert RGBColor(got) == expected.rgb
+
+
+def test_flatten(backend):
+    stack = [_layer(seed) for seed in range(4)]
+    modes = [None, "multiply", None, "screen"]
+    result, alpha = unpremultiply(flatten([premultiply(ColorArray(c), a) for c, a in stack], modes))
+    for i, (got, got_alpha) in enumerate(zip(result, alpha)):
+        expected = RGBAColor(stack[0][0][i], a=stack[0][1][i])
+        for (layer, layer_alpha), mode in zip(stack[1:], modes[1:]):
+            expected = RGBAColor(layer[i], a=layer_alpha[i]).over(expected, mode)
+        assert got_alpha == pytest.approx(expected.alpha)
+        if expected.alpha:
+            # The colors round every step to 8 bits, the layers do not
+            assert all(abs(x - y) <= 1 for x, y in zip(RGBColor(got), expected.rgb))
+
+
+def test_flatten_validates(backend):
+    layer = premultiply(ColorArray([RGBColor(1, 2, 3)]), 0.5)
+    with pytest.raises(ValueError):
+        flatten([layer, layer], ["multiply"])
+    with pytest.raises(ValueError):
+        flatten([layer, premultiply(ColorArray([RGBColor(1, 2, 3)] * 2))])
+    with pytest.raises(ValueError):
+        composite(layer, layer, "under")
+
+
+def test_lazy_rejects_translucent():
+    from colors.lazy import lazy
+    assert lazy(RGBAColor(1, 2, 3)).multiply(RGBColor(4, 5, 6)).evaluate() == RGBColor(1, 2, 3).multiply(RGBColor(4, 5, 6))
+    with pytest.raises(TypeError):
+        lazy(RGBAColor(1, 2, 3, 0.5))
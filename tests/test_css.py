@@ -0,0 +1,84 @@
+import pytest
+
+from colors import RGBAColor, RGBColor, HSVColor, HexColor, w3c
+from colors.array import ColorArray
+from colors.css import parse, parse_many, serialize, serialize_many
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("#abc", RGBColor(170, 187, 204)),
+    ("#ABCDEF", RGBColor(171, 205, 239)),
+    ("#abcd", RGBAColor(170, 187, 204, 0xdd / 255)),
+    ("#a1b2c380", RGBAColor(161, 178, 195, 128 / 255)),
+    ("rgb(255, 0, 10)", RGBColor(255, 0, 10)),
+    ("rgba(255,0,10,.5)", RGBAColor(255, 0, 10, 0.5)),
+    ("rgb(100% 50% 0 / 25%)", RGBAColor(255, 128, 0, 0.25)),
+    ("rgb(300, -5, 12.4)", RGBColor(255, 0, 12)),
+    ("hsl(120, 100%, 50%)", RGBColor(0, 255, 0)),
+    ("hsla(240deg 100% 50% / 0.5)", RGBAColor(0, 0, 255, 0.5)),
+    ("hsl(0.5turn, 0%, 100%)", RGBColor(255, 255, 255)),
+    ("  AliceBlue ", w3c.aliceblue),
+    ("transparent", RGBAColor(0, 0, 0, 0)),
+])
+def test_parse(text, expected):
+    color = parse(text)
+    assert type(color) is type(expected)
+    assert color == expected
+
+
+@pytest.mark.parametrize("text", ["", "#", "#ab", "#abcde", "#ggg", "rgb(1, 2)", "rgb(a, b, c)", "rgb(1, 2, 3",
+                                  "cmyk(1, 2, 3, 4)", "notacolor", "hsl(1%, 2%, 3%)"])
+def test_parse_invalid(text):
+    with pytest.raises(ValueError):
+        parse(text)
+
+
+def test_every_named_color():
+    for name in dir(w3c):
+        value = getattr(w3c, name)
+        if isinstance(value, RGBColor):
+            assert parse(name) == value
+
+
+@pytest.mark.parametrize("style, opaque, translucent", [
+    ("hex", "#ff0000", "#ff000080"),
+    ("rgb", "rgb(255, 0, 0)", "rgba(255, 0, 0, 0.502)"),
+    ("hsl", "hsl(0, 100%, 50%)", "hsla(0, 100%, 50%, 0.502)"),
+    ("name", "red", "#ff000080"),
+])
+def test_serialize(style, opaque, translucent):
+    assert serialize(HSVColor(0, 1, 1), style) == opaque
+    assert serialize(RGBAColor(255, 0, 0, 128 / 255), style) == translucent
+
+
+def test_serialize_round_trip():
+    for value in (0x000000, 0x123456, 0xfedcba, 0xffffff):
+        color = HexColor("%06x" % value)
+        for style in ("hex", "rgb", "name"):
+            assert parse(serialize(color, style)) == color
+    assert serialize(RGBAColor(0, 0, 0, 0), "name") == "transparent"
+    with pytest.raises(ValueError):
+        serialize(RGBColor(), "cmyk")
+
+
+def test_parse_many(backend):
+    lines = ["red", "#00ff0080", "rgb(1, 2, 3)", "hsl(240, 100%, 50%)", "transparent"] * 5
+    chunks = list(parse_many(iter(lines), chunk_size=7))
+    assert [len(c) for c, _ in chunks] == [7, 7, 7, 4]
+    got = [RGBAColor(c, a=a) for colors_, alpha in chunks for c, a in zip(colors_, alpha)]
+    assert got == [RGBAColor(parse(line)) for line in lines]
+    assert chunks[0][0].space == "rgb"
+    with pytest.raises(ValueError):
+        list(parse_many(["red", "bogus"]))
+
+
+def test_parse_many_skips_blank_lines(backend):
+    chunks = list(parse_many(["red\n", "\n", "", "  \t ", "#0000ff\n"], chunk_size=2))
+    assert [c.tolist() for c, _ in chunks] == [[(255, 0, 0), (0, 0, 255)]]
+
+
+def test_serialize_many(backend):
+    array_ = ColorArray([RGBColor(255, 0, 0), RGBColor(1, 2, 3)])
+    assert serialize_many(array_) == ["#ff0000", "#010203"]
+    assert serialize_many(array_, [1.0, 0.5], "rgb") == ["rgb(255, 0, 0)", "rgba(1, 2, 3, 0.5)"]
+    assert serialize_many(array_, style="name") == ["red", "#010203"]
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from colors import RGBColor, LabColor, HexColor
+from colors.array import ColorArray
+from colors import distance
+
+
+# From Sharma, Wu and Dalal, "The CIEDE2000 Color-Difference Formula" (2005)
+SHARMA = [
+    ((50.0000, 2.6772, -79.7751), (50.0000, 0.0000, -82.7485), 2.0425),
+    ((50.0000, 3.1571, -77.2803), (50.0000, 0.0000, -82.7485), 2.8615),
+    ((50.0000, -1.3802, -84.2814), (50.0000, 0.0000, -82.7485), 1.0000),
+    ((50.0000, -0.0010, 2.4900), (50.0000, 0.0009, -2.4900), 4.8045),
+    ((50.0000, -0.0010, 2.4900), (50.0000, 0.0011, -2.4900), 4.7461),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 0.0000, -2.5000), 4.3065),
+    ((50.0000, 2.5000, 0.0000), (73.0000, 25.0000, -18.0000), 27.1492),
+    ((50.0000, 2.5000, 0.0000), (50.0000, 3.1736, 0.5854), 1.0000),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+
+def _colors(seed, size):
+    rand = random.Random(seed)
+    return [RGBColor(rand.randint(0, 255), rand.randint(0, 255), rand.randint(0, 255)) for _ in range(size)]
+
+
+@pytest.mark.parametrize("lab1, lab2, expected", SHARMA)
+def test_ciede2000_reference(lab1, lab2, expected):
+    assert LabColor(*lab1).distance(LabColor(*lab2), metric="ciede2000") == pytest.approx(expected, abs=1e-4)
+    assert LabColor(*lab2).distance(LabColor(*lab1), metric="ciede2000") == pytest.approx(expected, abs=1e-4)
+
+
+def test_color_distance():
+    red = RGBColor(255, 0, 0)
+    assert red.distance(HexColor("ff0000")) == 0
+    assert red.distance(RGBColor(0, 0, 255)) == pytest.approx(176.3, abs=0.1)
+    assert red.distance(RGBColor(0, 0, 255), metric="oklab") == pytest.approx(0.537, abs=1e-3)
+    with pytest.raises(ValueError):
+        red.distance(red, metric="cie94")
+
+
+@pytest.mark.parametrize("metric", sorted(distance.METRICS))
+def test_distance_matches_scalar(backend, metric):
+    a, b = _colors(1, 50), _colors(2, 50)
+    result = distance.distance(ColorArray(a), ColorArray(b), metric=metric)
+    assert list(result) == pytest.approx([x.distance(y, metric=metric) for x, y in zip(a, b)])
+
+
+@pytest.mark.parametrize("metric", sorted(distance.METRICS))
+def test_matrix_matches_scalar(backend, metric):
+    a, b = _colors(1, 20), _colors(2, 30)
+    matrix = distance.distance_matrix(ColorArray(a), ColorArray(b), metric=metric)
+    for row, x in zip(matrix, a):
+        assert list(row) == pytest.approx([x.distance(y, metric=metric) for y in b])
+
+
+def test_blocks_cover_matrix(backend):
+    a, b = ColorArray(_colors(1, 23)), ColorArray(_colors(2, 17))
+    matrix = distance.distance_matrix(a, b)
+    seen = 0
+    for i, j, block in distance.iter_distance_blocks(a, b, block_size=5):
+        for r, row in enumerate(block):
+            assert list(row) == list(matrix[i + r][j:j + len(row)])
+            seen += len(row)
+    assert seen == 23 * 17
+
+
+@pytest.mark.parametrize("k", [1, 3])
+def test_nearest(backend, k):
+    a, b = _colors(1, 40), _colors(2, 25)
+    b[7] = b[3]  # ties resolve to the lowest index
+    indices, deltas = distance.nearest(ColorArray(a), ColorArray(b), metric="ciede2000", k=k, block_size=8)
+    for x, got, got_d in zip(a, indices, deltas):
+        expected = sorted((x.distance(y, metric="ciede2000"), i) for i, y in enumerate(b))[:k]
+        if k == 1:
+            got, got_d = [got], [got_d]
+        assert got == [i for _, i in expected]
+        assert got_d == pytest.approx([d for d, _ in expected])
+
+
+def test_nearest_without_candidates(backend):
+    with pytest.raises(ValueError, match="no candidates"):
+        distance.nearest(ColorArray(_colors(1, 5)), ColorArray([], "rgb"))
+
+
+def test_pairs_within(backend):
+    a = _colors(1, 30)
+    a[20] = a[4]
+    a[29] = RGBColor(*a[11].rgb)
+    pairs = list(distance.pairs_within(ColorArray(a), threshold=1e-9, block_size=7))
+    assert sorted((i, j) for i, j, _ in pairs) == [(4, 20), (11, 29)]
+
+    b = _colors(2, 10) + [a[0]]
+    pairs = list(distance.pairs_within(ColorArray(a), ColorArray(b), threshold=1e-9, block_size=7))
+    assert [(i, j) for i, j, _ in pairs] == [(0, 10)]
+
+
+def test_errors():
+    a = ColorArray(_colors(1, 3))
+    with pytest.raises(ValueError):
+        distance.distance(a, ColorArray(_colors(1, 4)))
+    with pytest.raises(ValueError):
+        distance.distance_matrix(a, metric="cie94")
@@ -0,0 +1,97 @@
+import copy
+import pickle
+import weakref
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor, LinearRGBColor, RGBAColor
+from colors import FrozenRGBColor, FrozenRGBFloatColor, FrozenHSVColor, FrozenHexColor
+
+
+def test_frozen_is_subclass():
+    assert isinstance(FrozenRGBColor(1, 2, 3), RGBColor)
+    assert isinstance(FrozenHexColor("010203"), HexColor)
+    assert repr(FrozenRGBColor(1, 2, 3)) == "FrozenRGBColor(r=1, g=2, b=3)"
+
+
+def test_frozen_is_immutable():
+    color = FrozenRGBColor(1, 2, 3)
+    with pytest.raises(AttributeError):
+        color.red = 10
+    with pytest.raises(AttributeError):
+        color.alpha = 1
+    with pytest.raises(AttributeError):
+        del color.red
+    assert color == RGBColor(1, 2, 3)
+
+
+@pytest.mark.parametrize("cls", [RGBColor, RGBFloatColor, HSVColor, HexColor, LinearRGBColor, RGBAColor])
+def test_mutable_colors_are_ordinary_objects(cls):
+    color = cls()
+    assert weakref.ref(color)() is color
+    color.label = "background"
+    assert color.label == "background"
+
+
+def test_frozen_colors_take_weak_references():
+    color = FrozenRGBColor(1, 2, 3)
+    assert weakref.ref(color)() is color
+    with pytest.raises(AttributeError):
+        color.label = "background"
+
+
+def test_hash_agrees_with_eq():
+    colors = {
+        FrozenRGBColor(255, 0, 0): "rgb",
+        FrozenHSVColor(0.5, 1, 1): "hsv",
+    }
+    assert colors[FrozenHexColor("ff0000")] == "rgb"
+    assert colors[FrozenRGBFloatColor(1, 0, 0)] == "rgb"
+    assert colors[FrozenRGBColor(0, 255, 255)] == "hsv"
+    assert len({FrozenRGBColor(128, 128, 128), FrozenRGBFloatColor(0.5, 0.5, 0.5), FrozenHexColor("808080")}) == 1
+
+
+def test_mutable_colors_are_not_hashable():
+    with pytest.raises(TypeError):
+        hash(RGBColor(1, 2, 3))
+
+
+def test_frozen_conversions_stay_frozen():
+    color = FrozenRGBColor(51, 102, 153)
+    assert type(color.hsv) is FrozenHSVColor
+    assert type(color.float) is FrozenRGBFloatColor
+    assert type(color.hex) is FrozenHexColor
+    assert type(color.hex.rgb) is FrozenRGBColor
+    assert type(color.screen(RGBColor(1, 1, 1))) is FrozenRGBColor
+
+
+def test_frozen_from_color():
+    assert FrozenHSVColor(RGBColor(255, 0, 0)) == HSVColor(0, 1, 1)
+    assert FrozenRGBColor(HexColor("ff0000")) == RGBColor(255, 0, 0)
+
+
+def test_frozen_pickle_and_copy():
+    for color in (FrozenRGBColor(1, 2, 3), FrozenHSVColor(0.1, 0.2, 0.3), FrozenHexColor("abcdef")):
+        for clone in (pickle.loads(pickle.dumps(color)), copy.copy(color), copy.deepcopy(color)):
+            assert type(clone) is type(color)
+            assert list(clone) == list(color)
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_protocols(protocol):
+    for color in (RGBColor(1, 2, 3), RGBFloatColor(0.1, 0.2, 0.3), HexColor("abcdef"), FrozenHSVColor(0.1, 0.2, 0.3)):
+        clone = pickle.loads(pickle.dumps(color, protocol=protocol))
+        assert type(clone) is type(color)
+        assert list(clone) == list(color)
+
+
+def test_frozen_conversions_are_cached():
+    color = FrozenHexColor("336699")
+    assert color.hsv is color.hsv
+    assert color.rgb is color.rgb
+    assert color.hsv.rgb is color.hsv.rgb
+
+
+def test_mutable_conversions_are_not_cached():
+    color = HexColor("336699")
+    assert color.hsv is not color.hsv
@@ -0,0 +1,95 @@
+import pytest
+
+import colors.gradient
+from colors import RGBAColor, RGBColor, HSVColor, HexColor
+from colors.gradient import SPACES, gradient, mix
+
+
+@pytest.fixture(autouse=True)
+def clear_ramps():
+    colors.gradient._ramp.cache_clear()
+    yield
+    colors.gradient._ramp.cache_clear()
+
+
+RED, YELLOW, BLUE = RGBColor(255, 0, 0), RGBColor(255, 255, 0), RGBColor(0, 0, 255)
+
+
+def test_mix():
+    assert mix(RED, BLUE, space="rgb") == RGBColor(128, 0, 128)
+    assert mix(RED, BLUE, 0) == RED
+    assert mix(RED, BLUE, 1) == BLUE
+    assert isinstance(mix(HexColor("ff0000"), BLUE), HexColor)
+    # OKLab keeps the middle of red to blue brighter than the plain sRGB average
+    assert sum(mix(RED, BLUE)) > sum(mix(RED, BLUE, space="rgb"))
+
+
+def test_mix_hue_shortest_arc():
+    assert mix(HSVColor(0.9, 1, 1), HSVColor(0.1, 1, 1), space="hsv").hue == pytest.approx(0.0)
+    assert mix(HSVColor(0.1, 1, 1), HSVColor(0.3, 1, 1), space="hsv").hue == pytest.approx(0.2)
+    # Gray has no hue, the one of the other color is kept
+    assert mix(HSVColor(0, 0, 1), HSVColor(0.6, 1, 1), space="hsv").hue == pytest.approx(0.6)
+
+
+def test_mix_alpha():
+    mixed = mix(RGBAColor(255, 0, 0, 0.0), RGBAColor(0, 0, 255, 1.0), space="rgb")
+    assert isinstance(mixed, RGBAColor)
+    assert mixed.alpha == 0.5
+
+
+def test_gradient(backend):
+    ramp = gradient([RED, BLUE], 5)
+    assert ramp.space == "rgb"
+    assert len(ramp) == 5
+    assert ramp[0] == RED
+    assert ramp[4] == BLUE
+    for i, space in enumerate(sorted(SPACES)):
+        ramp = gradient([RED, YELLOW, BLUE], 9, space)
+        assert ramp[2] == mix(RED, YELLOW, 0.5, space)
+        assert ramp[4] == YELLOW
+        assert ramp[6] == mix(YELLOW, BLUE, 0.5, space)
+
+
+def test_gradient_positions(backend):
+    ramp = gradient([(0.25, RED), (0.75, BLUE)], 5, "rgb")
+    assert list(ramp) == [RED, RED, RGBColor(128, 0, 128), BLUE, BLUE]
+    # Stops without a position are spread between their neighbours
+    assert list(gradient([RED, (0.5, YELLOW), BLUE], 5)) == list(gradient([RED, YELLOW, BLUE], 5))
+    assert gradient([RED, RED, (1, BLUE)], 5)[2] == RED
+    # A hard stop
+    assert list(gradient([(0, RED), (0.5, RED), (0.5, BLUE), (1, BLUE)], 4)) == [RED, RED, BLUE, BLUE]
+
+
+def test_gradient_hsv(backend):
+    ramp = gradient([HSVColor(0.9, 1, 1), HSVColor(0.1, 1, 1)], 5, "hsv")
+    assert [round(c.hue, 6) for c in ramp] == [0.9, 0.95, 0.0, 0.05, 0.1]
+
+
+def test_gradient_single(backend):
+    assert list(gradient([RED, BLUE], 1)) == [RED]
+
+
+def test_gradient_cached(backend):
+    first = gradient([RED, BLUE], 16)
+    assert colors.gradient._ramp.cache_info().currsize == 1
+    second = gradient([RGBColor(255, 0, 0), RGBColor(0, 0, 255)], 16)
+    assert colors.gradient._ramp.cache_info().hits == 1
+    assert list(first) == list(second)
+    # Every caller gets its own copy of the cached ramp
+    first.data[0] = 0
+    assert gradient([RED, BLUE], 16)[0] == RED
+
+
+def test_gradient_invalid():
+    with pytest.raises(ValueError):
+        gradient([RED], 4)
+    with pytest.raises(ValueError):
+        gradient([RED, BLUE], 0)
+    with pytest.raises(ValueError):
+        gradient([RED, BLUE], 4, "lab")
+    with pytest.raises(ValueError):
+        gradient([(0.5, RED), (0.25, BLUE)], 4)
+    with pytest.raises(ValueError):
+        gradient([RED, (1.5, BLUE)], 4)
+    with pytest.raises(ValueError):
+        mix(RED, BLUE, space="cmyk")
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+
+import pytest
+
+from colors import base, instrument, HexColor, RGBColor, HSVColor
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_costs_nothing():
+    edges, blend = dict(base._CONVERSIONS), base._blend
+    instrument.enable()
+    assert base._CONVERSIONS["hex", "rgb"] is not edges["hex", "rgb"]
+    instrument.disable()
+    assert base._CONVERSIONS == edges
+    assert all(base._CONVERSIONS[edge] is func for edge, func in edges.items())
+    assert base._blend is blend
+    assert base._route("hex", "rgb") is edges["hex", "rgb"]
+    HexColor("336699").hsv
+    assert instrument.snapshot() == {"conversions": {}, "blend_modes": {}}
+
+
+def test_counts_edges_and_blend_modes():
+    instrument.enable()
+    HexColor("336699").hsv
+    RGBColor(1, 2, 3) == HexColor("010203")
+    RGBColor(1, 2, 3).screen(RGBColor(4, 5, 6))
+    RGBColor(1, 2, 3).linear_dodge(RGBColor(4, 5, 6))
+    snapshot = instrument.snapshot()
+    assert {edge: stat["calls"] for edge, stat in snapshot["conversions"].items()} == {
+        "hex->float": 1, "float->hsv": 1, "hex->rgb": 1, "rgb->float": 4, "float->rgb": 2,
+    }
+    assert {mode: stat["calls"] for mode, stat in snapshot["blend_modes"].items()} == {"screen": 1, "add": 1}
+    assert all(stat["seconds"] >= 0 for stat in snapshot["conversions"].values())
+
+
+def test_results_unchanged():
+    expected = HSVColor(0.3, 0.5, 0.7).rgb, RGBColor(10, 20, 30).overlay(RGBColor(200, 100, 50))
+    with instrument.collect():
+        assert (HSVColor(0.3, 0.5, 0.7).rgb, RGBColor(10, 20, 30).overlay(RGBColor(200, 100, 50))) == expected
+
+
+def test_errors_are_counted():
+    with instrument.collect() as metrics:
+        with pytest.raises(ZeroDivisionError):
+            RGBColor(0, 0, 0).color_burn(RGBColor(1, 1, 1))
+    assert metrics.blend_modes["color_burn"][0] == 1
+
+
+def test_collect_scopes():
+    with instrument.collect() as outer:
+        RGBColor(1, 2, 3).hex
+        with instrument.collect() as inner:
+            RGBColor(1, 2, 3).float
+        assert instrument.is_enabled()
+    assert not instrument.is_enabled()
+    assert set(inner.conversions) == {("rgb", "float")}
+    assert set(outer.conversions) == {("rgb", "hex"), ("rgb", "float")}
+    assert instrument.snapshot()["conversions"].keys() == {"rgb->hex", "rgb->float"}
+
+
+def test_collect_keeps_enabled():
+    instrument.enable()
+    with instrument.collect():
+        pass
+    assert instrument.is_enabled()
+
+
+def test_enable_is_reference_counted():
+    instrument.enable()
+    instrument.enable()
+    instrument.disable()
+    assert instrument.is_enabled()
+    instrument.disable()
+    assert not instrument.is_enabled()
+
+
+def test_collect_in_overlapping_threads():
+    entered, release = threading.Barrier(2), threading.Event()
+    found = {}
+
+    def first():
+        with instrument.collect() as metrics:
+            entered.wait()
+            release.wait()
+            RGBColor(1, 2, 3).hex
+        found["first"] = metrics
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    with instrument.collect() as metrics:
+        entered.wait()
+        RGBColor(1, 2, 3).float
+    # The block of this thread ended first, the other one still collects
+    assert instrument.is_enabled()
+    release.set()
+    thread.join()
+    assert not instrument.is_enabled()
+    assert set(metrics.conversions) == {("rgb", "float")}
+    assert set(found["first"].conversions) == {("rgb", "hex")}
+    assert instrument.snapshot()["conversions"].keys() == {"rgb->hex", "rgb->float"}
+
+
+def test_collect_in_concurrent_tasks():
+    async def task(color, space, started, release):
+        with instrument.collect() as metrics:
+            started.set()
+            await release.wait()
+            getattr(color, space)
+        return metrics
+
+    async def main():
+        started, release = asyncio.Event(), asyncio.Event()
+        first = asyncio.ensure_future(task(RGBColor(1, 2, 3), "hex", started, release))
+        await started.wait()
+        with instrument.collect() as metrics:
+            HSVColor(0.5, 0.5, 0.5).rgb
+            release.set()
+            await asyncio.sleep(0)
+        return metrics, await first
+
+    mine, theirs = asyncio.run(main())
+    assert set(mine.conversions) == {("hsv", "rgb")}
+    assert set(theirs.conversions) == {("rgb", "hex")}
+
+
+def test_prometheus():
+    with instrument.collect():
+        RGBColor(1, 2, 3).hex
+        RGBColor(1, 2, 3).multiply(RGBColor(1, 2, 3))
+    text = instrument.prometheus()
+    assert "# TYPE colors_conversion_calls_total counter\n" in text
+    assert 'colors_conversion_calls_total{src="rgb",dst="hex"} 1\n' in text
+    assert 'colors_blend_calls_total{mode="multiply"} 1\n' in text
+    assert 'colors_blend_seconds_total{mode="multiply"} ' in text
+    assert "colors_" not in instrument.prometheus("app")
@@ -0,0 +1,45 @@
+import pytest
+
+import colors.intern
+from colors import RGBColor, HexColor, FrozenHexColor, FrozenRGBColor, FrozenRGBFloatColor
+
+
+@pytest.fixture
+def interning():
+    colors.intern.enable(maxsize=2)
+    yield
+    colors.intern.disable()
+
+
+def test_disabled_by_default():
+    assert not colors.intern.enabled()
+    assert colors.intern.info() is None
+    assert colors.intern.intern_rgb(1, 2, 3) is not colors.intern.intern_rgb(1, 2, 3)
+
+
+def test_intern_rgb(interning):
+    red = colors.intern.intern_rgb(255, 0, 0)
+    assert type(red) is FrozenRGBColor
+    assert colors.intern.intern_rgb(255, 0, 0) is red
+    assert colors.intern.intern(HexColor("ff0000")) is red
+    assert FrozenRGBFloatColor(1, 0, 0).rgb is red
+    info = colors.intern.info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 1, 2, 1)
+
+
+def test_bounded(interning):
+    red = colors.intern.intern_rgb(255, 0, 0)
+    colors.intern.intern_rgb(0, 255, 0)
+    colors.intern.intern_rgb(0, 0, 255)
+    assert colors.intern.info().currsize == 2
+    assert colors.intern.intern_rgb(255, 0, 0) is not red
+
+
+def test_interned_colors_convert_once(interning):
+    assert FrozenHexColor("336699").rgb.hsv is FrozenHexColor("336699").rgb.hsv
+
+
+def test_clear(interning):
+    colors.intern.intern(RGBColor(1, 2, 3))
+    colors.intern.clear()
+    assert colors.intern.info().currsize == 0
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor, FrozenHexColor
+from colors.array import ColorArray
+from colors.blend import BLEND_MODES
+from colors.lazy import Expression, lazy
+
+
+def _colors(seed, size=100):
+    rand = random.Random(seed)
+    # Channels stay away from 0 and 255 so divide, dodge and burn are defined everywhere
+    return [RGBColor(rand.randint(1, 254), rand.randint(1, 254), rand.randint(1, 254)) for _ in range(size)]
+
+
+def _chain(x, top, glow):
+    return x.multiply(top).screen(glow).invert().overlay(top)
+
+
+def _arithmetic(x, top, glow):
+    return (x * top + glow).screen(top) - glow
+
+
+@pytest.mark.parametrize("cls", [RGBColor, RGBFloatColor, HSVColor, HexColor, FrozenHexColor])
+@pytest.mark.parametrize("chain", [_chain, _arithmetic])
+def test_scalar_matches_eager(cls, chain):
+    for base, top, glow in zip(_colors(1), _colors(2), _colors(3)):
+        base, glow = cls(base), HSVColor(glow)
+        expected = chain(base, top, glow)
+        result = chain(lazy(base), top, glow).evaluate()
+        assert type(result) is type(expected)
+        assert list(result) == list(expected)
+
+
+@pytest.mark.parametrize("mode", sorted(BLEND_MODES))
+def test_every_mode(mode):
+    for base, top in zip(_colors(1, 20), _colors(2, 20)):
+        base = HexColor(base)
+        expected = getattr(base, mode)(top).screen(top)
+        assert getattr(lazy(base), mode)(top).screen(top).evaluate() == expected
+
+
+def test_reflected_operators():
+    a, b = RGBColor(10, 20, 30), HexColor("336699")
+    assert list((a + lazy(b)).evaluate()) == list(a + b)
+    assert list((a - lazy(b)).evaluate()) == list(a - b)
+    assert list((a * lazy(b)).evaluate()) == list(a * b)
+    assert list((a / lazy(b)).evaluate()) == list(a / b)
+
+
+def test_shared_subexpression():
+    a, b = RGBColor(10, 20, 30), HexColor("336699")
+    shared = lazy(a).screen(b)
+    expected = a.screen(b).multiply(a.screen(b))
+    assert shared.multiply(shared).evaluate() == expected
+    # a, b, screen and multiply
+    assert len(shared.multiply(shared)._compile()) == 4
+
+
+@pytest.mark.parametrize("space", ["rgb", "hex", "hsv", "float"])
+def test_batch_matches_eager(backend, space):
+    base, top, glow = _colors(1), _colors(2), HSVColor(_colors(3)[0])
+    layer = ColorArray(base).to(space)
+    result = _chain(lazy(layer), ColorArray(top), glow).evaluate()
+    assert result.space == space
+    for got, a, b in zip(result, layer, top):
+        assert list(got) == list(_chain(a, b, glow))
+
+    result = _arithmetic(lazy(layer), ColorArray(top), glow).evaluate()
+    assert result.space == "float"
+    for got, a, b in zip(result, layer, top):
+        assert list(got) == list(_arithmetic(a, b, glow))
+
+
+def test_batch_errors(backend):
+    with pytest.raises(ValueError):
+        lazy(ColorArray(_colors(1, 3))).screen(ColorArray(_colors(2, 4))).evaluate()
+    black = ColorArray([RGBColor(0, 0, 0)] * 3)
+    with pytest.raises(ZeroDivisionError):
+        (lazy(black) / black).evaluate()
+
+
+def test_leaf_and_errors():
+    color = RGBColor(1, 2, 3)
+    assert lazy(color).evaluate() is color
+    assert lazy(lazy(color)).evaluate() is color
+    assert isinstance(lazy(color).screen(color), Expression)
+    assert "screen" in repr(lazy(color).screen(color))
+    with pytest.raises(TypeError):
+        lazy((1, 2, 3))
+    with pytest.raises(TypeError):
+        color + (1, 2, 3)
+    with pytest.raises(ZeroDivisionError):
+        lazy(RGBColor(0, 0, 0)).divide(color).evaluate()
@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor, RGBAColor, HSVAColor
+from colors.array import ColorArray
+from colors.blend import blend
+from colors.lut import ColorLUT, INTERPOLATIONS
+
+
+TINT, GLOW = RGBColor(200, 120, 40), RGBColor(30, 30, 90)
+
+
+def _chain(color):
+    return color.overlay(TINT).screen(GLOW)
+
+
+def _batch_chain(colors):
+    return blend("screen", blend("overlay", colors, TINT), GLOW)
+
+
+def _colors(seed, size=200):
+    rand = random.Random(seed)
+    return [RGBColor(rand.randint(0, 255), rand.randint(0, 255), rand.randint(0, 255)) for _ in range(size)]
+
+
+@pytest.mark.parametrize("interpolation", sorted(INTERPOLATIONS))
+def test_linear_functions_are_exact(backend, interpolation):
+    lut = ColorLUT.from_function(lambda c: RGBFloatColor(*(1 - v for v in c.float)), 5)
+    for color in _colors(1, 50):
+        expected = [1 - v for v in color.float]
+        assert list(lut(color.float, interpolation)) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("interpolation", sorted(INTERPOLATIONS))
+def test_apply_matches_scalar(backend, interpolation):
+    lut = ColorLUT.from_function(_chain, 17)
+    colors = _colors(1)
+    result = ColorArray([HSVColor(c) for c in colors]).to("hsv")
+    result = lut.apply(result, interpolation)
+    assert result.space == "hsv"
+    for got, color in zip(result, colors):
+        expected = lut(HSVColor(color), interpolation)
+        assert list(got) == pytest.approx(list(expected))
+        assert all(abs(a - b) <= 2 for a, b in zip(got.rgb, _chain(color).rgb))
+
+
+def test_scalar_keeps_alpha():
+    lut = ColorLUT.from_function(lambda c: c, 2)
+    color = lut(RGBAColor(10, 20, 30, 0.5))
+    assert isinstance(color, RGBAColor)
+    assert list(color) == [10, 20, 30, 0.5]
+    color = lut(HSVAColor(0.5, 0.5, 0.5, 0.25), "trilinear")
+    assert color.alpha == 0.25
+    assert list(color)[:3] == pytest.approx([0.5, 0.5, 0.5])
+
+
+def test_batch_sampling(backend):
+    scalar = ColorLUT.from_function(_chain, 9)
+    batch = ColorLUT.from_function(_batch_chain, 9, batch=True)
+    colors = ColorArray(_colors(1))
+    for a, b in zip(scalar.apply(colors).tolist(), batch.apply(colors).tolist()):
+        assert a == pytest.approx(b)
+
+
+def test_exact_table():
+    pytest.importorskip("numpy")  # sampling the full cube without NumPy is too slow for the test suite
+    lut = ColorLUT.from_function(_batch_chain, 256, batch=True)
+    assert lut.exact and len(lut) == 1 << 24
+    colors = _colors(2)
+    for got, color in zip(lut.apply(ColorArray(colors)), colors):
+        assert got == _chain(color)
+    assert lut(HexColor("336699")) == _chain(HexColor("336699"))
+    assert type(lut(HexColor("336699"))) is HexColor
+
+
+def test_cube_round_trip(backend, tmp_path):
+    lut = ColorLUT.from_function(_chain, 5)
+    lut.title = "tint and glow"
+    path = tmp_path / "look.cube"
+    lut.save(path)
+    text = path.read_text().splitlines()
+    assert text[:2] == ['TITLE "tint and glow"', "LUT_3D_SIZE 5"]
+    assert len(text) == 2 + 5 ** 3
+
+    loaded = ColorLUT.load(path)
+    assert loaded.size == 5 and loaded.title == "tint and glow"
+    for color in _colors(3, 20):
+        assert list(loaded(color.float)) == pytest.approx(list(lut(color.float)), abs=1e-6)
+
+
+def test_cube_red_changes_fastest(backend, tmp_path):
+    path = tmp_path / "red.cube"
+    ColorLUT.from_function(lambda c: c, 2).save(path)
+    lines = path.read_text().splitlines()[1:]
+    assert lines[:3] == ["0.000000 0.000000 0.000000", "1.000000 0.000000 0.000000", "0.000000 1.000000 0.000000"]
+
+
+def test_cube_keywords(tmp_path):
+    path = tmp_path / "resolve.cube"
+    path.write_text('TITLE "identity"\nLUT_3D_SIZE 2\nLUT_3D_INPUT_RANGE 0 1\nVENDOR_OPTION on\n'
+                    + "".join(f"{r} {g} {b}\n" for b in (0, 1) for g in (0, 1) for r in (0, 1)))
+    lut = ColorLUT.load(path)
+    assert lut.size == 2 and lut.title == "identity"
+    assert list(lut(RGBFloatColor(1, 0, 1))) == pytest.approx([1, 0, 1])
+
+
+def test_cube_errors(tmp_path):
+    path = tmp_path / "bad.cube"
+    path.write_text("LUT_1D_SIZE 2\n0 0 0\n1 1 1\n")
+    with pytest.raises(ValueError):
+        ColorLUT.load(path)
+    path.write_text("DOMAIN_MIN 0 0 0\nDOMAIN_MAX 2 2 2\nLUT_3D_SIZE 2\n")
+    with pytest.raises(ValueError):
+        ColorLUT.load(path)
+    path.write_text("LUT_3D_SIZE 2\nLUT_3D_INPUT_RANGE 0 4\n")
+    with pytest.raises(ValueError):
+        ColorLUT.load(path)
+    path.write_text("LUT_3D_SIZE 2\n0 0 0\n")
+    with pytest.raises(ValueError):
+        ColorLUT.load(path)
+    with pytest.raises(ValueError):
+        ColorLUT.from_function(_chain, 1)
+    with pytest.raises(ValueError):
+        ColorLUT.from_function(_chain, 2)(RGBColor(0, 0, 0), "nearest")
@@ -1,5 +1,13 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
 from colors import RGBColor
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 def test_primary():
     import colors.primary
@@ -16,6 +24,45 @@ def test_w3c():
     assert colors.w3c.ghostwhite == RGBColor(248, 248, 255)
 
 
+def test_constants_are_created_lazily():
+    import colors.w3c
+    assert "ghostwhite" in dir(colors.w3c)
+    assert len([name for name in dir(colors.w3c) if not name.startswith("_")]) == 147
+    assert colors.w3c.ghostwhite is colors.w3c.ghostwhite
+    assert "ghostwhite" in vars(colors.w3c)
+    namespace = {}
+    exec("from colors.rainbow import *", namespace)
+    assert namespace["violet"] == RGBColor(238, 130, 238)
+    with pytest.raises(AttributeError):
+        colors.w3c.notacolor
+
+
+def _import_times(modules: str) -> dict:
+    """ Self time in microseconds of every module imported by ``modules``, in a fresh interpreter. """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_time, _, name = line[len("import time:"):].split("|")
+            if self_time.strip().isdigit():
+                times[name.strip()] = int(self_time)
+    return times
+
+
+def test_palette_import_time():
+    check = ("import sys, colors, colors.w3c, colors.rainbow, colors.primary; "
+             "assert 'numpy' not in sys.modules; "
+             "assert not any(isinstance(v, colors.Color) for m in (colors.w3c, colors.rainbow, colors.primary) "
+             "for v in vars(m).values())")
+    subprocess.run([sys.executable, "-c", check], check=True, cwd=ROOT)
+    # A palette module does less work at import than colors.base, which only defines classes.
+    # The best of a few runs keeps a busy machine from failing the test.
+    runs = [_import_times("colors.w3c, colors.rainbow, colors.primary") for _ in range(3)]
+    base = min(times["colors.base"] for times in runs)
+    for module in ("colors.w3c", "colors.rainbow", "colors.primary"):
+        assert min(times[module] for times in runs) < base, module
+
 
 def test_wheel():
     from colors import ColorWheel
@@ -26,3 +73,113 @@ def test_wheel():
         _iteration += 1
         if _iteration >= 10:
             break
+
+
+@pytest.mark.parametrize("mode", ["random", "golden", "halton"])
+def test_wheel_is_reproducible(mode):
+    import random
+    from colors import ColorWheel
+    first = ColorWheel(mode=mode, seed=42)
+    second = ColorWheel(mode=mode, seed=random.Random(42))
+    colors_ = [next(first) for _ in range(5)] + list(first.take(20))
+    assert colors_ == list(second.take(10)) + [next(second) for _ in range(15)]
+    assert colors_ != [next(ColorWheel(mode=mode, seed=43)) for _ in range(25)]
+
+
+def test_wheel_numpy_generator():
+    np = pytest.importorskip("numpy")
+    from colors import ColorWheel
+    first = ColorWheel(seed=np.random.default_rng(7))
+    second = ColorWheel(seed=np.random.default_rng(7))
+    assert [next(first) for _ in range(10)] == list(second.take(10))
+    # Long enough to wrap around the wheel many times
+    assert list(first.take(500)) + [next(first) for _ in range(100)] == \
+        [next(second) for _ in range(100)] + list(second.take(500))
+
+
+@pytest.mark.parametrize("mode", ["random", "golden"])
+def test_wheel_phase_wraps_every_step(mode):
+    from colors import ColorWheel
+    wheel = ColorWheel(mode=mode, seed=3)
+    wheel.take(100_000)
+    next(wheel)
+    # A fraction of one turn, not a sum growing with every color
+    assert 0 <= wheel._phase < 1 << 64
+
+
+def test_wheel_take_without_numpy(monkeypatch):
+    import colors.array
+    from colors import ColorWheel
+    expected = list(ColorWheel(mode="halton").take(10))
+    monkeypatch.setattr(colors.array, "np", None)
+    assert list(ColorWheel(mode="halton").take(10)) == expected
+
+
+def test_wheel_low_discrepancy():
+    from colors import ColorWheel, HSVColor
+    halton = ColorWheel(0.1, mode="halton", saturation=0.5, value=1)
+    hues = [round(c.hue, 6) for c in halton.take(4)]
+    assert hues == [0.6, 0.35, 0.85, 0.225]
+    golden = ColorWheel(mode="golden").take(100, space="rgb")
+    assert len(golden) == 100 and golden.space == "rgb"
+    # Any 100 golden ratio steps leave no gap wider than 2.7 / 100 turns
+    gaps = sorted(HSVColor(c).hue for c in golden)
+    assert max(b - a for a, b in zip(gaps, gaps[1:])) < 0.027
+    assert next(halton).saturation == 0.5
+    with pytest.raises(ValueError):
+        ColorWheel(mode="spiral")
+    with pytest.raises(ValueError):
+        ColorWheel(value=2)
+
+
+def _named_palette():
+    import colors.w3c
+    import colors.rainbow
+    import colors.primary
+    from colors.palette import Palette
+    return Palette.from_modules(colors.w3c, colors.rainbow, colors.primary)
+
+
+def _brute_force(palette, rgb):
+    def distance(i):
+        entry = palette.entries[i]
+        return sum((a - b) ** 2 for a, b in zip(entry.color, rgb)), i
+    return min(range(len(palette)), key=distance)
+
+
+def test_palette_nearest():
+    palette = _named_palette()
+    assert palette.nearest(RGBColor(250, 1, 3)).name == "red"
+    assert palette.nearest(RGBColor(248, 248, 255)) == ("ghostwhite", RGBColor(248, 248, 255))
+    assert [e.name for e in palette.nearest(RGBColor(250, 1, 3), k=3)] == ["red", "crimson", "orangered"]
+    assert palette["indigo"].color == RGBColor(75, 0, 130)
+
+
+def test_palette_ties_in_palette_order():
+    from colors.palette import Palette
+    palette = Palette({"a": RGBColor(0, 0, 0), "b": RGBColor(2, 0, 0), "c": RGBColor(0, 0, 0)})
+    assert palette.nearest(RGBColor(1, 0, 0)).name == "a"
+    assert len(Palette([("a", RGBColor(0, 0, 0)), ("a", RGBColor(1, 1, 1))])) == 1
+
+
+def test_palette_matches_brute_force():
+    import random
+    rand = random.Random(7)
+    palette = _named_palette()
+    for _ in range(2000):
+        rgb = (rand.randrange(256), rand.randrange(256), rand.randrange(256))
+        assert palette.entries.index(palette.nearest(RGBColor(*rgb))) == _brute_force(palette, rgb)
+
+
+def test_palette_nearest_many(backend):
+    import random
+    from colors.array import ColorArray
+    rand = random.Random(8)
+    pixels = [RGBColor(rand.randrange(256), rand.randrange(256), rand.randrange(256)) for _ in range(1000)]
+    palette = _named_palette()
+    # Half of the values were already answered by scalar queries
+    for pixel in pixels[::2]:
+        palette.nearest(pixel)
+    result = palette.nearest_many(ColorArray(pixels * 2))
+    assert result == [palette.nearest(pixel) for pixel in pixels * 2]
+    assert list(palette.nearest_indices(ColorArray(pixels[:3]))) == [palette.entries.index(e) for e in result[:3]]
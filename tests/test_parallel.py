@@ -0,0 +1,106 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from colors import RGBColor, parallel
+from colors.array import ColorArray
+from colors.blend import blend
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(parallel, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(parallel, "_MIN_CHUNK", 7)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    yield parallel.get_executor(2)
+    parallel.shutdown()
+
+
+def _layer(seed, size=100):
+    rand = random.Random(seed)
+    return ColorArray([RGBColor(rand.randint(1, 254), rand.randint(1, 254), rand.randint(1, 254)) for _ in range(size)])
+
+
+@pytest.mark.parametrize("space", ["hsv", "hex", "lab"])
+def test_convert_in_processes(backend, small_chunks, pool, space):
+    layer = _layer(1)
+    assert layer.to(space, workers=2).tolist() == layer.to(space).tolist()
+    assert layer.to(space, executor=pool).tolist() == layer.to(space).tolist()
+
+
+def test_convert_in_threads(backend, small_chunks):
+    layer = _layer(1)
+    with ThreadPoolExecutor(3) as executor:
+        assert layer.to("oklab", executor=executor).tolist() == layer.to("oklab").tolist()
+
+
+def test_blend_in_processes(backend, small_chunks, pool):
+    base, top = _layer(1).hsv, _layer(2)
+    result = blend("overlay", base, top, workers=2)
+    assert result.space == "hsv"
+    assert result.tolist() == blend("overlay", base, top).tolist()
+
+    out = ColorArray.empty(len(base), "hsv")
+    assert blend("screen", base, RGBColor(10, 20, 30), out=out, executor=pool) is out
+    assert out.tolist() == blend("screen", base, RGBColor(10, 20, 30)).tolist()
+
+
+def test_shared_arrays(backend, small_chunks, pool, monkeypatch):
+    base, top = _layer(1), _layer(2)
+    share = parallel._share
+
+    def share_top(colors):
+        # Shared arrays are used in place, only top is copied into shared memory
+        assert colors is top or backend == "python"
+        return share(colors)
+    monkeypatch.setattr(parallel, "_share", share_top)
+    with parallel.shared_array(len(base)) as shared, parallel.shared_array(len(base), "hsv") as out:
+        base.to("rgb", out=shared)
+        assert shared.to("lab", out=out, workers=2) is out
+        assert out.space == "lab"
+        assert out.tolist() == base.to("lab").tolist()
+        assert blend("overlay", shared, top, out=shared, executor=pool) is shared
+        assert shared.tolist() == blend("overlay", base, top).tolist()
+    assert not parallel._segments
+    if backend == "numpy":
+        assert len(shared) == len(out) == 0
+
+
+def test_chunks_per_worker(small_chunks):
+    assert parallel._chunks(100, 1) == [(0, 25), (25, 50), (50, 75), (75, 100)]
+    assert len(parallel._chunks(100, 2)) == 8
+
+
+def test_processes_without_shared_memory(backend, small_chunks, pool, monkeypatch):
+    # Python 3.7 pickles the rows to the workers
+    monkeypatch.setattr(parallel, "shared_memory", None)
+    base, top = _layer(1), _layer(2)
+    assert base.to("lab", executor=pool).tolist() == base.to("lab").tolist()
+    assert blend("overlay", base, top, executor=pool).tolist() == blend("overlay", base, top).tolist()
+
+
+def test_worker_errors(backend, small_chunks, pool):
+    base = ColorArray([RGBColor(0, 0, 0)] * 20)
+    with pytest.raises(ZeroDivisionError):
+        blend("divide", base, base, workers=2)
+
+
+def test_threshold(monkeypatch):
+    def fail(*args):
+        raise AssertionError("should not be split")
+    monkeypatch.setattr(parallel, "map_chunks", fail)
+    layer = _layer(1)
+    assert layer.to("hsv", workers=4).tolist() == layer.to("hsv").tolist()
+
+
+def test_options():
+    layer = _layer(1)
+    with ThreadPoolExecutor(1) as executor, pytest.raises(TypeError):
+        layer.to("hsv", workers=2, executor=executor)
+    with pytest.raises(ValueError):
+        parallel._resolve(parallel.PARALLEL_THRESHOLD, None, 0)
+    assert parallel._resolve(parallel.PARALLEL_THRESHOLD, None, 1) is None
@@ -0,0 +1,104 @@
+import random
+from array import array
+
+import pytest
+
+from colors import HexColor, RGBColor
+from colors.array import ColorArray
+from colors.quantize import METHODS, Swatch, quantize
+
+
+CLUSTERS = [(200, 30, 30), (30, 200, 30), (30, 30, 200), (240, 240, 240)]
+
+
+def _pixels(size=20_000, alpha=False):
+    """ Noisy pixels around four colors making up 40, 30, 20 and 10% of the image. """
+    rand = random.Random(0)
+    data = bytearray()
+    for _ in range(size):
+        color = rand.choices(CLUSTERS, [4, 3, 2, 1])[0]
+        data += bytes(min(255, max(0, c + rand.randint(-10, 10))) for c in color)
+        if alpha:
+            data.append(255)
+    return bytes(data)
+
+
+@pytest.mark.parametrize("method", sorted(METHODS))
+def test_finds_clusters(backend, method):
+    swatches = quantize(_pixels(), 4, method, seed=1)
+    assert [type(s) for s in swatches] == [Swatch] * 4
+    assert sum(s.count for s in swatches) == 20_000
+    # Most populated first, each within a couple of steps of its cluster
+    for swatch, expected in zip(swatches, CLUSTERS):
+        assert all(abs(a - b) <= 2 for a, b in zip(swatch.color, expected))
+        assert type(swatch.color) is RGBColor
+
+
+def test_same_result_for_every_input_kind(backend):
+    pixels = _pixels(5_000)
+    expected = quantize(pixels, 4)
+    array_ = ColorArray([tuple(pixels[i:i + 3]) for i in range(0, len(pixels), 3)], "rgb")
+    assert quantize(array_, 4) == expected
+    assert quantize(array_.hsv, 4) == expected
+    chunks = [pixels[i:i + 3000] for i in range(0, len(pixels), 3000)]
+    assert quantize(iter(chunks), 4) == expected
+    assert quantize(pixels, 4, chunk_size=1000) == expected
+
+
+def test_rgba_skips_transparent(backend):
+    pixels = bytearray(_pixels(2_000, alpha=True))
+    pixels += bytes((255, 0, 255, 0)) * 5_000
+    swatches = quantize(bytes(pixels), 4, layout="rgba")
+    assert sum(s.count for s in swatches) == 2_000
+
+
+def test_subsample_and_space(backend):
+    swatches = quantize(_pixels(), 4, "kmeans", subsample=4, space="hex", seed=3)
+    assert sum(s.count for s in swatches) == 5_000
+    assert all(type(s.color) is HexColor for s in swatches)
+
+
+def test_fewer_colors_than_asked(backend):
+    pixels = bytes((10, 20, 30)) * 100 + bytes((200, 100, 0)) * 50
+    for method in METHODS:
+        swatches = quantize(pixels, 8, method, seed=0)
+        assert [(tuple(s.color), s.count) for s in swatches] == [((10, 20, 30), 100), ((200, 100, 0), 50)]
+    assert quantize(b"", 4) == []
+
+
+def test_numpy_image():
+    np = pytest.importorskip("numpy")
+    image = np.frombuffer(_pixels(), dtype=np.uint8).reshape(100, 200, 3)
+    assert quantize(image, 4) == quantize(_pixels(), 4)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        quantize(b"\0\0\0", 4, "popularity")
+    with pytest.raises(ValueError):
+        quantize(b"\0\0\0", 0)
+    with pytest.raises(ValueError):
+        quantize(b"\0\0\0", 4, bits=9)
+    with pytest.raises(ValueError):
+        quantize(b"\0\0\0\0", 4)
+
+
+def test_invalid_space_fails_before_reading_pixels():
+    def chunks():
+        raise AssertionError("pixels were read")
+        yield b""
+    with pytest.raises(ValueError, match="space"):
+        quantize(chunks(), 4, space="cmyk")
+
+
+@pytest.mark.parametrize("dtype", ["float64", "int32"])
+def test_rejects_wider_numpy_images(backend, dtype):
+    np = pytest.importorskip("numpy")
+    with pytest.raises(TypeError):
+        quantize(np.full((100, 3), 200, dtype=dtype), 4)
+
+
+@pytest.mark.parametrize("pixels", ["ffffff", ["ffffff"], 42, [array("d", [0.5] * 3)]])
+def test_rejects_non_pixel_inputs(backend, pixels):
+    with pytest.raises(TypeError):
+        quantize(pixels, 4)
@@ -0,0 +1,149 @@
+import logging
+import os
+import random
+import subprocess
+import sys
+from array import array
+
+import pytest
+
+from colors import base, RGBColor, RGBFloatColor, HSVColor
+from colors.array import _py_kernel
+
+_speedups = pytest.importorskip("colors._speedups")
+
+EDGES = [edge for edge in base._PY_CONVERSIONS if hasattr(_speedups, "%s_to_%s" % edge)]
+
+
+def _samples(space, size=500):
+    """ Valid channels of ``space``, converted from random float colors with the pure-Python edges. """
+    rand = random.Random(space)
+    colors = [(rand.random(), rand.random(), rand.random()) for _ in range(size)]
+    colors += [(0.0, 0.0, 0.0), (1.0, 1.0, 1.0), (0.5, 0.5, 0.5), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)]
+    if space == "float":
+        return colors
+    if space == "rgb":
+        return [tuple(base._PY_CONVERSIONS["float", "rgb"](c)) for c in colors]
+    result = []
+    for color in colors:
+        for edge in base._path("float", space):
+            color = base._PY_CONVERSIONS[edge](color)
+        result.append(tuple(color))
+    return result
+
+
+@pytest.mark.parametrize("edge", EDGES, ids="_to_".join)
+def test_edges_match(edge):
+    compiled = getattr(_speedups, "%s_to_%s" % edge)
+    python = base._PY_CONVERSIONS[edge]
+    for color in _samples(edge[0]):
+        expected = tuple(python(color))
+        result = compiled(color)
+        assert result == expected
+        assert [type(c) for c in result] == [type(c) for c in expected]
+        assert compiled(list(color)) == expected
+
+
+@pytest.mark.parametrize("edge", EDGES, ids="_to_".join)
+def test_batches_match(edge):
+    name = "%s_to_%s" % edge
+    src = array("d", [c for color in _samples(edge[0]) for c in color])
+    out = array("d", bytes(8 * len(src)))
+    _speedups.convert_many(name, src, out)
+    assert out == _py_kernel(base._PY_CONVERSIONS[edge], edge[0] == "rgb")(src)
+
+
+def test_edge_cases():
+    for color in [(0.2, 0.2, 0.2), (1.0, 1.0, 1.0), (1, 0, 0), (0.9, 0.1, 0.95)]:
+        assert _speedups.float_to_hsv(color) == base._PY_CONVERSIONS["float", "hsv"](color)
+    # colorsys keeps the value of grays as it is
+    for color in [(0.3, 0, 1), (0.3, 0.0, 0.5), (1.0, 0.5, 1)]:
+        assert _speedups.hsv_to_float(color) == base._PY_CONVERSIONS["hsv", "float"](color)
+        assert _speedups.hsv_to_rgb(color) == base._PY_CONVERSIONS["hsv", "rgb"](color)
+    for color in [(-0.2, 0.5, 1.4), (2.0, -1.0, 0.5)]:
+        assert _speedups.float_to_rgb(color) == base._PY_CONVERSIONS["float", "rgb"](color)
+
+
+def test_clamping_logs(caplog):
+    with caplog.at_level(logging.INFO, logger="colors.py"):
+        assert _speedups.float_to_hsv((1.5, 0.5, 0.25)) == base._PY_CONVERSIONS["float", "hsv"]((1.5, 0.5, 0.25))
+    assert [r.getMessage() for r in caplog.records] == ["Color value not in 0-1 range, clamping will occur."] * 2
+
+
+@pytest.mark.parametrize("func, color, error", [
+    ("rgb_to_linear", (256, 0, 0), IndexError),
+    ("hsv_to_float", (float("inf"), 1.0, 1.0), OverflowError),
+    ("hsv_to_float", (float("nan"), 1.0, 1.0), ValueError),
+    ("float_to_hsv", (-1.0, 0.0, -0.5), ZeroDivisionError),
+    ("float_to_linear", (1e300, 0.0, 0.0), OverflowError),
+    ("linear_to_xyz", (1.0, 0.0), ValueError),
+    ("linear_to_xyz", (1.0, 0.0, 0.0, 0.0), ValueError),
+    ("linear_to_xyz", ("a", "b", "c"), TypeError),
+])
+def test_errors_match(func, color, error):
+    edge = tuple(func.split("_to_"))
+    with pytest.raises(error):
+        base._PY_CONVERSIONS[edge](color)
+    with pytest.raises(error):
+        getattr(_speedups, func)(color)
+
+
+@pytest.mark.parametrize("mode", sorted(base._BLEND_MODES))
+def test_blend_modes_match(mode):
+    rand = random.Random(mode)
+    # Channels stay away from 0 and 1 so divide, dodge and burn are defined everywhere
+    a = [rand.uniform(0.01, 0.99) for _ in range(600)] + [0.25, 0.5, 0.75]
+    b = [rand.uniform(0.01, 0.99) for _ in range(600)] + [0.5, 0.5, 0.5]
+    for i in range(0, len(a), 3):
+        assert _speedups.blend(mode, a[i:i + 3], b[i:i + 3]) == tuple(base._py_blend(mode, a[i:i + 3], b[i:i + 3]))
+    out = array("d", bytes(8 * len(a)))
+    _speedups.blend_many(mode, array("d", a), array("d", b), out)
+    assert out == array("d", base._py_blend(mode, a, b))
+
+
+@pytest.mark.parametrize("mode, a, b", [("divide", 0.5, 0.0), ("divide", 0.0, 0.5), ("color_dodge", 1.0, 0.5),
+                                        ("color_burn", 0.0, 0.5)])
+def test_blend_errors_match(mode, a, b):
+    with pytest.raises(ZeroDivisionError):
+        base._py_blend(mode, [a] * 3, [b] * 3)
+    with pytest.raises(ZeroDivisionError):
+        _speedups.blend(mode, [a] * 3, [b] * 3)
+    with pytest.raises(ZeroDivisionError):
+        _speedups.blend_many(mode, array("d", [a] * 3), array("d", [b] * 3), array("d", [0.0] * 3))
+
+
+def test_color_methods_match(monkeypatch):
+    rand = random.Random(0)
+    colors = [RGBColor(*(rand.randint(1, 254) for _ in range(3))) for _ in range(50)]
+    compiled = [[getattr(c, mode)(d) for mode in sorted(base._BLEND_MODES)] for c, d in zip(colors, colors[1:])]
+    monkeypatch.setattr(base, "_blend", base._py_blend)
+    python = [[getattr(c, mode)(d) for mode in sorted(base._BLEND_MODES)] for c, d in zip(colors, colors[1:])]
+    assert compiled == python
+    assert RGBFloatColor(0.2, 0.4, 0.6).screen(HSVColor(0.5, 0.5, 0.5)) == RGBFloatColor(0.2, 0.4, 0.6).screen(
+        HSVColor(0.5, 0.5, 0.5))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        _speedups.blend("burn", (0, 0, 0), (0, 0, 0))
+    with pytest.raises(ValueError):
+        _speedups.convert_many("rgb_to_cmyk", array("d"), array("d"))
+    with pytest.raises(TypeError):
+        _speedups.convert_many("rgb_to_float", array("f", [0.0] * 3), array("d", [0.0] * 3))
+    with pytest.raises(BufferError):
+        _speedups.convert_many("rgb_to_float", array("d", [0.0] * 3), bytes(24))
+    with pytest.raises(ValueError):
+        _speedups.convert_many("rgb_to_float", array("d", [0.0] * 3), array("d", [0.0] * 6))
+
+
+def _backend(value):
+    env = dict(os.environ, COLORS_BACKEND=value)
+    return subprocess.run([sys.executable, "-c", "import colors.base; print(colors.base.BACKEND)"], env=env,
+                          capture_output=True, text=True)
+
+
+def test_backend_env_var():
+    assert _backend("c").stdout.strip() == "c"
+    assert _backend("python").stdout.strip() == "python"
+    assert _backend("auto").stdout.strip() == "c"
+    assert "COLORS_BACKEND" in _backend("fortran").stderr
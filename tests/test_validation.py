@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from colors import RGBColor, RGBFloatColor, HSVColor, HexColor, FrozenRGBColor, FrozenHexColor, validation
+
+
+@pytest.fixture
+def quiet():
+    with validation.mode("quiet"):
+        yield
+
+
+def test_default_is_strict():
+    assert validation.get_mode() == "strict"
+    with pytest.raises(ValueError):
+        RGBColor(256, 0, 0)
+    with pytest.raises(ValueError):
+        HSVColor(0, 2, 0)
+    with pytest.raises(ValueError):
+        HexColor("zzzzzz")
+
+
+def test_strict_warns_once_per_channel(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert list(RGBColor(1.4, 2, 2.6)) == [1, 2, 3]
+    assert len(caplog.records) == 2
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        RGBColor(1.0, 2, 3)
+    assert not caplog.records
+
+
+def test_quiet_mode_skips_warnings(quiet, caplog):
+    assert validation.get_mode() == "quiet"
+    with caplog.at_level(logging.WARNING):
+        assert list(RGBColor(51, 102, 153)) == [51, 102, 153]
+        assert list(RGBColor(10.6, 2, 3)) == [11, 2, 3]
+    assert not caplog.records
+    assert RGBColor(10.6, 20, 30).hex == HexColor("0b141e")
+    assert HexColor("336699") == RGBColor(51, 102, 153)
+    assert FrozenRGBColor(1, 2, 3)._color == (1, 2, 3)
+
+
+@pytest.mark.parametrize("value", ["0x1234", "+fffff", "1_0000", "  ff  ", "-fffff", 0x336699])
+def test_quiet_mode_still_parses_hex_strictly(quiet, value):
+    with pytest.raises(ValueError):
+        HexColor(value)
+
+
+def test_quiet_mode_still_checks_ranges(quiet):
+    with pytest.raises(ValueError):
+        RGBColor(256, 0, 0)
+    with pytest.raises(ValueError):
+        HSVColor(0, 2, 0)
+
+
+def test_mode_is_per_thread():
+    seen = []
+    with validation.mode("quiet"):
+        thread = threading.Thread(target=lambda: seen.append(validation.get_mode()))
+        thread.start()
+        thread.join()
+    assert seen == ["strict"]
+
+
+def test_mode_is_per_task():
+    async def task(name, entered, release):
+        with validation.mode(name):
+            entered.set()
+            await release.wait()
+            return validation.get_mode()
+
+    async def main():
+        entered, release = asyncio.Event(), asyncio.Event()
+        quiet = asyncio.ensure_future(task("quiet", entered, release))
+        await entered.wait()
+        mode = validation.get_mode()
+        release.set()
+        return mode, await quiet
+
+    assert asyncio.run(main()) == ("strict", "quiet")
+
+
+def test_mode_is_restored():
+    with pytest.raises(RuntimeError):
+        with validation.mode("quiet"):
+            raise RuntimeError
+    assert validation.get_mode() == "strict"
+    with pytest.raises(ValueError):
+        validation.set_mode("lenient")
+
+
+def test_from_trusted():
+    color = RGBColor._from_trusted(51, 102, 153)
+    assert type(color) is RGBColor and color == HexColor("336699")
+    color.red = 0
+    assert color.red == 0
+    assert list(HSVColor._from_trusted(0.5, 0.5, 0.5)) == [0.5, 0.5, 0.5]
+    assert str(HexColor._from_trusted(0x336699)) == "336699"
+    frozen = FrozenHexColor._from_trusted(0x336699)
+    assert hash(frozen) == hash(FrozenRGBColor._from_trusted(51, 102, 153))
+
+
+def test_conversion_copies_channels():
+    original = RGBColor(1, 2, 3)
+    copy = RGBColor(original)
+    copy.red = 100
+    assert original.red == 1
+    float_copy = RGBFloatColor(RGBFloatColor(0.1, 0.2, 0.3))
+    assert isinstance(float_copy._color, list)
+
+
+def test_blend_results_do_not_depend_on_mode():
+    a, b = HexColor("336699"), RGBColor(200, 100, 50)
+    expected = [a.screen(b), a.overlay(b), HSVColor(a).multiply(b), a + b]
+    with validation.mode("quiet"):
+        assert [a.screen(b), a.overlay(b), HSVColor(a).multiply(b), a + b] == expected